@@ -6,11 +6,32 @@ to collect stars while avoiding asteroids. The game features both manual
 control and an AI agent that learns using Q-learning.
 """
 
-from .game import SpaceAdventureGame
+import importlib
 from .config import *
-from .rl_agent import RLAgent
-from .rendering import Renderer
 
 __version__ = "1.0.0"
 __author__ = "RL Space Adventure Team"
 __description__ = "Reinforcement learning space adventure game built with Pygame"
+
+# Public classes are imported on first access, so headless imports such as
+# the agent or environment never load pygame
+_LAZY_ATTRIBUTES = {
+    "SpaceAdventureGame": ".game",
+    "SpaceAdventureEnv": ".env",
+    "VectorSpaceAdventureEnv": ".vector_env",
+    "RLAgent": ".rl_agent",
+    "Renderer": ".rendering",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
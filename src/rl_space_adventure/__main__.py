@@ -2,21 +2,65 @@
 Main entry point for RL Space Adventure game.
 """
 
+import argparse
 import asyncio
 import platform
-from .game import SpaceAdventureGame
+import sys
+
+# Headless subcommands: python -m rl_space_adventure <command> --help
+COMMANDS = ("evaluate", "benchmark", "replay", "sweep")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="rl-space-adventure",
+        description="Run RL Space Adventure. Headless subcommands: " + ", ".join(COMMANDS) + ".")
+    parser.add_argument("--checkpoint", help="Q-table checkpoint to resume from and save to")
+    parser.add_argument("--policy", help="Demo a greedy-policy file instead of learning")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible run")
+    parser.add_argument("--record", help="Record every episode to this trajectory log")
+    parser.add_argument("--telemetry",
+                        help="Stream per-episode metrics to this JSON lines (or .csv) file")
+    parser.add_argument("--profile", action="store_true",
+                        help="Start with hot-path profiling and its overlay enabled (toggle with P)")
+    parser.add_argument("--profile-output", help="Write profiling stats as JSON to this file on exit")
+    return parser.parse_args(argv)
 
 
 async def main():
     """Run the game asynchronously."""
+    from .game import SpaceAdventureGame
     game = SpaceAdventureGame()
     await game.run_async()
 
 
-def main_sync():
-    """Run the game synchronously."""
-    game = SpaceAdventureGame()
+def run_command(name, argv):
+    """Run a headless subcommand and return its exit status."""
+    if name == "evaluate":
+        from .evaluation import main as command
+    elif name == "replay":
+        from .recording import main as command
+    elif name == "sweep":
+        from .sweep import main as command
+    else:
+        from .benchmark import main as command
+    return command(argv)
+
+
+def main_sync(argv=None):
+    """Run the game synchronously, or a headless subcommand if one is named."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    args = parse_args(argv)
+    from .game import SpaceAdventureGame
+    game = SpaceAdventureGame(checkpoint=args.checkpoint, profile=args.profile,
+                              policy=args.policy, seed=args.seed, record=args.record,
+                              telemetry=args.telemetry)
     game.run()
+    if args.profile_output:
+        game.profiler.dump(args.profile_output)
 
 
 if __name__ == "__main__":
@@ -25,4 +69,4 @@ if __name__ == "__main__":
         asyncio.ensure_future(main())
     else:
         # For desktop
-        main_sync()
+        sys.exit(main_sync())
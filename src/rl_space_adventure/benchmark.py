@@ -0,0 +1,370 @@
+"""
+Throughput benchmarks for RL Space Adventure.
+
+Measures simulation, learning and rendering speed with fixed seeds and
+writes the results as JSON. A saved run can be used as a baseline: any
+metric that falls more than the tolerance below it is reported as a
+regression and the command exits with a non-zero status.
+
+Usage:
+    python -m src.rl_space_adventure.benchmark --save-baseline baseline.json
+    python -m src.rl_space_adventure.benchmark --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from .config import *
+from .env import SpaceAdventureEnv
+from .vector_env import VectorSpaceAdventureEnv
+from .rl_agent import RLAgent
+from .replay import ReplayBuffer
+from .planning import Planner
+from .recording import TrajectoryRecorder
+from .training import run_episode
+
+BENCHMARK_SEED = 0
+DEFAULT_TOLERANCE = 0.25
+
+# (max_coins, max_enemies) board sizes and state bin counts to scale over
+ENTITY_SCALES = ((MAX_COINS, MAX_ENEMIES), (30, 20), (300, 200))
+STATE_BIN_SCALES = (2, STATE_BINS, 8)
+
+# Operation counts per repeat as (full, quick)
+SIZES = {
+    "env_steps": (20000, 2000),
+    "vector_env_steps": (200, 20),
+    "vector_env_batch": (1024, 256),
+    "agent_ops": (20000, 2000),
+    "episodes": (50, 5),
+    "frames": (300, 30),
+}
+
+
+def _best_rate(run, operations, repeats):
+    """
+    Time a benchmark body and return its best throughput.
+
+    Args:
+        run: Callable performing `operations` operations; it is called once
+            untimed to warm up and then `repeats` times
+        operations: Number of operations per call
+        repeats: Number of timed calls
+
+    Returns:
+        Highest operations per second over the timed calls
+    """
+    run()
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = max(best, operations / (time.perf_counter() - start))
+    return best
+
+
+def _result(rate, unit):
+    """Package a throughput measurement for the JSON report."""
+    return {"rate": rate, "unit": unit, "ms_per_op": 1000.0 / rate}
+
+
+def _observations(count, seed=BENCHMARK_SEED, max_coins=MAX_COINS, max_enemies=MAX_ENEMIES):
+    """Record observation snapshots from a seeded random-action rollout."""
+    env = SpaceAdventureEnv(seed=seed, max_coins=max_coins, max_enemies=max_enemies)
+    rng = random.Random(seed)
+    observations = []
+    for _ in range(count):
+        observations.append(env.get_observation())
+        _, _, done, _ = env.step(rng.randrange(len(ACTIONS)))
+        if done:
+            env.reset()
+    return observations
+
+
+def bench_env(quick=False, repeats=3):
+    """Measure SpaceAdventureEnv steps/sec across board sizes."""
+    steps = SIZES["env_steps"][quick]
+    results = {}
+    for max_coins, max_enemies in ENTITY_SCALES:
+        actions = random.Random(BENCHMARK_SEED).choices(range(len(ACTIONS)), k=steps)
+
+        def run():
+            env = SpaceAdventureEnv(seed=BENCHMARK_SEED, max_coins=max_coins,
+                                    max_enemies=max_enemies)
+            for action in actions:
+                if env.step(action)[2]:
+                    env.reset()
+
+        name = f"env.step[coins={max_coins},enemies={max_enemies}]"
+        results[name] = _result(_best_rate(run, steps, repeats), "steps/s")
+    return results
+
+
+def bench_vector_env(quick=False, repeats=3):
+    """Measure VectorSpaceAdventureEnv steps/sec (counting every game)."""
+    steps = SIZES["vector_env_steps"][quick]
+    num_envs = SIZES["vector_env_batch"][quick]
+    actions = np.random.default_rng(BENCHMARK_SEED).integers(
+        0, len(ACTIONS), size=(steps, num_envs))
+
+    def run():
+        env = VectorSpaceAdventureEnv(num_envs, seed=BENCHMARK_SEED)
+        for batch in actions:
+            env.step(batch)
+
+    name = f"vector_env.step[num_envs={num_envs}]"
+    return {name: _result(_best_rate(run, steps * num_envs, repeats), "steps/s")}
+
+
+def bench_agent(quick=False, repeats=3):
+    """Measure RLAgent get_state/choose_action/update_q_value ops/sec across state bins and tiles."""
+    count = SIZES["agent_ops"][quick]
+    observations = _observations(count)
+    rng = np.random.default_rng(BENCHMARK_SEED)
+    actions = rng.integers(0, len(ACTIONS), size=count).tolist()
+    rewards = rng.choice([-0.1, 20.0, -50.0], size=count, p=[0.9, 0.08, 0.02]).tolist()
+
+    agents = [(f"bins={bins}", RLAgent(state_bins=bins)) for bins in STATE_BIN_SCALES]
+    agents.append(("tiles", RLAgent(backend="tiles")))
+
+    results = {}
+    for name, agent in agents:
+        states = [agent.get_state(*observation) for observation in observations]
+        transitions = list(zip(states, actions, rewards, states[1:]))
+
+        def get_state():
+            for observation in observations:
+                agent.get_state(*observation)
+
+        def choose_action():
+            agent.rng.seed(BENCHMARK_SEED)
+            for state in states:
+                agent.choose_action(state)
+
+        def update_q_value():
+            for state, action, reward, next_state in transitions:
+                agent.update_q_value(state, action, reward, next_state)
+
+        results[f"agent.get_state[{name}]"] = _result(
+            _best_rate(get_state, count, repeats), "ops/s")
+        results[f"agent.choose_action[{name}]"] = _result(
+            _best_rate(choose_action, count, repeats), "ops/s")
+        results[f"agent.update_q_value[{name}]"] = _result(
+            _best_rate(update_q_value, len(transitions), repeats), "ops/s")
+
+        # Pure exploitation, from the Q-table and from the cached int8 policy
+        agent.epsilon = 0.0
+        results[f"agent.choose_action[{name},greedy]"] = _result(
+            _best_rate(choose_action, count, repeats), "ops/s")
+        if agent.approximate:
+            continue
+        agent.cache_policy(frozen=True)
+        results[f"agent.choose_action[{name},policy]"] = _result(
+            _best_rate(choose_action, count, repeats), "ops/s")
+    return results
+
+
+def bench_training(quick=False, repeats=3):
+    """Measure episodes/sec of the headless training loop."""
+    episodes = SIZES["episodes"][quick]
+
+    results = {}
+    variants = (("training.run_episode", False, False, False),
+                ("training.run_episode[replay]", True, False, False),
+                ("training.run_episode[planning]", False, True, False),
+                ("training.run_episode[record]", False, False, True))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, use_replay, use_planner, use_recorder in variants:
+
+            def run():
+                env = SpaceAdventureEnv(seed=BENCHMARK_SEED)
+                agent = RLAgent(seed=BENCHMARK_SEED)
+                replay = ReplayBuffer(seed=BENCHMARK_SEED) if use_replay else None
+                planner = Planner(agent, budget=10, seed=BENCHMARK_SEED) if use_planner else None
+                recorder = (TrajectoryRecorder(os.path.join(directory, "trajectory.log"))
+                            if use_recorder else None)
+                for _ in range(episodes):
+                    run_episode(env, agent, replay=replay, planner=planner, recorder=recorder)
+                if recorder is not None:
+                    recorder.close()
+
+            results[name] = _result(_best_rate(run, episodes, repeats), "episodes/s")
+    return results
+
+
+def bench_rendering(quick=False, repeats=3):
+    """
+    Measure render_frame throughput headless under SDL's dummy video driver,
+    and the pixel observation paths that skip the display.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # Keep pygame's import banner out of the JSON report on stdout
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from .rendering import Renderer, RetainedRenderer, OffscreenRenderer
+    from .capture import rasterize
+
+    frames = SIZES["frames"][quick]
+    observations = _observations(frames)
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        font = pygame.font.Font(None, 24)
+        results = {}
+        for name, renderer_class in (("immediate", Renderer), ("retained", RetainedRenderer)):
+            renderer = renderer_class(screen, font)
+
+            def run():
+                for episode, (player_pos, fuel, coins, enemies) in enumerate(observations):
+                    renderer.render_frame(player_pos, coins, enemies, episode, False,
+                                          fuel, episode)
+
+            results[f"render.render_frame[{name}]"] = _result(
+                _best_rate(run, frames, repeats), "frames/s")
+
+        offscreen = OffscreenRenderer(hud=False)
+
+        def run_offscreen():
+            for episode, (player_pos, fuel, coins, enemies) in enumerate(observations):
+                offscreen.render_frame(player_pos, coins, enemies, episode, False, fuel, episode)
+                offscreen.pixels()
+
+        def run_rasterize():
+            out = np.zeros((GRID_HEIGHT, GRID_WIDTH, 3), dtype=np.uint8)
+            for player_pos, _, coins, enemies in observations:
+                rasterize(player_pos, coins, enemies, out=out)
+
+        results["render.render_frame[offscreen]"] = _result(
+            _best_rate(run_offscreen, frames, repeats), "frames/s")
+        results["capture.rasterize"] = _result(_best_rate(run_rasterize, frames, repeats), "frames/s")
+        return results
+    finally:
+        pygame.display.quit()
+
+
+BENCHMARKS = {
+    "env": bench_env,
+    "vector_env": bench_vector_env,
+    "agent": bench_agent,
+    "training": bench_training,
+    "rendering": bench_rendering,
+}
+
+
+def run_benchmarks(names=None, quick=False, repeats=3):
+    """
+    Run benchmark groups and collect their results.
+
+    Args:
+        names: Benchmark group names to run (all of BENCHMARKS by default)
+        quick: Use small operation counts (for smoke tests)
+        repeats: Timed repetitions per benchmark; the best is kept
+
+    Returns:
+        Report dictionary with run metadata and a "results" mapping of
+        metric names to rates (each tagged with its group)
+    """
+    names = list(names or BENCHMARKS)
+    results = {}
+    for name in names:
+        for metric, result in BENCHMARKS[name](quick=quick, repeats=repeats).items():
+            results[metric] = dict(result, group=name)
+    return {
+        "meta": {
+            "groups": names,
+            "seed": BENCHMARK_SEED,
+            "quick": quick,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        report: Report from run_benchmarks
+        baseline: Earlier report to compare against
+        tolerance: Allowed fractional slowdown before a metric counts as
+            a regression
+
+    Returns:
+        List of regression messages (empty if nothing regressed). Baseline
+        metrics missing from the report count as regressions, unless their
+        group was left out of the run (e.g. with --only).
+    """
+    groups = report.get("meta", {}).get("groups")
+    regressions = []
+    for name, expected in baseline["results"].items():
+        actual = report["results"].get(name)
+        if actual is None:
+            # Untagged metrics (older baselines) are always expected
+            if groups is None or expected.get("group") in (None, *groups):
+                regressions.append(f"{name}: missing from the report")
+            continue
+        if actual["rate"] < expected["rate"] * (1.0 - tolerance):
+            regressions.append(
+                f"{name}: {actual['rate']:.1f} {actual['unit']} is "
+                f"{1.0 - actual['rate'] / expected['rate']:.0%} below the baseline "
+                f"{expected['rate']:.1f} {expected['unit']}")
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="rl-space-adventure-benchmark",
+                                     description="Benchmark RL Space Adventure.")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS),
+                        help="Run only this benchmark group (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="Use small operation counts")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions per benchmark")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="Fail if any metric regressed against this report")
+    parser.add_argument("--save-baseline", help="Write the JSON report as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed fractional slowdown against the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the benchmarks and return the process exit status."""
+    args = parse_args(argv)
+    report = run_benchmarks(args.only, quick=args.quick, repeats=args.repeats)
+    for name, result in report["results"].items():
+        print(f"{name:<45} {result['rate']:>14,.1f} {result['unit']:<11} "
+              f"{result['ms_per_op']:.4f} ms", file=sys.stderr)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    paths = [path for path in (args.output, args.save_baseline) if path]
+    for path in paths:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    if not paths:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print("Performance regressions:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Pixel observations and batched frame capture for RL Space Adventure.
+
+The rasterizers draw game states straight into NumPy arrays at one pixel
+per grid cell (optionally scaled up), without pygame, for cheap pixel-based
+observations. FrameCapture collects frames (from the rasterizers or an
+OffscreenRenderer) into batches and writes them on a background thread
+pool, so saving image sequences does not block the simulation.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .config import *
+
+# Channel of each entity type in rasterized observations
+PLAYER_CHANNEL, COIN_CHANNEL, ENEMY_CHANNEL = 0, 1, 2
+CAPTURE_FORMATS = ("png", "npz")
+
+
+def rasterize(player_pos, coins, enemies, cell_size=1, out=None, config=DEFAULT_CONFIG):
+    """
+    Rasterize a game state into a (rows, columns, 3) uint8 observation.
+
+    The player, coins and enemies are drawn as 255 in channels 0, 1 and 2
+    of their grid cells, with pos[0] as the column and pos[1] as the row,
+    matching the rendered screen.
+
+    Args:
+        player_pos: Player (x, y) grid position
+        coins: Coin positions
+        enemies: Enemy positions
+        cell_size: Pixels per grid cell side
+        out: Optional (grid_height, grid_width, 3) uint8 array to draw into
+            (only with cell_size 1)
+        config: GameConfig with the grid size
+
+    Returns:
+        Observation array (out, if given)
+    """
+    if out is None:
+        out = np.zeros((config.grid_height, config.grid_width, 3), dtype=np.uint8)
+    else:
+        out.fill(0)
+    out[player_pos[1], player_pos[0], PLAYER_CHANNEL] = 255
+    for x, y in coins:
+        out[y, x, COIN_CHANNEL] = 255
+    for x, y in enemies:
+        out[y, x, ENEMY_CHANNEL] = 255
+    return _scale(out, cell_size)
+
+
+def rasterize_batch(player_pos, coins, enemies, cell_size=1, out=None, config=DEFAULT_CONFIG):
+    """
+    Rasterize a batch of game states, such as a VectorSpaceAdventureEnv's.
+
+    Args:
+        player_pos: (N, 2) player positions
+        coins: (N, C, 2) coin positions
+        enemies: (N, E, 2) enemy positions
+        cell_size: Pixels per grid cell side
+        out: Optional (N, grid_height, grid_width, 3) uint8 array to draw
+            into (only with cell_size 1)
+        config: GameConfig with the grid size
+
+    Returns:
+        (N, rows, columns, 3) uint8 observations (out, if given)
+    """
+    num_envs = len(player_pos)
+    if out is None:
+        out = np.zeros((num_envs, config.grid_height, config.grid_width, 3), dtype=np.uint8)
+    else:
+        out.fill(0)
+    envs = np.arange(num_envs)
+    out[envs, player_pos[:, 1], player_pos[:, 0], PLAYER_CHANNEL] = 255
+    for positions, channel in ((coins, COIN_CHANNEL), (enemies, ENEMY_CHANNEL)):
+        rows = np.repeat(envs, positions.shape[1])
+        out[rows, positions[..., 1].ravel(), positions[..., 0].ravel(), channel] = 255
+    return _scale(out, cell_size)
+
+
+def _scale(frames, cell_size):
+    """Repeat each grid cell cell_size times along both image axes."""
+    if cell_size == 1:
+        return frames
+    return frames.repeat(cell_size, axis=-3).repeat(cell_size, axis=-2)
+
+
+class FrameCapture:
+    """
+    Writes frames to disk in batches on a background thread pool.
+
+    Frames are copied into a preallocated batch as they are added; full
+    batches are handed to the pool, and add() only waits when more than
+    max_pending batches are still being written.
+
+    Formats:
+        "png": One image per frame, named <prefix>_<frame number>.png
+        "npz": One compressed archive of a (frames, rows, columns, 3) array
+            per batch, named <prefix>_<first frame number>.npz
+    """
+
+    def __init__(self, directory, frame_shape, format="png", prefix="frame",
+                 batch_size=CAPTURE_BATCH_SIZE, workers=CAPTURE_WORKERS,
+                 max_pending=CAPTURE_MAX_PENDING):
+        """
+        Args:
+            directory: Output directory (created if missing)
+            frame_shape: (rows, columns, 3) shape of every frame
+            format: "png" or "npz"
+            prefix: File name prefix
+            batch_size: Frames per batch handed to the pool
+            workers: Writer threads
+            max_pending: Batches allowed in flight before add() blocks
+        """
+        if format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format {format!r}; expected one of {CAPTURE_FORMATS}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = format
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.frame_shape = tuple(frame_shape)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-capture")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.pending = []
+        self.batch = np.empty((batch_size,) + self.frame_shape, dtype=np.uint8)
+        self.batch_frames = 0
+        self.frames = 0
+
+    def add(self, frame):
+        """
+        Copy a frame into the current batch.
+
+        Args:
+            frame: (rows, columns, 3) uint8 array or view, e.g. from
+                OffscreenRenderer.pixels(); it can be reused once add returns
+        """
+        self.batch[self.batch_frames] = frame
+        self.batch_frames += 1
+        self.frames += 1
+        if self.batch_frames == self.batch_size:
+            self._submit()
+
+    def _submit(self):
+        """Hand the current batch to the pool and start a new one."""
+        if self.batch_frames == 0:
+            return
+        pending = []
+        for future in self.pending:
+            if future.done():
+                future.result()  # Surface write errors early
+            else:
+                pending.append(future)
+        self.pending = pending
+
+        self.slots.acquire()
+        batch = self.batch[:self.batch_frames]
+        first = self.frames - self.batch_frames
+        self.pending.append(self.pool.submit(self._write, batch, first))
+        self.batch = np.empty_like(self.batch)
+        self.batch_frames = 0
+
+    def _write(self, batch, first):
+        """Pool task: write one batch of frames."""
+        try:
+            if self.format == "npz":
+                path = os.path.join(self.directory, f"{self.prefix}_{first:08d}.npz")
+                np.savez_compressed(path, frames=batch)
+            else:
+                import pygame
+                for i, frame in enumerate(batch):
+                    path = os.path.join(self.directory, f"{self.prefix}_{first + i:08d}.png")
+                    pygame.image.save(pygame.surfarray.make_surface(frame.transpose(1, 0, 2)), path)
+        finally:
+            self.slots.release()
+
+    def flush(self):
+        """Submit the partial batch and wait for every batch to be written."""
+        self._submit()
+        for future in self.pending:
+            future.result()
+        self.pending = []
+
+    def close(self):
+        """Flush and stop the writer threads."""
+        try:
+            self.flush()
+        finally:
+            self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
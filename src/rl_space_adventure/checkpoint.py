@@ -0,0 +1,210 @@
+"""
+On-disk Q-table checkpoints for RL Space Adventure.
+
+A checkpoint is a fixed-size header followed by the raw Q-values and visit
+counts, so the table can be opened with np.memmap without reading or copying
+it. The header records the config shape parameters and is validated on load.
+Greedy-policy files use the same layout with one int8 action per state.
+"""
+
+import json
+import struct
+import threading
+import numpy as np
+from .config import *
+
+MAGIC = b"RLSAQT01"
+POLICY_MAGIC = b"RLSAPI01"
+HEADER_SIZE = 4096
+CHECKPOINT_VERSION = 1
+
+
+def make_header(num_states, num_actions, dtype, epsilon,
+                state_bins=STATE_BINS, fuel_bins=FUEL_BINS, grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """Build the checkpoint header for a table of the given shape."""
+    return {
+        "version": CHECKPOINT_VERSION,
+        "state_bins": state_bins,
+        "fuel_bins": fuel_bins,
+        "grid": list(grid),
+        "actions": [list(action) for action in ACTIONS],
+        "num_states": num_states,
+        "num_actions": num_actions,
+        "dtype": np.dtype(dtype).name,
+        "epsilon": float(epsilon),
+    }
+
+
+def write_header(file, header, magic=MAGIC):
+    """Write a header block at the start of an open binary file."""
+    payload = json.dumps(header).encode("utf-8")
+    block = magic + struct.pack("<I", len(payload)) + payload
+    if len(block) > HEADER_SIZE:
+        raise ValueError("Checkpoint header does not fit in the header block")
+    file.seek(0)
+    file.write(block.ljust(HEADER_SIZE, b"\0"))
+
+
+def read_header(path, magic=MAGIC):
+    """
+    Read the header of a checkpoint file.
+
+    Args:
+        path: Checkpoint file path
+        magic: Expected file signature (MAGIC or POLICY_MAGIC)
+
+    Returns:
+        Header dictionary
+    """
+    with open(path, "rb") as file:
+        block = file.read(HEADER_SIZE)
+    if len(block) < HEADER_SIZE or block[:len(magic)] != magic:
+        kind = "policy" if magic == POLICY_MAGIC else "Q-table checkpoint"
+        raise ValueError(f"{path} is not a {kind}")
+    (length,) = struct.unpack_from("<I", block, len(magic))
+    start = len(magic) + 4
+    return json.loads(block[start:start + length].decode("utf-8"))
+
+
+def validate_header(header, state_bins=STATE_BINS, fuel_bins=FUEL_BINS,
+                    grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """Raise ValueError if a header does not match the expected configuration."""
+    expected = {
+        "version": CHECKPOINT_VERSION,
+        "state_bins": state_bins,
+        "fuel_bins": fuel_bins,
+        "grid": list(grid),
+        "actions": [list(action) for action in ACTIONS],
+    }
+    # Files written before the grid size was configurable used the default grid
+    header = {"grid": [GRID_WIDTH, GRID_HEIGHT], **header}
+    for key, value in expected.items():
+        if header.get(key) != value:
+            raise ValueError(
+                f"Checkpoint {key} is {header.get(key)!r}, configuration expects {value!r}")
+
+
+def save_checkpoint(path, values, visits, epsilon, state_bins=STATE_BINS, fuel_bins=FUEL_BINS,
+                    grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """
+    Write a complete checkpoint file.
+
+    Args:
+        path: Checkpoint file path
+        values: (num_states, num_actions) Q-value array
+        visits: (num_states,) visit count array
+        epsilon: Exploration rate to store
+        state_bins, fuel_bins: Discretization the table was trained with
+        grid: (width, height) of the grid the table was trained on
+    """
+    header = make_header(values.shape[0], values.shape[1], values.dtype, epsilon,
+                         state_bins, fuel_bins, grid)
+    with open(path, "wb") as file:
+        write_header(file, header)
+        np.ascontiguousarray(values).tofile(file)
+        np.ascontiguousarray(visits, dtype=np.uint32).tofile(file)
+
+
+def open_checkpoint(path, mode="r", state_bins=STATE_BINS, fuel_bins=FUEL_BINS,
+                    grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """
+    Memory-map a checkpoint file.
+
+    Args:
+        path: Checkpoint file path
+        mode: np.memmap mode ("r" read-only, "r+" read-write, "c" copy-on-write)
+        state_bins, fuel_bins: Discretization the checkpoint must match
+        grid: (width, height) of the grid the checkpoint must match
+
+    Returns:
+        Tuple of (header, values memmap, visits memmap)
+    """
+    header = read_header(path)
+    validate_header(header, state_bins, fuel_bins, grid)
+    shape = (header["num_states"], header["num_actions"])
+    dtype = np.dtype(header["dtype"])
+    values = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE, shape=shape)
+    visits = np.memmap(path, dtype=np.uint32, mode=mode,
+                       offset=HEADER_SIZE + values.nbytes, shape=(shape[0],))
+    return header, values, visits
+
+
+def save_policy(path, actions, state_bins=STATE_BINS, fuel_bins=FUEL_BINS,
+                grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """
+    Write a greedy-policy file.
+
+    Args:
+        path: Policy file path
+        actions: (num_states,) int8 array of greedy action indices
+        state_bins, fuel_bins: Discretization the policy was trained with
+        grid: (width, height) of the grid the policy was trained on
+    """
+    header = make_header(len(actions), len(ACTIONS), np.int8, 0.0, state_bins, fuel_bins, grid)
+    with open(path, "wb") as file:
+        write_header(file, header, POLICY_MAGIC)
+        np.ascontiguousarray(actions, dtype=np.int8).tofile(file)
+
+
+def open_policy(path, state_bins=STATE_BINS, fuel_bins=FUEL_BINS, grid=(GRID_WIDTH, GRID_HEIGHT)):
+    """
+    Memory-map a greedy-policy file read-only.
+
+    Args:
+        path: Policy file path
+        state_bins, fuel_bins: Discretization the policy must match
+        grid: (width, height) of the grid the policy must match
+
+    Returns:
+        Tuple of (header, actions memmap)
+    """
+    header = read_header(path, POLICY_MAGIC)
+    validate_header(header, state_bins, fuel_bins, grid)
+    actions = np.memmap(path, dtype=np.int8, mode="r", offset=HEADER_SIZE,
+                        shape=(header["num_states"],))
+    return header, actions
+
+
+def update_epsilon(path, epsilon):
+    """Rewrite the stored exploration rate in place."""
+    header = read_header(path)
+    header["epsilon"] = float(epsilon)
+    with open(path, "r+b") as file:
+        write_header(file, header)
+
+
+class CheckpointFlusher:
+    """
+    Background thread that periodically flushes an agent's checkpoint.
+
+    Flushing runs off the game loop, so training never waits on disk I/O.
+    For memory-mapped tables only dirty pages are written back.
+    """
+
+    def __init__(self, agent, interval=CHECKPOINT_FLUSH_INTERVAL):
+        self.agent = agent
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-flusher", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.agent.flush()
+
+    def start(self):
+        """Start flushing in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background thread and do a final flush."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.agent.flush()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
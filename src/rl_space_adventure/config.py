@@ -1,13 +1,32 @@
 """
 Configuration constants for RL Space Adventure game.
+
+The constants are the defaults; GameConfig bundles the per-instance ones.
 """
 
+import dataclasses as _dataclasses
+
 # Game dimensions
 WIDTH, HEIGHT = 600, 600
 GRID_SIZE = 30
 GRID_WIDTH = WIDTH // GRID_SIZE
 GRID_HEIGHT = HEIGHT // GRID_SIZE
 FPS = 10
+FONT_NAME = "arial"
+FONT_SIZE = 24
+RANDOM_BLOCK_SIZE = 4096  # Uniforms pre-drawn per refill of a RandomStream
+RETAINED_RENDERING = True  # Cache surfaces and only update dirty rectangles
+
+# Turbo mode: many simulation steps per rendered frame
+TURBO_FPS = 30  # Frame budget in turbo mode
+TURBO_RENDER_INTERVAL = 1  # Render every Nth turbo frame (0: only on demand)
+MAX_STEPS_PER_FRAME = 10000
+
+# Profiling
+PROFILE_WINDOW = 1000  # Samples kept per phase for rolling percentiles
+PERF_OVERLAY_WIDTH = 330
+PERF_OVERLAY_LINE_HEIGHT = 20
+PERF_OVERLAY_REFRESH = 0.5  # Seconds between overlay text updates
 
 # Game limits
 MAX_COINS = 3
@@ -23,6 +42,9 @@ GREEN = (100, 255, 100)
 GRAY = (100, 100, 100)
 LIGHT_GRAY = (150, 150, 150)
 
+# Headless training
+MAX_EPISODE_STEPS = 1000  # Episode length cap, since staying put costs no fuel
+
 # Q-Learning parameters
 ALPHA = 0.1  # Learning rate
 GAMMA = 0.95  # Discount factor
@@ -34,6 +56,50 @@ EPSILON_DECAY = 0.995  # Exploration decay rate
 STATE_BINS = 4
 FUEL_BINS = 4
 
+# Q-table storage ("float32" halves memory compared to "float64")
+Q_TABLE_DTYPE = "float32"
+Q_TABLE_BACKEND = "dense"  # "dense", "sparse" or "tiles"
+SPARSE_Q_MEMORY_LIMIT = 64 * 1024 * 1024  # Bytes used by the sparse backend
+
+# Tile coding ("tiles" backend: linear values over the undiscretized state)
+TILE_CODING_TILINGS = 8  # Offset tilings per feature group
+TILE_CODING_TILES = 8  # Tiles per state component and tiling
+# State components tiled jointly: (player), (fuel), (coin delta), (enemy delta)
+# and (coin and enemy delta), indices into the RLAgent state tuple
+TILE_CODING_GROUPS = ((0, 1), (2,), (3, 4), (5, 6), (3, 4, 5, 6))
+TILE_CODING_CACHE_SIZE = 4096  # Single-state feature lookups kept between clears
+CHECKPOINT_FLUSH_INTERVAL = 30.0  # Seconds between background checkpoint flushes
+
+# Experience replay
+REPLAY_CAPACITY = 100000  # Transitions kept in the ring buffer
+REPLAY_BATCH_SIZE = 32  # Transitions per replayed minibatch
+REPLAY_INTERVAL = 1  # Steps between replayed minibatches (0 disables replay)
+REPLAY_PRIORITIZED = True  # Sample by TD error instead of uniformly
+REPLAY_PRIORITY_ALPHA = 0.6  # How strongly priorities skew sampling
+REPLAY_PRIORITY_BETA = 0.4  # Importance-sampling correction strength
+REPLAY_PRIORITY_EPSILON = 0.01  # Keeps zero-error transitions replayable
+
+# Model-based planning
+PLANNING_MODE = "sweeping"  # "sweeping" (prioritized by TD error) or "dyna" (uniform)
+PLANNING_BUDGET = 0  # Simulated backups per real step (0 disables planning)
+PLANNING_BATCH_SIZE = 32  # Backups applied per batched update
+PLANNING_THRESHOLD = 1e-3  # Minimum |TD error| for a pair to be queued
+
+# Telemetry
+TELEMETRY_BUFFER_SIZE = 10000  # Episodes buffered before the oldest are dropped
+TELEMETRY_FLUSH_INTERVAL = 1.0  # Seconds between background writes
+TELEMETRY_MAX_BYTES = 10 * 1024 * 1024  # File size that triggers a rotation
+TELEMETRY_BACKUPS = 5  # Rotated telemetry files kept
+TELEMETRY_COVERAGE_INTERVAL = 10  # Episodes between Q-table coverage scans
+
+# Trajectory recording
+TRAJECTORY_BUFFER_STEPS = 4096  # Step records buffered between log writes
+
+# Frame capture
+CAPTURE_BATCH_SIZE = 64  # Frames per batch handed to the writer threads
+CAPTURE_WORKERS = 2  # Writer threads
+CAPTURE_MAX_PENDING = 4  # Batches in flight before capture blocks
+
 # Actions: (dx, dy) - stay, up, down, left, right
 ACTIONS = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]
 
@@ -43,3 +109,70 @@ COIN_COLLECTION_REWARD = 20
 ENEMY_COLLISION_REWARD = -50
 FUEL_DEPLETION_REWARD = -100
 FUEL_RESTORE_PER_COIN = 5
+
+# Hyperparameter sweeps
+SWEEP_REPORT_INTERVAL = 50  # Episodes between a trial's progress reports
+SWEEP_SCORE_WINDOW = 100  # Episodes in a trial's rolling score
+SWEEP_GRACE_EPISODES = 200  # Episodes before a trial can be stopped early
+SWEEP_MIN_PEERS = 3  # Trials that must have reached a milestone before comparing
+SWEEP_STOP_PERCENTILE = 50  # Stop trials scoring below this percentile of their peers
+
+
+@_dataclasses.dataclass(frozen=True)
+class GameConfig:
+    """
+    Per-instance game and learning parameters.
+
+    Defaults are the module constants above. Passing a GameConfig to
+    SpaceAdventureEnv, RLAgent, Renderer and SpaceAdventureGame lets
+    several configurations run in one process, e.g. in a sweep.
+
+    Usage:
+        config = GameConfig(grid_width=10, grid_height=10, alpha=0.2)
+        config.replace(gamma=0.99)
+    """
+
+    grid_width: int = GRID_WIDTH
+    grid_height: int = GRID_HEIGHT
+    cell_size: int = GRID_SIZE  # Pixels per grid cell side when rendered
+    max_coins: int = MAX_COINS
+    max_enemies: int = MAX_ENEMIES
+    max_episode_steps: int = MAX_EPISODE_STEPS
+    alpha: float = ALPHA
+    gamma: float = GAMMA
+    epsilon_start: float = EPSILON_START
+    epsilon_end: float = EPSILON_END
+    epsilon_decay: float = EPSILON_DECAY
+    state_bins: int = STATE_BINS
+    fuel_bins: int = FUEL_BINS
+    fuel_consumption_reward: float = FUEL_CONSUMPTION_REWARD
+    coin_collection_reward: float = COIN_COLLECTION_REWARD
+    enemy_collision_reward: float = ENEMY_COLLISION_REWARD
+    fuel_depletion_reward: float = FUEL_DEPLETION_REWARD
+    fuel_restore_per_coin: float = FUEL_RESTORE_PER_COIN
+
+    @property
+    def width(self):
+        """Rendered board width in pixels."""
+        return self.grid_width * self.cell_size
+
+    @property
+    def height(self):
+        """Rendered board height in pixels."""
+        return self.grid_height * self.cell_size
+
+    def replace(self, **overrides):
+        """Get a copy with some parameters changed."""
+        return _dataclasses.replace(self, **overrides)
+
+    def to_dict(self):
+        """Get the parameters as a JSON-serializable dictionary."""
+        return _dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Create a config from a dictionary of parameters (unknown keys are rejected)."""
+        return cls(**values)
+
+
+DEFAULT_CONFIG = GameConfig()
@@ -0,0 +1,61 @@
+"""
+Entity classes for RL Space Adventure.
+
+These classes hold the per-entity game rules and do not depend on pygame,
+so they can be shared by the headless environment and the viewer.
+"""
+
+from .config import *
+
+
+class GameEntity:
+    """Base class for game entities with position."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @property
+    def position(self):
+        """Get position as tuple."""
+        return (self.x, self.y)
+
+    @position.setter
+    def position(self, pos):
+        """Set position from tuple."""
+        self.x, self.y = pos
+
+
+class Player(GameEntity):
+    """Player spaceship entity."""
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.fuel = 100.0
+
+    def move(self, dx, dy, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        """Move player within the grid and consume fuel."""
+        self.x = max(0, min(grid_width - 1, self.x + dx))
+        self.y = max(0, min(grid_height - 1, self.y + dy))
+        self.fuel = max(0, self.fuel - 0.1)
+
+    def refuel(self, amount):
+        """Add fuel to player."""
+        self.fuel = min(100, self.fuel + amount)
+
+
+class Coin(GameEntity):
+    """Coin/star collectible entity."""
+    pass
+
+
+class Enemy(GameEntity):
+    """Enemy/asteroid entity."""
+
+    def move_toward(self, target_x, target_y, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        """Move enemy toward target position within the grid."""
+        dx = 1 if target_x > self.x else -1 if target_x < self.x else 0
+        dy = 1 if target_y > self.y else -1 if target_y < self.y else 0
+
+        self.x = max(0, min(grid_width - 1, self.x + dx))
+        self.y = max(0, min(grid_height - 1, self.y + dy))
@@ -0,0 +1,270 @@
+"""
+Headless simulation core for RL Space Adventure.
+
+The environment implements the game rules without importing pygame, so it
+can be stepped at raw CPU speed on machines without a display.
+"""
+
+from itertools import chain
+from .config import *
+from .entities import Player, Coin, Enemy
+from .spatial import OccupancyGrid, NearestIndex
+from .profiling import Profiler
+from .rng import RandomStream
+
+
+class SpaceAdventureEnv:
+    """Pure-logic game environment with a reset()/step() interface."""
+
+    def __init__(self, seed=None, max_coins=None, max_enemies=None, config=DEFAULT_CONFIG):
+        """
+        Args:
+            seed: Optional seed for the environment's random stream
+            max_coins: Number of coins on the board (config.max_coins by default)
+            max_enemies: Number of enemies on the board (config.max_enemies by default)
+            config: GameConfig with the grid size and rewards
+        """
+        if max_coins is not None:
+            config = config.replace(max_coins=max_coins)
+        if max_enemies is not None:
+            config = config.replace(max_enemies=max_enemies)
+        if config.max_coins >= config.grid_width * config.grid_height:
+            raise ValueError("max_coins must leave at least one cell for the player")
+        if max(config.grid_width, config.grid_height) > 256:
+            raise ValueError("Grid sides are limited to 256 cells (see packed_positions)")
+        self.config = config
+        self.rng = RandomStream(seed)
+        self.profiler = Profiler()
+        self.max_coins = config.max_coins
+        self.max_enemies = config.max_enemies
+        self.grid_width = config.grid_width
+        self.grid_height = config.grid_height
+        self.grid = OccupancyGrid(self.grid_width, self.grid_height)
+        self.coin_index = NearestIndex(self.grid_width, self.grid_height)
+        self.enemy_index = NearestIndex(self.grid_width, self.grid_height)
+
+        # Game state
+        self.player = None
+        self.coins = []
+        self.enemies = []
+        self.score = 0
+        self.episode_count = 0
+        self.episode_seed = None
+
+        # Entity positions by slot, updated in place as entities move so
+        # observers can read them without rebuilding lists every frame
+        self.coin_positions = []
+        self.enemy_positions = []
+        # Incremented whenever the observation changes (see SpaceAdventureGame.current_state)
+        self.version = 0
+        # Player, coin and enemy coordinates packed one byte each, in slot
+        # order, for cheap trajectory recording (see TrajectoryRecorder)
+        self.packed_positions = bytearray()
+        self._enemy_offset = 0
+
+        self.reset()
+
+    def _spawn_coins(self):
+        """Spawn initial coins on distinct cells away from the player."""
+        self.coins = []
+        for slot in range(self.max_coins):
+            coin = Coin(*self.grid.sample_free(self.rng))
+            self.grid.add_coin(slot, coin.position)
+            self.coin_index.add(slot, coin.position)
+            self.coins.append(coin)
+        self.coin_positions = [coin.position for coin in self.coins]
+
+    def _spawn_enemies(self):
+        """Spawn initial enemies."""
+        self.enemies = []
+        for slot in range(self.max_enemies):
+            enemy = Enemy(
+                self.rng.randint(0, self.grid_width - 1),
+                self.rng.randint(0, self.grid_height - 1)
+            )
+            self.grid.add_enemy(enemy.position)
+            self.enemy_index.add(slot, enemy.position)
+            self.enemies.append(enemy)
+        self.enemy_positions = [enemy.position for enemy in self.enemies]
+
+    def set_coins(self, positions):
+        """Replace the coins with coins at the given distinct positions."""
+        for coin in self.coins:
+            self.grid.remove_coin(coin.position)
+        self.coins = []
+        self.coin_index.clear()
+        for slot, pos in enumerate(positions):
+            self.grid.add_coin(slot, pos)
+            self.coin_index.add(slot, pos)
+            self.coins.append(Coin(*pos))
+        self.coin_positions = [coin.position for coin in self.coins]
+        self._pack_positions()
+        self.version += 1
+
+    def set_enemies(self, positions):
+        """Replace the enemies with enemies at the given positions."""
+        for enemy in self.enemies:
+            self.grid.remove_enemy(enemy.position)
+        self.enemies = []
+        self.enemy_index.clear()
+        for slot, pos in enumerate(positions):
+            self.grid.add_enemy(pos)
+            self.enemy_index.add(slot, pos)
+            self.enemies.append(Enemy(*pos))
+        self.enemy_positions = [enemy.position for enemy in self.enemies]
+        self._pack_positions()
+        self.version += 1
+
+    def reset(self, seed=None):
+        """
+        Start a new episode.
+
+        Args:
+            seed: Optional seed to reseed the environment's random stream;
+                kept as episode_seed, so the episode can be replayed with
+                reset(episode_seed)
+
+        Returns:
+            Initial observation
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.episode_seed = seed
+        self.player = Player(self.grid_width // 2, self.grid_height // 2)
+        self.grid.clear()
+        self.coin_index.clear()
+        self.enemy_index.clear()
+        self.grid.place_player(self.player.position)
+        self._spawn_coins()
+        self._spawn_enemies()
+        self._pack_positions()
+        self.version += 1
+        return self.get_observation()
+
+    def _pack_positions(self):
+        """Rebuild packed_positions from the entity positions."""
+        self.packed_positions = bytearray(chain.from_iterable(
+            [self.player.position, *self.coin_positions, *self.enemy_positions]))
+        self._enemy_offset = 2 + 2 * len(self.coin_positions)
+
+    def get_observation(self):
+        """
+        Get the current observation.
+
+        Returns:
+            Tuple of (player position, fuel, coin positions, enemy positions),
+            matching the arguments of RLAgent.get_state. The position lists
+            are copies; read coin_positions/enemy_positions for live views.
+        """
+        return (
+            self.player.position, self.player.fuel,
+            list(self.coin_positions), list(self.enemy_positions)
+        )
+
+    def get_indexed_observation(self):
+        """
+        Get the current observation with nearest-neighbour indexes.
+
+        Returns:
+            Tuple of (player position, fuel, coin index, enemy index); the
+            indexes are NearestIndex objects accepted by RLAgent.get_state
+        """
+        return self.player.position, self.player.fuel, self.coin_index, self.enemy_index
+
+    def update_enemies(self):
+        """Update enemy positions to chase player."""
+        target_x, target_y = self.player.x, self.player.y
+        width, height = self.grid_width, self.grid_height
+        for slot, enemy in enumerate(self.enemies):
+            if self.rng.random() < 0.5:  # 50% chance to move each frame
+                old_pos = enemy.position
+                enemy.move_toward(target_x, target_y, width, height)
+                new_pos = enemy.position
+                if new_pos != old_pos:
+                    self.grid.move_enemy(old_pos, new_pos)
+                    self.enemy_index.move(slot, new_pos)
+                    self.enemy_positions[slot] = new_pos
+                    offset = self._enemy_offset + 2 * slot
+                    self.packed_positions[offset:offset + 2] = new_pos
+                    self.version += 1
+
+    def check_collisions(self):
+        """
+        Check for collisions and update game state.
+
+        Returns:
+            Tuple of (reward, info) where info holds the number of coins
+            collected and the termination cause ("enemy", "fuel" or None)
+        """
+        config = self.config
+        reward = config.fuel_consumption_reward
+        player_pos = self.player.position
+
+        # Check coin collection (coins never share a cell)
+        collected = 0
+        slot = self.grid.coin_at(player_pos)
+        if slot >= 0:
+            collected = 1
+            reward = config.coin_collection_reward
+            self.score += 1
+            self.player.refuel(config.fuel_restore_per_coin)
+
+            # Respawn the coin on a cell free of the player and other coins
+            self.grid.remove_coin(player_pos)
+            coin = self.coins[slot]
+            coin.position = self.grid.sample_free(self.rng)
+            self.grid.add_coin(slot, coin.position)
+            self.coin_index.move(slot, coin.position)
+            self.coin_positions[slot] = coin.position
+            self.packed_positions[2 + 2 * slot:4 + 2 * slot] = coin.position
+            self.version += 1
+
+        # Check enemy collision or fuel depletion
+        termination = None
+        enemy_collision = self.grid.enemies_at(player_pos) > 0
+        if enemy_collision or self.player.fuel <= 0:
+            reward = (config.enemy_collision_reward if enemy_collision
+                      else config.fuel_depletion_reward)
+            termination = "enemy" if enemy_collision else "fuel"
+
+        return reward, {"coins": collected, "termination": termination}
+
+    def step(self, action, observe=True):
+        """
+        Advance the game by one step.
+
+        The environment does not reset itself when an episode ends; callers
+        should call reset() after receiving done=True.
+
+        Args:
+            action: Index into ACTIONS
+            observe: If False, skip copying the observation (returned as
+                None), for callers that read the live state instead
+
+        Returns:
+            Tuple of (observation, reward, done, info)
+        """
+        dx, dy = ACTIONS[action]
+
+        # Move player if action is not stay
+        if (dx, dy) != (0, 0):
+            old_pos = self.player.position
+            self.player.move(dx, dy, self.grid_width, self.grid_height)
+            self.grid.move_player(old_pos, self.player.position)
+            self.packed_positions[0:2] = self.player.position
+            self.version += 1
+
+        # Update enemies
+        profiler = self.profiler
+        t = profiler.start()
+        self.update_enemies()
+        t = profiler.lap("update_enemies", t)
+
+        # Check collisions and get reward
+        reward, info = self.check_collisions()
+        profiler.lap("check_collisions", t)
+        done = info["termination"] is not None
+        if done:
+            self.episode_count += 1
+
+        return (self.get_observation() if observe else None), reward, done, info
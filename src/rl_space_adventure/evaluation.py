@@ -0,0 +1,235 @@
+"""
+Parallel policy evaluation for RL Space Adventure.
+
+Runs the greedy policy of a saved agent over many seeded episodes on a
+process pool, streams per-episode results as chunks finish and summarizes
+score, length and fuel distributions with confidence intervals.
+
+Usage:
+    python -m src.rl_space_adventure evaluate agent.qt --episodes 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .config import *
+from .checkpoint import MAGIC, POLICY_MAGIC, read_header
+from .env import SpaceAdventureEnv
+from .rl_agent import RLAgent
+from .training import run_episode
+
+EVALUATION_METRICS = ("coins", "return", "length", "fuel")
+CONFIDENCE_Z = 1.96  # Two-sided 95% normal interval
+
+# Agent of the current worker process, loaded once by _init_worker
+_worker_agent = None
+
+
+def load_greedy_agent(path):
+    """
+    Load a Q-table checkpoint or policy file as a greedy agent.
+
+    Checkpoints are mapped read-only and their greedy actions cached, so
+    every step is a single byte lookup either way. The agent's config takes
+    the discretization and grid size recorded in the file's header.
+
+    Args:
+        path: Checkpoint or policy file path
+
+    Returns:
+        RLAgent with epsilon 0 and a frozen policy cache
+    """
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+    header = read_header(path, POLICY_MAGIC if magic == POLICY_MAGIC else MAGIC)
+    # Files written before the grid size was configurable used the default grid
+    grid_width, grid_height = header.get("grid", (GRID_WIDTH, GRID_HEIGHT))
+    config = DEFAULT_CONFIG.replace(
+        state_bins=header["state_bins"], fuel_bins=header["fuel_bins"],
+        grid_width=grid_width, grid_height=grid_height)
+    if magic == POLICY_MAGIC:
+        return RLAgent.load_policy(path, config=config)
+    agent = RLAgent.load(path, mode="r", config=config)
+    agent.cache_policy(frozen=True)
+    agent.epsilon = 0.0
+    return agent
+
+
+def _init_worker(path):
+    """Process pool initializer: load the agent once per worker."""
+    global _worker_agent
+    _worker_agent = load_greedy_agent(path)
+
+
+def evaluate_seeds(agent, seeds, max_steps=MAX_EPISODE_STEPS):
+    """
+    Play one greedy episode per seed.
+
+    Args:
+        agent: Greedy RLAgent; episodes are played with its config
+        seeds: Environment seeds, one per episode
+        max_steps: Episode length cap
+
+    Returns:
+        List of run_episode result dictionaries with the seed added
+    """
+    results = []
+    for seed in seeds:
+        result = run_episode(SpaceAdventureEnv(seed=seed, config=agent.config), agent, learn=False,
+                             max_steps=max_steps)
+        result["seed"] = seed
+        results.append(result)
+    return results
+
+
+def _evaluate_chunk(seeds, max_steps):
+    """Process pool task: evaluate a chunk of seeds with the worker's agent."""
+    return evaluate_seeds(_worker_agent, seeds, max_steps)
+
+
+def summarize(results):
+    """
+    Summarize episode results.
+
+    Args:
+        results: run_episode result dictionaries
+
+    Returns:
+        Dictionary with the episode count, termination cause counts and,
+        per metric in EVALUATION_METRICS, the mean with a 95% confidence
+        interval, standard deviation and percentiles (None if there are no
+        results)
+    """
+    summary = {"episodes": len(results), "terminations": {}}
+    for result in results:
+        cause = result["termination"] or "max_steps"
+        summary["terminations"][cause] = summary["terminations"].get(cause, 0) + 1
+
+    for metric in EVALUATION_METRICS:
+        if not results:
+            summary[metric] = None
+            continue
+        values = np.array([result[metric] for result in results], dtype=np.float64)
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+        half_width = CONFIDENCE_Z * std / np.sqrt(len(values))
+        p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+        summary[metric] = {
+            "mean": mean,
+            "ci95": [mean - half_width, mean + half_width],
+            "std": std,
+            "min": float(values.min()),
+            "p5": float(p5),
+            "p25": float(p25),
+            "p50": float(p50),
+            "p75": float(p75),
+            "p95": float(p95),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def evaluate(path, episodes=1000, workers=None, seed=0, max_steps=MAX_EPISODE_STEPS,
+             chunk_size=64, on_results=None):
+    """
+    Evaluate a saved agent over seeded episodes on a process pool.
+
+    Episode i uses environment seed seed + i, so results do not depend on
+    the number of workers or the order chunks finish in.
+
+    Args:
+        path: Checkpoint or policy file path
+        episodes: Number of episodes
+        workers: Number of worker processes (CPU count by default; 0 runs
+            in this process)
+        seed: Seed of the first episode
+        max_steps: Episode length cap
+        chunk_size: Episodes per pool task
+        on_results: Optional callback receiving each finished chunk's
+            results, for streaming
+
+    Returns:
+        Tuple of (summary, results sorted by seed)
+    """
+    seeds = list(range(seed, seed + episodes))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, episodes, chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = []
+
+    if workers == 0:
+        agent = load_greedy_agent(path)
+        for chunk in chunks:
+            chunk_results = evaluate_seeds(agent, chunk, max_steps)
+            results.extend(chunk_results)
+            if on_results is not None:
+                on_results(chunk_results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(path,)) as pool:
+            futures = [pool.submit(_evaluate_chunk, chunk, max_steps) for chunk in chunks]
+            for future in as_completed(futures):
+                chunk_results = future.result()
+                results.extend(chunk_results)
+                if on_results is not None:
+                    on_results(chunk_results)
+
+    results.sort(key=lambda result: result["seed"])
+    return summarize(results), results
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="rl-space-adventure evaluate",
+                                     description="Evaluate a saved agent's greedy policy.")
+    parser.add_argument("path", help="Q-table checkpoint or policy file")
+    parser.add_argument("--episodes", type=int, default=1000, help="Number of seeded episodes")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first episode")
+    parser.add_argument("--max-steps", type=int, default=MAX_EPISODE_STEPS,
+                        help="Episode length cap")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Episodes per pool task")
+    parser.add_argument("--results", help="Stream per-episode results to this JSON lines file")
+    parser.add_argument("--output", help="Write the JSON summary to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run an evaluation from the command line and return the exit status."""
+    args = parse_args(argv)
+    results_file = open(args.results, "w", encoding="utf-8") if args.results else None
+    finished = []
+    start = time.perf_counter()
+
+    def on_results(chunk_results):
+        finished.extend(chunk_results)
+        if results_file is not None:
+            for result in chunk_results:
+                results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+        coins = np.array([result["coins"] for result in finished], dtype=np.float64)
+        half_width = CONFIDENCE_Z * coins.std() / np.sqrt(len(coins))
+        print(f"[{len(finished):>{len(str(args.episodes))}}/{args.episodes}] "
+              f"coins {coins.mean():.3f} ± {half_width:.3f}  "
+              f"{len(finished) / (time.perf_counter() - start):,.0f} episodes/s",
+              file=sys.stderr)
+
+    try:
+        summary, _ = evaluate(args.path, args.episodes, args.workers, args.seed,
+                              args.max_steps, args.chunk_size, on_results)
+    finally:
+        if results_file is not None:
+            results_file.close()
+
+    summary["elapsed"] = time.perf_counter() - start
+    text = json.dumps(summary, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
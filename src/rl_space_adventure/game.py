@@ -1,127 +1,185 @@
 """
-Main game logic and entity classes for RL Space Adventure.
+Main game viewer for RL Space Adventure.
+
+The game rules live in the headless SpaceAdventureEnv; this module adds the
+pygame window, input handling and the agent's learning loop on top of it.
 """
 
-import random
+import asyncio
+import os
+import time
+import numpy as np
 import pygame
 from .config import *
+from .env import SpaceAdventureEnv
 from .rl_agent import RLAgent
-from .rendering import Renderer
-
-
-class GameEntity:
-    """Base class for game entities with position."""
-
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    @property
-    def position(self):
-        """Get position as tuple."""
-        return (self.x, self.y)
-
-    @position.setter
-    def position(self, pos):
-        """Set position from tuple."""
-        self.x, self.y = pos
-
-
-class Player(GameEntity):
-    """Player spaceship entity."""
-
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.fuel = 100.0
-
-    def move(self, dx, dy):
-        """Move player and consume fuel."""
-        self.x = max(0, min(GRID_WIDTH - 1, self.x + dx))
-        self.y = max(0, min(GRID_HEIGHT - 1, self.y + dy))
-        self.fuel = max(0, self.fuel - 0.1)
-
-    def refuel(self, amount):
-        """Add fuel to player."""
-        self.fuel = min(100, self.fuel + amount)
-
-
-class Coin(GameEntity):
-    """Coin/star collectible entity."""
-    pass
-
-
-class Enemy(GameEntity):
-    """Enemy/asteroid entity."""
-
-    def move_toward(self, target_x, target_y):
-        """Move enemy toward target position."""
-        dx = 1 if target_x > self.x else -1 if target_x < self.x else 0
-        dy = 1 if target_y > self.y else -1 if target_y < self.y else 0
-
-        self.x = max(0, min(GRID_WIDTH - 1, self.x + dx))
-        self.y = max(0, min(GRID_HEIGHT - 1, self.y + dy))
+from .replay import ReplayBuffer
+from .planning import Planner
+from .recording import TrajectoryRecorder
+from .telemetry import TelemetryWriter
+from .checkpoint import CheckpointFlusher
+from .scheduler import GameLoopScheduler
+from .profiling import Profiler
+from .rendering import Renderer, RetainedRenderer, load_font
 
 
 class SpaceAdventureGame:
-    """Main game class managing game state and logic."""
+    """Main game class managing the display, input and learning loop."""
 
-    def __init__(self):
-        pygame.init()
+    def __init__(self, checkpoint=None, profile=False, policy=None, seed=None,
+                 record=None, config=DEFAULT_CONFIG, telemetry=None):
+        """
+        Args:
+            checkpoint: Optional Q-table checkpoint path. The agent learns
+                directly into the memory-mapped file, which is created if it
+                does not exist and flushed periodically in the background.
+            profile: Whether to start with profiling and its overlay enabled
+            policy: Optional greedy-policy file to demo instead of learning
+            seed: Optional seed making the agent's and the game's random
+                streams (and so an unattended RL run) reproducible
+            record: Optional trajectory log path every episode is recorded
+                to, for later replay
+            config: GameConfig shared by the environment, agent and renderer
+            telemetry: Optional path per-episode metrics are streamed to
+                (JSON lines, or CSV for a .csv path)
+        """
+        # Only the subsystems the viewer uses (pygame.init() also starts audio etc.)
+        pygame.display.init()
+        pygame.font.init()
 
         # Initialize display
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.config = config
+        self.screen = pygame.display.set_mode((config.width, config.height))
         pygame.display.set_caption("RL Space Adventure")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("arial", 24)
+        self.font = load_font(FONT_NAME, FONT_SIZE)
 
         # Initialize components
-        self.renderer = Renderer(self.screen, self.font)
-        self.agent = RLAgent()
-
-        # Game state
-        self.player = Player(GRID_WIDTH // 2, GRID_HEIGHT // 2)
-        self.coins = []
-        self.enemies = []
-        self.score = 0
+        renderer_class = RetainedRenderer if RETAINED_RENDERING else Renderer
+        self.renderer = renderer_class(self.screen, self.font, config)
+        agent_seed, env_seed, replay_seed, planner_seed = np.random.SeedSequence(seed).spawn(4)
+        self.agent = (RLAgent.load_policy(policy, config=config) if policy
+                      else self._create_agent(checkpoint, config))
+        self.agent.rng.seed(agent_seed)
+        self.learning = self.agent.table is not None
+        self.env = SpaceAdventureEnv(seed=env_seed, config=config)
+        self.flusher = CheckpointFlusher(self.agent).start() if checkpoint and self.learning else None
+        self.replay = ReplayBuffer(seed=replay_seed) if REPLAY_INTERVAL and self.learning else None
+        self.planner = (Planner(self.agent, seed=planner_seed)
+                        if PLANNING_BUDGET and self.learning and not self.agent.approximate
+                        else None)
+        self.learning_steps = 0
+        self.recorder = (TrajectoryRecorder(record, config.max_coins, config.max_enemies,
+                                            grid=(config.grid_width, config.grid_height))
+                         if record else None)
+        if self.recorder is not None:
+            # Reseed recorded episodes so the logged seed reproduces them
+            self.env.reset(self.env.rng.draw_seed())
+            self.recorder.begin_episode(self.env, self.env.episode_seed)
+        self.telemetry = TelemetryWriter(telemetry).start() if telemetry else None
+        self.episode_return = 0.0
+        self.episode_length = 0
+        self.episode_coins = 0
+        self.scheduler = GameLoopScheduler()
+
+        # Profiling shared by the viewer, environment and renderer (press P)
+        self.profiler = Profiler(enabled=profile)
+        self.env.profiler = self.renderer.profiler = self.profiler
+        self.perf_lines = []
+        self.perf_lines_time = 0.0
+
+        # Viewer state
         self.manual_mode = False
-        self.episode_count = 0
-
-        # Initialize entities
-        self._spawn_coins()
-        self._spawn_enemies()
-
-    def _spawn_coins(self):
-        """Spawn initial coins."""
-        self.coins = []
-        for _ in range(MAX_COINS):
-            self.coins.append(Coin(
-                random.randint(0, GRID_WIDTH - 1),
-                random.randint(0, GRID_HEIGHT - 1)
-            ))
-
-    def _spawn_enemies(self):
-        """Spawn initial enemies."""
-        self.enemies = []
-        for _ in range(MAX_ENEMIES):
-            self.enemies.append(Enemy(
-                random.randint(0, GRID_WIDTH - 1),
-                random.randint(0, GRID_HEIGHT - 1)
-            ))
-
-    def reset_episode(self):
-        """Reset game state for new episode."""
-        self.player = Player(GRID_WIDTH // 2, GRID_HEIGHT // 2)
-        self._spawn_coins()
-        self._spawn_enemies()
-        self.episode_count += 1
-        self.agent.decay_epsilon()
+        self.running = True
+
+        # Discrete state of the current observation, recomputed only when
+        # the environment's version changes
+        self.state = None
+        self.state_version = -1
+
+    @staticmethod
+    def _create_agent(checkpoint, config):
+        """Create the agent, mapping its Q-table from a checkpoint if given."""
+        if checkpoint is None:
+            return RLAgent(config=config)
+        if not os.path.exists(checkpoint):
+            RLAgent(config=config).save(checkpoint)
+        return RLAgent.load(checkpoint, mode="r+", config=config)
+
+    @property
+    def player(self):
+        """Player entity of the underlying environment."""
+        return self.env.player
+
+    @property
+    def coins(self):
+        """Coin entities of the underlying environment."""
+        return self.env.coins
+
+    @property
+    def enemies(self):
+        """Enemy entities of the underlying environment."""
+        return self.env.enemies
+
+    @property
+    def score(self):
+        """Total number of coins collected."""
+        return self.env.score
+
+    @property
+    def episode_count(self):
+        """Number of finished episodes."""
+        return self.env.episode_count
+
+    def current_state(self):
+        """Get the agent's discrete state of the current observation (cached)."""
+        if self.state_version != self.env.version:
+            self.state = self.agent.get_state(*self.env.get_indexed_observation())
+            self.state_version = self.env.version
+        return self.state
+
+    def reset_episode(self, termination=None):
+        """
+        Reset game state for new episode.
+
+        Args:
+            termination: Termination cause of the finished episode, for telemetry
+        """
+        if self.telemetry is not None:
+            self.telemetry.record_episode({
+                "return": self.episode_return,
+                "length": self.episode_length,
+                "coins": self.episode_coins,
+                "termination": termination,
+            }, self.agent)
+        self.episode_return = 0.0
+        self.episode_length = 0
+        self.episode_coins = 0
+        if self.recorder is not None:
+            self.env.reset(self.env.rng.draw_seed())
+            self.recorder.begin_episode(self.env, self.env.episode_seed)
+        else:
+            self.env.reset()
+        if self.learning:
+            self.agent.decay_epsilon()
 
     def handle_input(self):
         """Handle user input events."""
         for event in pygame.event.get():
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.renderer.button_rect.collidepoint(event.pos):
                     self.manual_mode = not self.manual_mode
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                self.scheduler.toggle_turbo()
+                caption = "RL Space Adventure (turbo)" if self.scheduler.turbo else "RL Space Adventure"
+                pygame.display.set_caption(caption)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                self.scheduler.request_render()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                self.profiler.enabled = not self.profiler.enabled
+                self.perf_lines = []
 
     def get_manual_action(self):
         """Get action from manual player input."""
@@ -139,105 +197,121 @@ class SpaceAdventureGame:
 
         return ACTIONS.index((dx, dy)) if (dx, dy) in ACTIONS else 0, dx, dy
 
-    def update_enemies(self):
-        """Update enemy positions to chase player."""
-        for enemy in self.enemies:
-            if random.random() < 0.5:  # 50% chance to move each frame
-                enemy.move_toward(self.player.x, self.player.y)
-
-    def check_collisions(self):
-        """
-        Check for collisions and update game state.
-
-        Returns:
-            Reward for the current action
-        """
-        reward = FUEL_CONSUMPTION_REWARD
-
-        # Check coin collection
-        collected_coins = [coin for coin in self.coins if coin.position == self.player.position]
-        if collected_coins:
-            reward = COIN_COLLECTION_REWARD
-            self.score += len(collected_coins)
-            self.player.refuel(FUEL_RESTORE_PER_COIN * len(collected_coins))
-
-            # Remove collected coins and spawn new ones
-            self.coins = [coin for coin in self.coins if coin not in collected_coins]
-            while len(self.coins) < MAX_COINS:
-                new_coin = Coin(
-                    random.randint(0, GRID_WIDTH - 1),
-                    random.randint(0, GRID_HEIGHT - 1)
-                )
-                # Ensure no overlap with player or existing coins
-                if (new_coin.position not in [coin.position for coin in self.coins] and
-                    new_coin.position != self.player.position):
-                    self.coins.append(new_coin)
-
-        # Check enemy collision or fuel depletion
-        enemy_collision = any(enemy.position == self.player.position for enemy in self.enemies)
-        if enemy_collision or self.player.fuel <= 0:
-            reward = ENEMY_COLLISION_REWARD if enemy_collision else FUEL_DEPLETION_REWARD
-            self.reset_episode()
-
-        return reward
-
     def update(self):
-        """Update game state for one frame."""
+        """Handle input and advance the game by one step."""
+        # Not profiler.start(): handle_input may turn profiling on
+        input_start = time.perf_counter()
         self.handle_input()
+        self.profiler.lap("input", input_start)
+        self.step()
 
-        # Get current state
-        current_state = self.agent.get_state(
-            self.player.position, self.player.fuel,
-            [coin.position for coin in self.coins],
-            [enemy.position for enemy in self.enemies]
-        )
+    def step(self):
+        """Advance the simulation and learning by one step."""
+        profiler = self.profiler
+        t = profiler.start()
+
+        # Get current state (usually the previous step's next state)
+        current_state = self.current_state()
+        t = profiler.lap("get_state", t)
 
-        # Choose and execute action
+        # Choose action
         if self.manual_mode:
             action_idx, dx, dy = self.get_manual_action()
         else:
             action_idx = self.agent.choose_action(current_state)
-            dx, dy = ACTIONS[action_idx]
-
-        # Move player if action is not stay
-        if (dx, dy) != (0, 0):
-            self.player.move(dx, dy)
-
-        # Update enemies
-        self.update_enemies()
-
-        # Check collisions and get reward
-        reward = self.check_collisions()
+        t = profiler.lap("choose_action", t)
+
+        # Step the simulation and start a new episode if this one ended
+        _, reward, done, info = self.env.step(action_idx, observe=False)
+        self.episode_return += reward
+        self.episode_length += 1
+        self.episode_coins += info["coins"]
+        if self.recorder is not None:
+            self.recorder.record_step(self.env, action_idx, reward)
+            if done:
+                self.recorder.end_episode(info["termination"])
+        if done:
+            self.reset_episode(info["termination"])
+        t = profiler.start()
 
         # Update Q-learning if not manual mode or player made a move
-        if not self.manual_mode or (dx, dy) != (0, 0):
-            next_state = self.agent.get_state(
-                self.player.position, self.player.fuel,
-                [coin.position for coin in self.coins],
-                [enemy.position for enemy in self.enemies]
-            )
-            self.agent.update_q_value(current_state, action_idx, reward, next_state)
+        if self.learning and (not self.manual_mode or ACTIONS[action_idx] != (0, 0)):
+            next_state = self.current_state()
+            self.agent.update_q_value(current_state, action_idx, reward, next_state, done)
+            self.learning_steps += 1
+            if self.replay is not None:
+                # Done transitions never bootstrap, so storing the reset state is harmless
+                self.replay.add(current_state, action_idx, reward, next_state, done)
+                if self.learning_steps % REPLAY_INTERVAL == 0:
+                    self.agent.replay(self.replay)
+            if self.planner is not None:
+                self.planner.step(current_state, action_idx, reward, next_state, done)
+        profiler.lap("q_update", t)
 
     def render(self):
         """Render the current game state."""
+        env = self.env
         self.renderer.render_frame(
-            self.player.position,
-            [coin.position for coin in self.coins],
-            [enemy.position for enemy in self.enemies],
-            self.score, self.manual_mode, self.player.fuel, self.episode_count
+            env.player.position, env.coin_positions, env.enemy_positions,
+            self.score, self.manual_mode, env.player.fuel, self.episode_count,
+            perf_lines=self._perf_overlay_lines()
         )
 
-    def run(self):
-        """Main synchronous game loop."""
-        while True:
-            self.update()
+    def _perf_overlay_lines(self):
+        """Get the profiling overlay text, refreshed every PERF_OVERLAY_REFRESH seconds."""
+        if not self.profiler.enabled:
+            return None
+        now = time.perf_counter()
+        if now - self.perf_lines_time >= PERF_OVERLAY_REFRESH:
+            self.perf_lines = self.profiler.summary_lines()
+            self.perf_lines_time = now
+        return self.perf_lines
+
+    def close(self):
+        """Flush the checkpoint and trajectory log, if any, and shut down pygame."""
+        if self.flusher is not None:
+            self.flusher.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        pygame.quit()
+
+    def run_frame(self):
+        """
+        Run one frame of the game loop as planned by the scheduler.
+
+        Input is polled once per frame, followed by the planned number of
+        simulation steps and, if planned, a render.
+
+        Returns:
+            time.perf_counter() value at the start of the frame
+        """
+        frame_start = time.perf_counter()
+        steps, render = self.scheduler.plan_frame()
+        self.handle_input()
+        self.profiler.lap("input", frame_start)
+        for _ in range(steps):
+            self.step()
+
+        render_start = time.perf_counter()
+        if render:
             self.render()
-            self.clock.tick(FPS)
+        self.scheduler.record(steps, render_start - frame_start,
+                              time.perf_counter() - render_start if render else None)
+        return frame_start
+
+    def run(self):
+        """Main synchronous game loop (press T to toggle turbo mode)."""
+        while self.running:
+            self.run_frame()
+            self.clock.tick(self.scheduler.target_fps)
+        self.close()
 
     async def run_async(self):
-        """Main asynchronous game loop."""
-        while True:
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
-            await asyncio.sleep(1.0 / FPS)
+        """Main asynchronous game loop (press T to toggle turbo mode)."""
+        while self.running:
+            frame_start = self.run_frame()
+            # Pace by sleeping only; always yield so the browser stays responsive
+            await asyncio.sleep(self.scheduler.frame_delay(frame_start))
+        self.close()
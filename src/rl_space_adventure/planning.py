@@ -0,0 +1,229 @@
+"""
+Model-based planning for the RL agent (Dyna-Q and prioritized sweeping).
+
+A tabular model remembers the last outcome of every observed (state, action)
+pair. Between real steps the planner replays simulated backups from the
+model, so a reward such as COIN_COLLECTION_REWARD propagates back through
+many states per real step instead of one state per visit.
+"""
+
+import heapq
+from itertools import chain
+import numpy as np
+from .config import *
+
+
+class TabularModel:
+    """
+    Last-seen transition and reward model of the observed (state, action) pairs.
+
+    Only observed pairs are stored, so the model grows with experience
+    rather than with the state space and works with the sparse Q-table
+    backend. Each pair gets a slot, numbered in order of first observation,
+    and its outcome is kept in slot-indexed arrays that double in size as
+    needed. The game is stochastic (enemies move randomly), so the model
+    keeps the most recent outcome of each pair, as in tabular Dyna-Q. It
+    also indexes the predecessor slots of every state, which prioritized
+    sweeping uses to push value changes backwards.
+    """
+
+    def __init__(self, num_states, num_actions, capacity=1024):
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.slots = {}
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.predecessors = {}
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def capacity(self):
+        """Number of slots allocated."""
+        return len(self.states)
+
+    @property
+    def nbytes(self):
+        """Memory used by the model arrays in bytes."""
+        return (self.states.nbytes + self.actions.nbytes + self.next_states.nbytes
+                + self.rewards.nbytes + self.dones.nbytes)
+
+    def _grow(self):
+        """Double the slot arrays."""
+        for name in ("states", "actions", "next_states", "rewards", "dones"):
+            array = getattr(self, name)
+            grown = np.zeros(2 * len(array), dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def update(self, state, action, reward, next_state, done):
+        """
+        Record the outcome of a real transition.
+
+        Returns:
+            Slot of the (state, action) pair
+        """
+        key = state * self.num_actions + action
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.slots)
+            if slot == self.capacity:
+                self._grow()
+            self.states[slot] = state
+            self.actions[slot] = action
+        else:
+            previous = int(self.next_states[slot])
+            if previous != next_state:
+                self.predecessors[previous].discard(slot)
+        self.next_states[slot] = next_state
+        self.rewards[slot] = reward
+        self.dones[slot] = done
+        self.predecessors.setdefault(int(next_state), set()).add(slot)
+        return slot
+
+    def predecessors_of(self, states):
+        """Get an array of slots of the pairs leading into any of the given states."""
+        slots = chain.from_iterable(self.predecessors.get(int(s), ()) for s in states)
+        return np.fromiter(slots, dtype=np.int64)
+
+    def sample(self, count, rng):
+        """Draw observed slots uniformly (with replacement)."""
+        return rng.integers(0, len(self.slots), count)
+
+
+class Planner:
+    """
+    Runs a budget of simulated Q-learning backups per real step.
+
+    Modes:
+        "sweeping": prioritized sweeping. Pairs are queued by the magnitude
+            of their TD error; the largest are backed up first and the
+            predecessors of every changed state are re-queued.
+        "dyna": Dyna-Q. Observed pairs are backed up uniformly at random.
+
+    Backups are applied batch_size at a time with RLAgent.update_q_values.
+    """
+
+    MODES = ("sweeping", "dyna")
+
+    def __init__(self, agent, mode=PLANNING_MODE, budget=PLANNING_BUDGET,
+                 batch_size=PLANNING_BATCH_SIZE, threshold=PLANNING_THRESHOLD, seed=None):
+        """
+        Args:
+            agent: RLAgent whose Q-table is planned on
+            mode: "sweeping" or "dyna"
+            budget: Backups per call to plan()
+            batch_size: Backups per batched update
+            threshold: Minimum |TD error| for a pair to be queued ("sweeping")
+            seed: Optional seed for "dyna" sampling
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown planning mode: {mode}")
+        if agent.approximate:
+            raise TypeError("Planning needs a tabular Q-table backend")
+        self.agent = agent
+        self.mode = mode
+        self.budget = budget
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.rng = np.random.default_rng(seed)
+        self.model = TabularModel(agent.num_states, len(ACTIONS))
+
+        # Max-heap of (-priority, slot) with lazy deletion: an entry is live
+        # only while its priority matches the pair's current priority
+        self.queue = []
+        self.priorities = np.zeros(self.model.capacity, dtype=np.float64)
+        self.backups = 0
+
+    def _td_errors(self, slots):
+        """Compute model TD errors of a batch of slots against the current Q-table."""
+        model = self.model
+        table = self.agent.table
+        next_max_q = np.where(model.dones[slots], 0.0,
+                              table.rows(model.next_states[slots]).max(axis=1))
+        current_q = table.rows(model.states[slots])[np.arange(len(slots)), model.actions[slots]]
+        return model.rewards[slots] + self.agent.gamma * next_max_q - current_q
+
+    def _push(self, slots):
+        """Queue slots whose |TD error| exceeds the threshold and their current priority."""
+        if len(slots) == 0:
+            return
+        priorities = np.abs(self._td_errors(slots))
+        raised = (priorities > self.threshold) & (priorities > self.priorities[slots])
+        for slot, priority in zip(slots[raised].tolist(), priorities[raised].tolist()):
+            self.priorities[slot] = priority
+            heapq.heappush(self.queue, (-priority, slot))
+
+    def _pop(self, count):
+        """Pop up to count distinct live slots with the highest priorities."""
+        slots = []
+        while self.queue and len(slots) < count:
+            priority, slot = heapq.heappop(self.queue)
+            if self.priorities[slot] == -priority:
+                self.priorities[slot] = 0.0
+                slots.append(slot)
+        return np.asarray(slots, dtype=np.int64)
+
+    def _backup(self, slots):
+        """Apply one batched Q-learning backup from the model."""
+        model = self.model
+        states = model.states[slots]
+        self.agent.update_q_values(states, model.actions[slots], model.rewards[slots],
+                                   model.next_states[slots], model.dones[slots])
+        self.backups += len(slots)
+        return states
+
+    def observe(self, state, action, reward, next_state, done):
+        """
+        Learn the model from a real transition.
+
+        Args:
+            state, action, reward, next_state, done: The transition, after
+                the agent's own update_q_value for it
+        """
+        slot = self.model.update(state, action, reward, next_state, done)
+        if len(self.priorities) < self.model.capacity:
+            priorities = np.zeros(self.model.capacity, dtype=np.float64)
+            priorities[:len(self.priorities)] = self.priorities
+            self.priorities = priorities
+        if self.mode == "sweeping":
+            self._push(np.array([slot], dtype=np.int64))
+
+    def plan(self, budget=None):
+        """
+        Run simulated backups.
+
+        Args:
+            budget: Maximum number of backups (self.budget by default)
+
+        Returns:
+            Number of backups performed
+        """
+        budget = self.budget if budget is None else budget
+        performed = 0
+        if self.mode == "dyna":
+            if len(self.model) == 0:
+                return 0
+            while performed < budget:
+                count = min(self.batch_size, budget - performed)
+                self._backup(self.model.sample(count, self.rng))
+                performed += count
+            return performed
+
+        while performed < budget and self.queue:
+            slots = self._pop(min(self.batch_size, budget - performed))
+            if len(slots) == 0:
+                break
+            states = self._backup(slots)
+            performed += len(slots)
+            self._push(self.model.predecessors_of(np.unique(states)))
+        return performed
+
+    def step(self, state, action, reward, next_state, done):
+        """Observe a real transition, then plan with the default budget."""
+        self.observe(state, action, reward, next_state, done)
+        return self.plan()
@@ -0,0 +1,107 @@
+"""
+Hot-path profiling for RL Space Adventure.
+
+Phases are timed with a start()/lap() pair that costs a single method call
+when profiling is disabled, so the hooks can stay in the game loop.
+"""
+
+import json
+import time
+from collections import deque
+import numpy as np
+from .config import *
+
+
+class Profiler:
+    """
+    Rolling per-phase timings with percentile summaries.
+
+    Usage:
+        t = profiler.start()
+        ...phase one...
+        t = profiler.lap("phase_one", t)
+        ...phase two...
+        profiler.lap("phase_two", t)
+    """
+
+    def __init__(self, enabled=False, window=PROFILE_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def start(self):
+        """Get a start timestamp (0.0 when disabled)."""
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, name, start):
+        """
+        Record the time since start under a phase name.
+
+        Args:
+            name: Phase name
+            start: Timestamp from start() or a previous lap()
+
+        Returns:
+            Current timestamp, to be passed to the next lap()
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.counts[name] = 0
+        samples.append(now - start)
+        self.counts[name] += 1
+        return now
+
+    def reset(self):
+        """Discard all recorded samples."""
+        self.samples.clear()
+        self.counts.clear()
+
+    def stats(self):
+        """
+        Summarize the rolling window of each phase.
+
+        Returns:
+            Dictionary mapping phase names to their total sample count and
+            mean/p50/p95/p99/max durations in milliseconds
+        """
+        summary = {}
+        for name, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples)) * 1000.0
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            summary[name] = {
+                "count": self.counts[name],
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(values.max()),
+            }
+        return summary
+
+    def dump(self, path=None):
+        """
+        Serialize the stats as JSON.
+
+        Args:
+            path: Optional file to write the JSON to
+
+        Returns:
+            JSON string
+        """
+        text = json.dumps(self.stats(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text + "\n")
+        return text
+
+    def summary_lines(self):
+        """Format the stats as short lines for an on-screen overlay."""
+        return [
+            f"{name}: {phase['p50_ms']:.3f}/{phase['p95_ms']:.3f}/{phase['p99_ms']:.3f} ms"
+            for name, phase in self.stats().items()
+        ]
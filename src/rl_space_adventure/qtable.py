@@ -0,0 +1,430 @@
+"""
+Q-table storage backends for the RL agent.
+
+All backends are keyed by flat state index (see RLAgent.get_state) and share
+the same interface, so RLAgent does not need to know how values are stored.
+The dense and sparse backends store one row per state; the tile coding
+backend approximates rows linearly from features shared between states.
+"""
+
+import numpy as np
+from .config import *
+
+
+class DenseQTable:
+    """Contiguous (num_states, num_actions) array covering every state."""
+
+    def __init__(self, num_states, num_actions, dtype=Q_TABLE_DTYPE):
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.values = np.zeros((num_states, num_actions), dtype=dtype)
+        self.visits = np.zeros(num_states, dtype=np.uint32)
+
+    @classmethod
+    def from_arrays(cls, values, visits):
+        """Wrap existing value and visit arrays (e.g. memory maps) without copying."""
+        table = cls.__new__(cls)
+        table.num_states, table.num_actions = values.shape
+        table.values = values
+        table.visits = visits
+        return table
+
+    @property
+    def nbytes(self):
+        """Memory used by the table in bytes."""
+        return self.values.nbytes + self.visits.nbytes
+
+    def row(self, state):
+        """Get the action values of a state (read only)."""
+        return self.values[state]
+
+    def writable_row(self, state):
+        """Get the action values of a state for in-place update and count a visit."""
+        self.visits[state] += 1
+        return self.values[state]
+
+    def rows(self, states):
+        """Get an (N, num_actions) array of action values for a batch of states."""
+        return self.values[states]
+
+    def add_at(self, states, actions, deltas):
+        """Scatter-add deltas to (state, action) pairs, accumulating duplicates."""
+        np.add.at(self.values, (states, actions), deltas.astype(self.values.dtype))
+        np.add.at(self.visits, states, 1)
+
+    def visit_counts(self):
+        """
+        Get visit statistics.
+
+        Returns:
+            Tuple of (states, counts) arrays for every visited state
+        """
+        states = np.flatnonzero(self.visits)
+        return states, self.visits[states]
+
+    def stats(self):
+        """Get a summary of table usage."""
+        visited = int(np.count_nonzero(self.visits))
+        return {
+            "backend": "dense",
+            "num_states": self.num_states,
+            "visited_states": visited,
+            "coverage": visited / self.num_states,
+            "nbytes": self.nbytes,
+        }
+
+
+class SparseQTable:
+    """
+    Open-addressing hash table of action values for visited states only.
+
+    Keys, values and visit counts live in preallocated arrays sized to fit
+    memory_limit. Collisions are resolved by linear probing. When the load
+    factor exceeds max_load, the evict_fraction least visited states are
+    dropped and the remaining visit counts are halved, so states that were
+    popular long ago can eventually be evicted as well.
+    """
+
+    EMPTY = -1
+    _HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, num_states, num_actions, dtype=Q_TABLE_DTYPE,
+                 memory_limit=SPARSE_Q_MEMORY_LIMIT, max_load=0.7, evict_fraction=0.25):
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.max_load = max_load
+        self.evict_fraction = evict_fraction
+
+        slot_bytes = num_actions * np.dtype(dtype).itemsize + 8 + 4
+        bits = max(4, int(memory_limit // slot_bytes).bit_length() - 1)
+        self.capacity = 1 << bits
+        self._shift = 64 - bits
+        self._mask = self.capacity - 1
+        self.max_size = max(1, int(self.capacity * max_load))
+
+        self.keys = np.full(self.capacity, self.EMPTY, dtype=np.int64)
+        self.values = np.zeros((self.capacity, num_actions), dtype=dtype)
+        self.visits = np.zeros(self.capacity, dtype=np.uint32)
+        self.size = 0
+        self.evictions = 0
+
+        self._zero_row = np.zeros(num_actions, dtype=dtype)
+        self._zero_row.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        """Memory used by the table in bytes."""
+        return self.keys.nbytes + self.values.nbytes + self.visits.nbytes
+
+    def _hash(self, state):
+        """Fibonacci hash of a single state index."""
+        return ((int(state) * self._HASH_MULTIPLIER) & self._MASK64) >> self._shift
+
+    def _hash_many(self, states):
+        """Fibonacci hash of an array of state indices."""
+        products = states.astype(np.uint64) * np.uint64(self._HASH_MULTIPLIER)
+        return (products >> np.uint64(self._shift)).astype(np.int64)
+
+    def _find(self, state):
+        """Get the slot of a state, or -1 - insertion slot if it is absent."""
+        keys = self.keys
+        slot = self._hash(state)
+        while True:
+            key = keys[slot]
+            if key == state:
+                return slot
+            if key == self.EMPTY:
+                return -1 - slot
+            slot = (slot + 1) & self._mask
+
+    def _find_many(self, states):
+        """Get the slots of an array of states, with -1 for absent states."""
+        slots = self._hash_many(states)
+        result = np.full(len(states), -1, dtype=np.int64)
+        pending = np.arange(len(states))
+        while len(pending):
+            keys = self.keys[slots[pending]]
+            found = keys == states[pending]
+            result[pending[found]] = slots[pending[found]]
+            pending = pending[~found & (keys != self.EMPTY)]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        return result
+
+    def _insert_many(self, states, values=None, visits=None):
+        """Insert distinct states known to be absent, probing in parallel."""
+        slots = self._hash_many(states)
+        pending = np.arange(len(states))
+        while len(pending):
+            free = self.keys[slots[pending]] == self.EMPTY
+            # Only the first claimant of each free slot takes it this round
+            _, first = np.unique(slots[pending[free]], return_index=True)
+            placed = pending[free][first]
+            self.keys[slots[placed]] = states[placed]
+            if values is not None:
+                self.values[slots[placed]] = values[placed]
+                self.visits[slots[placed]] = visits[placed]
+            remaining = np.ones(len(pending), dtype=bool)
+            remaining[np.flatnonzero(free)[first]] = False
+            pending = pending[remaining]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        self.size += len(states)
+
+    def evict(self, min_count=0):
+        """
+        Drop the least visited states and rebuild the table.
+
+        Args:
+            min_count: Minimum number of states to drop
+        """
+        occupied = np.flatnonzero(self.keys != self.EMPTY)
+        count = min(len(occupied), max(min_count, int(len(occupied) * self.evict_fraction)))
+        order = np.argsort(self.visits[occupied], kind="stable")
+        kept = occupied[order[count:]]
+
+        keys = self.keys[kept]
+        values = self.values[kept]
+        visits = self.visits[kept] // 2
+
+        self.keys.fill(self.EMPTY)
+        self.values.fill(0)
+        self.visits.fill(0)
+        self.size = 0
+        self.evictions += count
+        self._insert_many(keys, values, visits)
+
+    def row(self, state):
+        """Get the action values of a state (read only, zeros if unseen)."""
+        slot = self._find(state)
+        return self.values[slot] if slot >= 0 else self._zero_row
+
+    def writable_row(self, state):
+        """Get the action values of a state for in-place update and count a visit."""
+        slot = self._find(state)
+        if slot < 0:
+            if self.size >= self.max_size:
+                self.evict()
+                slot = self._find(state)
+            slot = -1 - slot
+            self.keys[slot] = state
+            self.size += 1
+        self.visits[slot] += 1
+        return self.values[slot]
+
+    def rows(self, states):
+        """Get an (N, num_actions) array of action values for a batch of states."""
+        states = np.asarray(states, dtype=np.int64)
+        slots = self._find_many(states)
+        result = np.zeros((len(states), self.num_actions), dtype=self.values.dtype)
+        found = slots >= 0
+        result[found] = self.values[slots[found]]
+        return result
+
+    def add_at(self, states, actions, deltas):
+        """Scatter-add deltas to (state, action) pairs, accumulating duplicates."""
+        states = np.asarray(states, dtype=np.int64)
+        unique_states = np.unique(states)
+        missing = unique_states[self._find_many(unique_states) < 0]
+        if len(missing):
+            if len(unique_states) > self.max_size:
+                raise ValueError("Batch touches more states than the sparse Q-table can hold")
+            if self.size + len(missing) > self.max_size:
+                self.evict(min_count=self.size + len(missing) - self.max_size)
+                missing = unique_states[self._find_many(unique_states) < 0]
+            self._insert_many(missing)
+
+        slots = self._find_many(states)
+        np.add.at(self.values, (slots, actions), deltas.astype(self.values.dtype))
+        np.add.at(self.visits, slots, 1)
+
+    def visit_counts(self):
+        """
+        Get visit statistics.
+
+        Returns:
+            Tuple of (states, counts) arrays for every stored state
+        """
+        occupied = np.flatnonzero(self.keys != self.EMPTY)
+        return self.keys[occupied], self.visits[occupied]
+
+    def stats(self):
+        """Get a summary of table usage."""
+        return {
+            "backend": "sparse",
+            "num_states": self.num_states,
+            "visited_states": self.size,
+            "coverage": self.size / self.num_states,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "evictions": self.evictions,
+            "nbytes": self.nbytes,
+        }
+
+
+class TileCodingQTable:
+    """
+    Linear action values over tile-coded features of the state components.
+
+    States are decoded into their components (see RLAgent.state_dims) and
+    each group of components in `groups` is covered by num_tilings grids of
+    `tiles` tiles per component, every tiling shifted by a different
+    fraction of a tile (asymmetrically, by 2i + 1 along component i). A
+    state activates one tile per tiling and group, and its action values are
+    the sums of the weights of its active tiles, so nearby states share
+    updates and memory depends on the tiling, not on the number of states.
+
+    Updates are semi-gradient: a delta for (state, action) is spread evenly
+    over the state's active tiles, so row(state)[action] moves by delta
+    (plus whatever other states sharing those tiles contribute).
+    """
+
+    approximate = True
+
+    def __init__(self, state_dims, num_actions, dtype=Q_TABLE_DTYPE,
+                 num_tilings=TILE_CODING_TILINGS, tiles=TILE_CODING_TILES,
+                 groups=TILE_CODING_GROUPS, cache_size=TILE_CODING_CACHE_SIZE):
+        self.state_dims = tuple(int(dim) for dim in state_dims)
+        self.num_states = int(np.prod(self.state_dims, dtype=np.int64))
+        self.num_actions = num_actions
+        self.num_tilings = num_tilings
+        self.tiles = tiles
+        self.groups = tuple(tuple(group) for group in groups)
+        self.cache_size = cache_size
+
+        # Tiles per component unit, and each tiling's offset in tile widths.
+        # The offsets can push the last tile one past `tiles`, hence the +1.
+        self._scale = tiles / np.asarray(self.state_dims, dtype=np.float64)
+        components = np.arange(len(self.state_dims))
+        self._offsets = (np.arange(num_tilings)[:, None] * (2 * components + 1)
+                         / num_tilings) % 1.0
+        side = tiles + 1
+
+        # Features are laid out group by group, then tiling by tiling
+        self._tile_strides = []
+        self._tiling_bases = []
+        base = 0
+        for group in self.groups:
+            size = side ** len(group)
+            self._tile_strides.append(side ** np.arange(len(group) - 1, -1, -1))
+            self._tiling_bases.append(base + np.arange(num_tilings) * size)
+            base += num_tilings * size
+        self.num_features = base
+        self.num_active = num_tilings * len(self.groups)
+
+        self.weights = np.zeros((self.num_features, num_actions), dtype=dtype)
+        self.visits = np.zeros(self.num_features, dtype=np.uint32)
+        self._cache = {}
+
+    @property
+    def nbytes(self):
+        """Memory used by the table in bytes."""
+        return self.weights.nbytes + self.visits.nbytes
+
+    def features(self, states):
+        """
+        Compute the active features of a batch of states.
+
+        Args:
+            states: (N,) array of flat state indices
+
+        Returns:
+            (N, num_active) array of feature indices
+        """
+        states = np.asarray(states, dtype=np.int64)
+        components = np.stack(np.unravel_index(states, self.state_dims), axis=-1)
+        # (N, tilings, components) tile coordinates; all values are
+        # non-negative, so truncation floors
+        coords = (components * self._scale)[:, None, :] + self._offsets
+        coords = coords.astype(np.int64)
+        return np.concatenate([coords[:, :, group] @ strides + bases
+                               for group, strides, bases in zip(
+                                   self.groups, self._tile_strides, self._tiling_bases)],
+                              axis=1)
+
+    def _state_features(self, state):
+        """Get the active features of a single state, memoized."""
+        features = self._cache.get(state)
+        if features is None:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            features = self._cache[state] = self.features([state])[0]
+        return features
+
+    def row(self, state):
+        """Get the action values of a state."""
+        return self.weights[self._state_features(state)].sum(axis=0)
+
+    def writable_row(self, state):
+        """Rows are computed from shared weights, so there is none to write in place."""
+        raise TypeError("The tile coding backend has no writable rows; use add or add_at")
+
+    def rows(self, states):
+        """Get an (N, num_actions) array of action values for a batch of states."""
+        return self.weights[self.features(states)].sum(axis=1)
+
+    def add(self, state, action, delta):
+        """Move the value of a single (state, action) pair by delta and count a visit."""
+        features = self._state_features(state)
+        self.weights[features, action] += delta / self.num_active
+        self.visits[features] += 1
+
+    def add_at(self, states, actions, deltas):
+        """Scatter-add deltas to (state, action) pairs, accumulating duplicates."""
+        features = self.features(states)
+        steps = np.asarray(deltas, dtype=np.float64) / self.num_active
+        np.add.at(self.weights, (features, np.asarray(actions)[:, None]),
+                  np.broadcast_to(steps[:, None], features.shape).astype(self.weights.dtype))
+        np.add.at(self.visits, features, 1)
+
+    def visit_counts(self):
+        """
+        Get visit statistics.
+
+        Returns:
+            Tuple of (features, counts) arrays for every updated feature
+            (tiles, not states)
+        """
+        features = np.flatnonzero(self.visits)
+        return features, self.visits[features]
+
+    def stats(self):
+        """Get a summary of table usage."""
+        visited = int(np.count_nonzero(self.visits))
+        return {
+            "backend": "tiles",
+            "num_states": self.num_states,
+            "num_features": self.num_features,
+            "visited_features": visited,
+            "coverage": visited / self.num_features,
+            "nbytes": self.nbytes,
+        }
+
+
+Q_TABLE_BACKENDS = {
+    "dense": DenseQTable,
+    "sparse": SparseQTable,
+    "tiles": TileCodingQTable,
+}
+
+
+def make_q_table(backend, num_states, num_actions, dtype=Q_TABLE_DTYPE, state_dims=None):
+    """
+    Create a Q-table backend by name.
+
+    Args:
+        backend: Backend name ("dense", "sparse" or "tiles") or a table instance
+        num_states: Number of discrete states
+        num_actions: Number of actions
+        dtype: Value dtype
+        state_dims: Sizes of the state components (needed by "tiles")
+
+    Returns:
+        Q-table backend instance
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend not in Q_TABLE_BACKENDS:
+        raise ValueError(f"Unknown Q-table backend: {backend}")
+    if backend == "tiles":
+        return TileCodingQTable(state_dims, num_actions, dtype)
+    return Q_TABLE_BACKENDS[backend](num_states, num_actions, dtype)
@@ -0,0 +1,428 @@
+"""
+Trajectory recording and replay for RL Space Adventure.
+
+A trajectory log is an append-only file of fixed-size step records behind
+the checkpoint header, plus a "<log>.idx" file of fixed-size episode
+records. Both are plain arrays on disk, so they can be opened with np.memmap
+and any episode or step can be reached in O(1) without re-simulating.
+
+Each episode is stored as one record of the state after reset followed by
+one record per step of the state after that step.
+"""
+
+import argparse
+import os
+import struct
+import numpy as np
+from .config import *
+from .checkpoint import HEADER_SIZE, read_header, write_header
+
+TRAJECTORY_MAGIC = b"RLSATR01"
+TRAJECTORY_VERSION = 1
+NO_ACTION = 255  # Action of the record written at the start of an episode
+TERMINATIONS = (None, "enemy", "fuel")
+
+INDEX_DTYPE = np.dtype([
+    ("seed", "<i8"),      # Episode seed, or -1 if the episode was not reseeded
+    ("start", "<i8"),     # Record number of the episode's reset record
+    ("length", "<u4"),    # Number of steps (the episode has length + 1 records)
+    ("termination", "u1"),  # Index into TERMINATIONS
+])
+
+
+def record_dtype(num_coins, num_enemies):
+    """
+    Get the step record layout for a board with the given entity counts.
+
+    Positions are stored one byte per coordinate, so the grid must be at
+    most 256 cells wide and high.
+    """
+    return np.dtype([
+        ("action", "u1"),
+        ("reward", "<f4"),
+        ("fuel", "<f4"),
+        ("score", "<i4"),
+        ("player", "u1", (2,)),
+        ("coins", "u1", (num_coins, 2)),
+        ("enemies", "u1", (num_enemies, 2)),
+    ])
+
+
+class TrajectoryRecorder:
+    """
+    Streams episodes of a SpaceAdventureEnv to a trajectory log.
+
+    Steps are packed into a preallocated buffer and appended to the log in
+    blocks, and entity positions are copied from the environment's
+    packed_positions bytes, so recording adds little to a step. Index
+    entries of finished episodes are buffered too and written right after
+    the records they point to.
+
+    Usage:
+        recorder.begin_episode(env, seed)
+        ...env.step(action)...
+        recorder.record_step(env, action, reward)
+        recorder.end_episode(info["termination"])
+    """
+
+    def __init__(self, path, num_coins=MAX_COINS, num_enemies=MAX_ENEMIES,
+                 buffer_steps=TRAJECTORY_BUFFER_STEPS, grid=(GRID_WIDTH, GRID_HEIGHT)):
+        """
+        Args:
+            path: Log file path; an existing log with the same layout is
+                appended to
+            num_coins, num_enemies: Entity counts of the recorded environment
+            buffer_steps: Records buffered in memory between writes
+            grid: (width, height) of the recorded environment's grid
+        """
+        if max(grid) > 256:
+            raise ValueError("Trajectory logs store coordinates as single bytes")
+        self.path = path
+        self.dtype = record_dtype(num_coins, num_enemies)
+        self.positions_size = 2 * (1 + num_coins + num_enemies)
+        self.record_size = self.dtype.itemsize
+        self._pack_into = struct.Struct("<Bffi").pack_into
+        self._index_struct = struct.Struct("<qqIB")  # INDEX_DTYPE
+
+        header = {
+            "version": TRAJECTORY_VERSION,
+            "grid": list(grid),
+            "num_coins": num_coins,
+            "num_enemies": num_enemies,
+            "record_size": self.dtype.itemsize,
+        }
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            if read_header(path, TRAJECTORY_MAGIC) != header:
+                raise ValueError(f"{path} was recorded with a different layout")
+            self.file = open(path, "r+b")
+            # Drop records of an episode that was never finished
+            self.num_records = self._indexed_records()
+            self.file.truncate(HEADER_SIZE + self.num_records * self.dtype.itemsize)
+            self.file.seek(0, os.SEEK_END)
+            self.index_file = open(path + ".idx", "ab")
+        else:
+            self.file = open(path, "wb")
+            write_header(self.file, header, TRAJECTORY_MAGIC)
+            self.num_records = 0
+            # Entries left over from an earlier log would point into this one
+            self.index_file = open(path + ".idx", "wb")
+
+        self.buffer_size = buffer_steps * self.record_size
+        self.buffer = bytearray(self.buffer_size)
+        self.offset = 0  # Bytes of buffered records
+        self.index_buffer = bytearray()
+        self.episode_start = None
+        self.episode_seed = -1
+
+    def _indexed_records(self):
+        """Count the records covered by the existing episode index."""
+        index_path = self.path + ".idx"
+        size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+        count = size // INDEX_DTYPE.itemsize
+        if count == 0:
+            return 0
+        with open(index_path, "r+b") as file:
+            file.truncate(count * INDEX_DTYPE.itemsize)
+        last = np.fromfile(index_path, dtype=INDEX_DTYPE, offset=(count - 1) * INDEX_DTYPE.itemsize)
+        return int(last["start"][0] + last["length"][0] + 1)
+
+    def _append(self, env, action, reward):
+        """Pack one record into the buffer, writing the buffer out when full."""
+        offset = self.offset
+        end = offset + self.record_size
+        self._pack_into(self.buffer, offset, action, reward, env.player.fuel, env.score)
+        # Slice assignment would resize the buffer on a size mismatch, so
+        # entity counts are checked once per episode in begin_episode
+        self.buffer[offset + 13:end] = env.packed_positions
+        self.offset = end
+        self.num_records += 1
+        if end == self.buffer_size:
+            self.flush()
+
+    def begin_episode(self, env, seed=-1):
+        """
+        Start recording an episode from the environment's reset state.
+
+        Args:
+            env: SpaceAdventureEnv that was just reset
+            seed: Seed the episode was reset with, or -1
+        """
+        if len(env.packed_positions) != self.positions_size:
+            raise ValueError("Environment entity counts do not match the trajectory log")
+        self.episode_start = self.num_records
+        self.episode_seed = -1 if seed is None else seed
+        self._append(env, NO_ACTION, 0.0)
+
+    def record_step(self, env, action, reward):
+        """Record the environment state after a step."""
+        self._append(env, action, reward)
+
+    def end_episode(self, termination=None):
+        """
+        Finish the current episode and add it to the index.
+
+        Args:
+            termination: Termination cause ("enemy", "fuel" or None)
+        """
+        if self.episode_start is None:
+            return
+        self.index_buffer += self._index_struct.pack(
+            self.episode_seed, self.episode_start, self.num_records - self.episode_start - 1,
+            TERMINATIONS.index(termination))
+        self.episode_start = None
+
+    def flush(self):
+        """Write buffered records, then the index entries pointing at them, to disk."""
+        if self.offset:
+            self.file.write(memoryview(self.buffer)[:self.offset])
+            self.offset = 0
+        self.file.flush()
+        if self.index_buffer:
+            self.index_file.write(self.index_buffer)
+            self.index_buffer.clear()
+        self.index_file.flush()
+
+    def close(self):
+        """Flush and close the log (an unfinished episode is not indexed)."""
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TrajectoryLog:
+    """
+    Read-only, memory-mapped view of a trajectory log.
+
+    Attributes:
+        records: Structured array of all step records (see record_dtype)
+        index: Structured array of episodes (see INDEX_DTYPE)
+        config: GameConfig with the recorded grid size and entity counts
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_header(path, TRAJECTORY_MAGIC)
+        if self.header["version"] != TRAJECTORY_VERSION:
+            raise ValueError(f"Unsupported trajectory log version {self.header['version']}")
+        self.dtype = record_dtype(self.header["num_coins"], self.header["num_enemies"])
+        self.records = self._map(path, self.dtype, HEADER_SIZE)
+        self.index = self._map(path + ".idx", INDEX_DTYPE, 0)
+        width, height = self.header["grid"]
+        self.config = GameConfig(grid_width=width, grid_height=height,
+                                 max_coins=self.header["num_coins"],
+                                 max_enemies=self.header["num_enemies"])
+
+    @staticmethod
+    def _map(path, dtype, offset):
+        """Memory-map the whole records of a file (np.memmap rejects empty maps)."""
+        count = (os.path.getsize(path) - offset) // dtype.itemsize if os.path.exists(path) else 0
+        if count <= 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+    def __len__(self):
+        return len(self.index)
+
+    def episode(self, episode):
+        """Get the records of an episode (its reset record, then one per step)."""
+        entry = self.index[episode]
+        start = int(entry["start"])
+        return self.records[start:start + int(entry["length"]) + 1]
+
+    def episode_info(self, episode):
+        """Get an episode's seed, length and termination cause."""
+        entry = self.index[episode]
+        return {
+            "seed": int(entry["seed"]),
+            "length": int(entry["length"]),
+            "termination": TERMINATIONS[int(entry["termination"])],
+        }
+
+    def frame(self, episode, step):
+        """
+        Get the state at a step of an episode (step 0 is the reset state).
+
+        Returns:
+            Tuple of (player_pos, coins, enemies, score, fuel, action, reward)
+            with positions as lists of (x, y) tuples
+        """
+        entry = self.index[episode]
+        if not 0 <= step <= int(entry["length"]):
+            raise IndexError(f"Episode {episode} has no step {step}")
+        record = self.records[int(entry["start"]) + step]
+        return (
+            tuple(record["player"].tolist()),
+            [tuple(pos) for pos in record["coins"].tolist()],
+            [tuple(pos) for pos in record["enemies"].tolist()],
+            int(record["score"]),
+            float(record["fuel"]),
+            int(record["action"]),
+            float(record["reward"]),
+        )
+
+
+class TrajectoryPlayer:
+    """
+    Drives Renderer.render_frame from a trajectory log.
+
+    Keys: Left/Right step back/forward, Up/Down previous/next episode,
+    Home/End first/last step, Space play/pause.
+    """
+
+    def __init__(self, log, renderer):
+        self.log = log
+        self.renderer = renderer
+        self.episode = 0
+        self.step = 0
+        self.playing = False
+
+    def seek(self, episode, step=0):
+        """Jump to a step of an episode, clamped to the log."""
+        self.episode = max(0, min(len(self.log) - 1, episode))
+        length = self.log.episode_info(self.episode)["length"]
+        self.step = max(0, min(length, step))
+
+    def advance(self):
+        """Move to the next step, continuing into the next episode."""
+        if self.step < self.log.episode_info(self.episode)["length"]:
+            self.step += 1
+        elif self.episode < len(self.log) - 1:
+            self.seek(self.episode + 1)
+        else:
+            self.playing = False
+
+    def render(self):
+        """Render the current step."""
+        player_pos, coins, enemies, score, fuel, _, _ = self.log.frame(self.episode, self.step)
+        self.renderer.render_frame(player_pos, coins, enemies, score, False, fuel, self.episode)
+
+    def handle_key(self, key):
+        """Apply a navigation key (pygame key code)."""
+        import pygame
+        if key == pygame.K_RIGHT:
+            self.advance()
+        elif key == pygame.K_LEFT:
+            self.seek(self.episode, self.step - 1)
+        elif key == pygame.K_UP:
+            self.seek(self.episode - 1)
+        elif key == pygame.K_DOWN:
+            self.seek(self.episode + 1)
+        elif key == pygame.K_HOME:
+            self.seek(self.episode, 0)
+        elif key == pygame.K_END:
+            self.seek(self.episode, self.log.episode_info(self.episode)["length"])
+        elif key == pygame.K_SPACE:
+            self.playing = not self.playing
+
+
+def export(path, directory, episodes=None, format="png", hud=True):
+    """
+    Render episodes of a trajectory log offscreen and save their frames.
+
+    Frames are written by a FrameCapture, one file prefix per episode.
+
+    Args:
+        path: Trajectory log path
+        directory: Output directory
+        episodes: Episode numbers to export (all by default)
+        format: "png" (image sequences) or "npz" (compressed archives)
+        hud: Whether to draw the HUD
+
+    Returns:
+        Number of frames written
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from .capture import FrameCapture
+    from .rendering import OffscreenRenderer, load_font
+
+    log = TrajectoryLog(path)
+    pygame.display.init()
+    pygame.font.init()
+    frames = 0
+    try:
+        config = log.config
+        renderer = OffscreenRenderer(load_font(FONT_NAME, FONT_SIZE) if hud else None, hud, config)
+        for episode in range(len(log)) if episodes is None else episodes:
+            with FrameCapture(directory, (config.height, config.width, 3), format,
+                              prefix=f"episode_{episode:06d}") as capture:
+                for step in range(log.episode_info(episode)["length"] + 1):
+                    player_pos, coins, enemies, score, fuel, _, _ = log.frame(episode, step)
+                    renderer.render_frame(player_pos, coins, enemies, score, False, fuel, episode)
+                    capture.add(renderer.pixels())
+                frames += capture.frames
+    finally:
+        pygame.quit()
+    return frames
+
+
+def play(path, episode=0, step=0, fps=FPS):
+    """
+    Open a window replaying a trajectory log.
+
+    Args:
+        path: Trajectory log path
+        episode, step: Position to start at
+        fps: Playback rate
+    """
+    import pygame
+    from .rendering import Renderer, RetainedRenderer, load_font
+
+    log = TrajectoryLog(path)
+    if len(log) == 0:
+        raise ValueError(f"{path} holds no finished episodes")
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((log.config.width, log.config.height))
+    pygame.display.set_caption(f"RL Space Adventure replay: {os.path.basename(path)}")
+    clock = pygame.time.Clock()
+    renderer_class = RetainedRenderer if RETAINED_RENDERING else Renderer
+    renderer = renderer_class(screen, load_font(FONT_NAME, FONT_SIZE), log.config)
+    player = TrajectoryPlayer(log, renderer)
+    player.seek(episode, step)
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                player.handle_key(event.key)
+        if player.playing:
+            player.advance()
+        player.render()
+        clock.tick(fps)
+    pygame.quit()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="rl-space-adventure replay",
+                                     description="Replay a recorded trajectory log.")
+    parser.add_argument("path", help="Trajectory log file")
+    parser.add_argument("--episode", type=int, default=0, help="Episode to start at")
+    parser.add_argument("--step", type=int, default=0, help="Step to start at")
+    parser.add_argument("--fps", type=int, default=FPS, help="Playback rate")
+    parser.add_argument("--export", metavar="DIRECTORY",
+                        help="Save the episodes' frames here instead of opening a window")
+    parser.add_argument("--episodes", type=int, nargs="+", help="Episodes to export (default: all)")
+    parser.add_argument("--format", choices=("png", "npz"), default="png",
+                        help="Exported frames as images or compressed archives")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Replay a trajectory log from the command line and return the exit status."""
+    args = parse_args(argv)
+    if args.export:
+        export(args.path, args.export, args.episodes, args.format)
+    else:
+        play(args.path, args.episode, args.step, args.fps)
+    return 0
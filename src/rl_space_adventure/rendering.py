@@ -2,30 +2,119 @@
 Rendering and display functions for RL Space Adventure.
 """
 
+import functools
+import json
+import os
 import pygame
 import math
 from .config import *
+from .profiling import Profiler
+
+# Resolved system font paths, kept across runs so startup skips font discovery
+FONT_CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "rl_space_adventure", "fonts.json")
+
+
+def _read_font_cache():
+    """Load the name -> path font cache, or an empty one if unavailable."""
+    try:
+        with open(FONT_CACHE_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_font_cache(cache):
+    """Store the font cache; failures only cost a lookup next run."""
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _font_path(name):
+    """
+    Resolve a system font name to a file path, caching the lookup.
+
+    pygame.font.SysFont scans every installed font the first time it is
+    called in a process. The resolved path is cached on disk instead, so
+    only the first run pays for the scan. Fonts that are not found are not
+    cached on disk, so installing one later takes effect on the next run.
+
+    Args:
+        name: System font name
+
+    Returns:
+        Path to the font file, or None if the name is not installed
+    """
+    cache = _read_font_cache()
+    path = cache.get(name)
+    if not path or not os.path.exists(path):
+        path = pygame.font.match_font(name)
+        if path:
+            cache[name] = path
+        else:
+            cache.pop(name, None)  # Also drops misses cached by older versions
+        _write_font_cache(cache)
+    return path
+
+
+def load_font(name=FONT_NAME, size=FONT_SIZE):
+    """
+    Load a system font, caching the path lookup.
+
+    Only the path is memoized: a Font object is freed by pygame.quit(), so a
+    new one is built on each call.
+
+    Args:
+        name: System font name
+        size: Font size in points
+
+    Returns:
+        pygame.font.Font (pygame's default font if the name is not installed)
+    """
+    return pygame.font.Font(_font_path(name), size)
 
 
 class Renderer:
     """Handles all rendering operations for the game."""
 
-    def __init__(self, screen, font):
+    def __init__(self, screen, font, config=DEFAULT_CONFIG):
+        """
+        Args:
+            screen: Surface to draw on (config.width x config.height)
+            font: HUD font
+            config: GameConfig with the board and cell size
+        """
         self.screen = screen
         self.font = font
+        self.config = config
+        self.cell_size = config.cell_size
         self.button_rect = pygame.Rect(10, 160, 150, 40)
-        self.button_text = font.render("Toggle Mode", True, WHITE)
+        self.button_text = font.render("Toggle Mode", True, WHITE) if font is not None else None
+        self.profiler = Profiler()
+        self.overlay_panel = None
 
     def draw_sprite(self, color, pos, shape, size):
         """Draw a game sprite at the specified position."""
-        x, y = pos[0] * GRID_SIZE + GRID_SIZE // 2, pos[1] * GRID_SIZE + GRID_SIZE // 2
+        cell = self.cell_size
+        x, y = pos[0] * cell + cell // 2, pos[1] * cell + cell // 2
+        self._draw_shape(self.screen, color, (x, y), shape, size)
+
+    def _draw_shape(self, surface, color, center, shape, size):
+        """Draw a sprite shape centered on a point of a surface."""
+        x, y = center
 
         if shape == "spaceship":
             # Draw spaceship as triangle with circle
-            pygame.draw.polygon(self.screen, color, [
+            pygame.draw.polygon(surface, color, [
                 (x, y - size), (x - size, y + size), (x + size, y + size)
             ])
-            pygame.draw.circle(self.screen, WHITE, (x, y - size // 2), size // 4)
+            pygame.draw.circle(surface, WHITE, (x, y - size // 2), size // 4)
         elif shape == "star":
             # Draw star as 8-pointed polygon
             points = []
@@ -33,17 +122,21 @@ class Renderer:
                 angle = i * math.pi / 4
                 r = size if i % 2 == 0 else size // 2
                 points.append((x + r * math.cos(angle), y + r * math.sin(angle)))
-            pygame.draw.polygon(self.screen, color, points)
+            pygame.draw.polygon(surface, color, points)
         elif shape == "asteroid":
             # Draw asteroid as circle with crater
-            pygame.draw.circle(self.screen, color, (x, y), size)
-            pygame.draw.circle(self.screen, BLACK, (x - size // 4, y - size // 4), size // 4)
+            pygame.draw.circle(surface, color, (x, y), size)
+            pygame.draw.circle(surface, BLACK, (x - size // 4, y - size // 4), size // 4)
 
     def draw_background(self):
         """Draw the space background with gradient."""
-        for y in range(HEIGHT):
+        self._draw_gradient(self.screen)
+
+    def _draw_gradient(self, surface):
+        """Draw the background gradient onto a surface."""
+        for y in range(self.config.height):
             color = (0, 0, max(50, 255 - y // 2))
-            pygame.draw.line(self.screen, color, (0, y), (WIDTH, y))
+            pygame.draw.line(surface, color, (0, y), (self.config.width, y))
 
     def draw_hud(self, score, manual_mode, fuel, episode_count):
         """Draw the heads-up display with game information."""
@@ -73,20 +166,236 @@ class Renderer:
     def draw_game_objects(self, player_pos, coins, enemies):
         """Draw all game objects."""
         # Draw player
-        self.draw_sprite(BLUE, player_pos, "spaceship", GRID_SIZE // 2)
+        self.draw_sprite(BLUE, player_pos, "spaceship", self.cell_size // 2)
 
         # Draw coins
         for coin in coins:
-            self.draw_sprite(YELLOW, coin, "star", GRID_SIZE // 3)
+            self.draw_sprite(YELLOW, coin, "star", self.cell_size // 3)
 
         # Draw enemies
         for enemy in enemies:
-            self.draw_sprite(RED, enemy, "asteroid", GRID_SIZE // 2)
+            self.draw_sprite(RED, enemy, "asteroid", self.cell_size // 2)
+
+    def perf_overlay_rect(self, lines):
+        """Get the screen area covered by the performance overlay."""
+        height = 8 + PERF_OVERLAY_LINE_HEIGHT * len(lines)
+        return pygame.Rect(self.config.width - PERF_OVERLAY_WIDTH - 10, 10,
+                           PERF_OVERLAY_WIDTH, height)
+
+    def _overlay_panel(self, size):
+        """Get a translucent panel surface of the given size, reusing the last one."""
+        if self.overlay_panel is None or self.overlay_panel.get_size() != size:
+            self.overlay_panel = pygame.Surface(size, pygame.SRCALPHA)
+            self.overlay_panel.fill((0, 0, 0, 160))
+        return self.overlay_panel
 
-    def render_frame(self, player_pos, coins, enemies, score, manual_mode, fuel, episode_count):
-        """Render a complete game frame."""
+    def draw_perf_overlay(self, lines):
+        """Draw profiling summary lines in a translucent box."""
+        rect = self.perf_overlay_rect(lines)
+        self.screen.blit(self._overlay_panel(rect.size), rect)
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, WHITE)
+            self.screen.blit(text, (rect.x + 4, rect.y + 4 + i * PERF_OVERLAY_LINE_HEIGHT))
+        return rect
+
+    def render_frame(self, player_pos, coins, enemies, score, manual_mode, fuel, episode_count,
+                     perf_lines=None):
+        """Render a complete game frame, with an optional performance overlay."""
+        profiler = self.profiler
+        t = profiler.start()
         self.draw_background()
+        t = profiler.lap("render.background", t)
         self.draw_game_objects(player_pos, coins, enemies)
+        t = profiler.lap("render.objects", t)
         self.draw_hud(score, manual_mode, fuel, episode_count)
         self.draw_button()
-        pygame.display.flip()
+        if perf_lines:
+            self.draw_perf_overlay(perf_lines)
+        t = profiler.lap("render.hud", t)
+        self.present()
+        profiler.lap("render.present", t)
+
+    def present(self, rects=None):
+        """Show the drawn frame: the given rectangles, or the whole screen."""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+class RetainedRenderer(Renderer):
+    """
+    Renderer that reuses pre-baked surfaces and only updates dirty areas.
+
+    The background gradient and sprites are drawn once into cached surfaces,
+    HUD text surfaces are cached by value, and each frame restores the
+    background under the previous frame's rectangles, blits the new frame
+    and passes only the touched rectangles to pygame.display.update.
+    """
+
+    TEXT_CACHE_SIZE = 256
+
+    def __init__(self, screen, font, config=DEFAULT_CONFIG):
+        super().__init__(screen, font, config)
+        cell = self.cell_size
+        self.background = self._bake_background()
+        self.sprites = {
+            "spaceship": self._bake_sprite(BLUE, "spaceship", cell // 2),
+            "star": self._bake_sprite(YELLOW, "star", cell // 3),
+            "asteroid": self._bake_sprite(RED, "asteroid", cell // 2),
+        }
+        self.text_cache = {}
+        self.dirty_rects = []
+        self.full_redraw = True
+
+    @staticmethod
+    def _convert(surface, alpha):
+        """Convert a surface to the display format when a display exists."""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _bake_background(self):
+        """Pre-render the background gradient."""
+        surface = pygame.Surface((self.config.width, self.config.height))
+        self._draw_gradient(surface)
+        return self._convert(surface, alpha=False)
+
+    def _bake_sprite(self, color, shape, size):
+        """Pre-render a sprite centered on a transparent surface."""
+        cell = self.cell_size
+        surface = pygame.Surface((2 * cell, 2 * cell), pygame.SRCALPHA)
+        self._draw_shape(surface, color, (cell, cell), shape, size)
+        return self._convert(surface, alpha=True)
+
+    def render_text(self, text):
+        """Render a HUD string, reusing the surface if it was rendered before."""
+        surface = self.text_cache.get(text)
+        if surface is None:
+            if len(self.text_cache) >= self.TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = self.text_cache[text] = self.font.render(text, True, WHITE)
+        return surface
+
+    def blit_sprite(self, shape, pos):
+        """Blit a pre-baked sprite centered on a grid cell."""
+        cell = self.cell_size
+        x = pos[0] * cell + cell // 2 - cell
+        y = pos[1] * cell + cell // 2 - cell
+        return self.screen.blit(self.sprites[shape], (x, y))
+
+    def draw_game_objects(self, player_pos, coins, enemies):
+        """Draw all game objects and return the touched rectangles."""
+        rects = [self.blit_sprite("spaceship", player_pos)]
+        for coin in coins:
+            rects.append(self.blit_sprite("star", coin))
+        for enemy in enemies:
+            rects.append(self.blit_sprite("asteroid", enemy))
+        return rects
+
+    def draw_hud(self, score, manual_mode, fuel, episode_count):
+        """Draw the heads-up display and return the touched rectangles."""
+        rects = [
+            self.screen.blit(self.render_text(f"Score: {score}"), (10, 10)),
+            self.screen.blit(self.render_text(f"Mode: {'Manual' if manual_mode else 'RL'}"), (10, 40)),
+            self.screen.blit(self.render_text(f"Fuel: {int(fuel)}%"), (10, 70)),
+            self.screen.blit(self.render_text(f"Episode: {episode_count}"), (10, 100)),
+        ]
+
+        # Fuel bar
+        pygame.draw.rect(self.screen, GREEN, (10, 130, int(fuel * 1.8), 20))
+        rects.append(pygame.draw.rect(self.screen, WHITE, (10, 130, 180, 20), 2))
+        return rects
+
+    def draw_button(self):
+        """Draw the mode toggle button and return the touched rectangle."""
+        super().draw_button()
+        return self.button_rect.copy()
+
+    def draw_perf_overlay(self, lines):
+        """Draw profiling summary lines in a translucent box."""
+        rect = self.perf_overlay_rect(lines)
+        self.screen.blit(self.background, rect, rect)
+        self.screen.blit(self._overlay_panel(rect.size), rect)
+        for i, line in enumerate(lines):
+            text = self.render_text(line)
+            self.screen.blit(text, (rect.x + 4, rect.y + 4 + i * PERF_OVERLAY_LINE_HEIGHT))
+        return rect
+
+    def render_frame(self, player_pos, coins, enemies, score, manual_mode, fuel, episode_count,
+                     perf_lines=None):
+        """Render a frame, updating only the areas that changed on screen."""
+        profiler = self.profiler
+        t = profiler.start()
+        previous_rects = self.dirty_rects
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in previous_rects:
+                self.screen.blit(self.background, rect, rect)
+        t = profiler.lap("render.background", t)
+
+        rects = self.draw_game_objects(player_pos, coins, enemies)
+        t = profiler.lap("render.objects", t)
+        rects.extend(self.draw_hud(score, manual_mode, fuel, episode_count))
+        rects.append(self.draw_button())
+        if perf_lines:
+            rects.append(self.draw_perf_overlay(perf_lines))
+        t = profiler.lap("render.hud", t)
+        self.dirty_rects = rects
+
+        if self.full_redraw:
+            self.present()
+            self.full_redraw = False
+        else:
+            self.present(previous_rects + rects)
+        profiler.lap("render.present", t)
+
+
+class OffscreenRenderer(RetainedRenderer):
+    """
+    Renderer that draws into its own surface instead of the display.
+
+    Frames are read back without copies through pixels(), a NumPy view of
+    the surface. No display is needed, so it also runs headless (e.g. under
+    SDL's dummy video driver), and with hud=False only the background and
+    game objects are drawn, for pixel observations.
+    """
+
+    def __init__(self, font=None, hud=True, config=DEFAULT_CONFIG):
+        """
+        Args:
+            font: Font for the HUD (required when hud is True)
+            hud: Whether to draw the HUD and mode button
+            config: GameConfig with the board and cell size
+        """
+        if hud and font is None:
+            raise ValueError("Drawing the HUD needs a font")
+        super().__init__(pygame.Surface((config.width, config.height), depth=32), font, config)
+        self.hud = hud
+
+    def draw_hud(self, score, manual_mode, fuel, episode_count):
+        """Draw the heads-up display, if enabled, and return the touched rectangles."""
+        return super().draw_hud(score, manual_mode, fuel, episode_count) if self.hud else []
+
+    def draw_button(self):
+        """Draw the mode toggle button, if enabled, and return the touched rectangle."""
+        if not self.hud:
+            return pygame.Rect(0, 0, 0, 0)
+        # The mouse is not over an offscreen frame
+        pygame.draw.rect(self.screen, GRAY, self.button_rect)
+        pygame.draw.rect(self.screen, WHITE, self.button_rect, 2)
+        self.screen.blit(self.button_text, self.button_text.get_rect(center=self.button_rect.center))
+        return self.button_rect.copy()
+
+    def present(self, rects=None):
+        """Offscreen frames are read with pixels() instead of being shown."""
+
+    def pixels(self):
+        """
+        Get the last frame as a (height, width, 3) uint8 view of the surface.
+
+        The view shares memory with the surface and keeps it locked, so it
+        must be released (or copied) before the next render_frame call.
+        """
+        return pygame.surfarray.pixels3d(self.screen).transpose(1, 0, 2)
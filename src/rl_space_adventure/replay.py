@@ -0,0 +1,259 @@
+"""
+Experience replay for the RL agent.
+
+Transitions are stored in preallocated NumPy arrays used as a ring buffer,
+so recording a step allocates no Python objects and minibatches come out
+as arrays ready for RLAgent.update_q_values.
+"""
+
+import numpy as np
+from .config import *
+
+
+class SumTree:
+    """
+    Tree of priority sums for proportional sampling in O(log n).
+
+    Each node sums `branching` children, so a search or an update visits
+    one small block per level and every level is a single vectorized NumPy
+    operation (four levels for 100k priorities). levels[0] holds the
+    priorities themselves, each later level the sums of the previous one's
+    blocks, and the last level the total. Parents are recomputed from
+    their children rather than adjusted by differences, so rounding errors
+    do not accumulate.
+    """
+
+    def __init__(self, capacity, branching=32):
+        self.branching = branching
+        self.levels = []
+        size = capacity
+        while True:
+            padded = -(-size // branching) * branching
+            self.levels.append(np.zeros(padded, dtype=np.float64))
+            size = padded // branching
+            if size == 1:
+                break
+        self.levels.append(np.zeros(1, dtype=np.float64))
+
+    @property
+    def values(self):
+        """Leaf priorities (a writable view; call update or rebuild after writing)."""
+        return self.levels[0]
+
+    @property
+    def total(self):
+        """Sum of every priority."""
+        return self.levels[-1][0]
+
+    @property
+    def nbytes(self):
+        """Memory used by the tree in bytes."""
+        return sum(level.nbytes for level in self.levels)
+
+    def update(self, indices):
+        """Recompute the ancestors of the given leaves."""
+        nodes = np.asarray(indices, dtype=np.int64)
+        branching = self.branching
+        for child, parent in zip(self.levels, self.levels[1:]):
+            nodes = nodes // branching
+            parent[nodes] = child.reshape(-1, branching)[nodes].sum(axis=1)
+
+    def rebuild(self):
+        """Recompute every internal node, level by level."""
+        for child, parent in zip(self.levels, self.levels[1:]):
+            sums = child.reshape(-1, self.branching).sum(axis=1)
+            parent[:len(sums)] = sums
+
+    def fill(self, value):
+        """Set every priority to value."""
+        self.levels[0].fill(value)
+        self.rebuild()
+
+    def find(self, values):
+        """
+        Find the leaves whose cumulative priority ranges contain the values.
+
+        Args:
+            values: Array of values in [0, total)
+
+        Returns:
+            Array of leaf indices
+        """
+        branching = self.branching
+        values = np.array(values, dtype=np.float64)
+        rows = np.arange(len(values))
+        nodes = np.zeros(len(values), dtype=np.int64)
+        for level in reversed(self.levels[:-1]):
+            children = level.reshape(-1, branching)[nodes]
+            cumulative = children.cumsum(axis=1)
+            # Stay below the subtree's sum, so rounding never steps past
+            # its last non-empty child
+            values = np.minimum(values, np.nextafter(cumulative[:, -1], 0))
+            slots = (cumulative <= values[:, None]).sum(axis=1)
+            values -= cumulative[rows, slots] - children[rows, slots]
+            nodes = nodes * branching + slots
+        return nodes
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of (state, action, reward, next_state, done).
+
+    Minibatches are drawn uniformly or in proportion to a per-transition
+    priority (|TD error| + REPLAY_PRIORITY_EPSILON) ** alpha. New transitions
+    get the largest priority seen so far, so each one is replayed at least
+    about once before its TD error is known.
+
+    Priorities are the leaves of a SumTree, so prioritized sampling costs
+    O(batch_size * log capacity). Writes only mark leaves dirty; the tree
+    is brought up to date in one batch before the next prioritized sample.
+    Up to LINEAR_SAMPLE_LIMIT transitions, a cumulative sum over the
+    priorities is cheaper than walking the tree and is used instead.
+    """
+
+    LINEAR_SAMPLE_LIMIT = 25000  # About where both searches cost the same
+
+    def __init__(self, capacity=REPLAY_CAPACITY, alpha=REPLAY_PRIORITY_ALPHA, seed=None):
+        """
+        Args:
+            capacity: Maximum number of stored transitions; the oldest are
+                overwritten first
+            alpha: Priority exponent (0 samples uniformly)
+            seed: Optional seed for minibatch sampling
+        """
+        self.capacity = capacity
+        self.alpha = alpha
+        self.rng = np.random.default_rng(seed)
+
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.tree = SumTree(capacity)
+        self.priorities = self.tree.values[:capacity]
+        # Leaves changed since the tree was last updated (None: rebuild it all)
+        self._dirty = []
+
+        self.position = 0
+        self.size = 0
+        self.max_priority = 1.0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Memory used by the buffer in bytes."""
+        return (self.states.nbytes + self.actions.nbytes + self.rewards.nbytes
+                + self.next_states.nbytes + self.dones.nbytes + self.tree.nbytes)
+
+    def _mark_dirty(self, indices):
+        """Record leaves whose priorities changed."""
+        dirty = self._dirty
+        if dirty is None:
+            return
+        if isinstance(indices, np.ndarray):
+            dirty.extend(indices.tolist())
+        else:
+            dirty.append(indices)
+        if len(dirty) > self.capacity:
+            self._dirty = None  # Cheaper to rebuild the whole tree
+
+    def _sync_tree(self):
+        """Bring the sum tree up to date with the priorities."""
+        if self._dirty is None:
+            self.tree.rebuild()
+        elif self._dirty:
+            self.tree.update(self._dirty)
+        self._dirty = []
+
+    def add(self, state, action, reward, next_state, done):
+        """Record one transition, overwriting the oldest when full."""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.priorities[i] = self.max_priority
+        self._mark_dirty(i)
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Record a batch of transitions (e.g. one step of a vector env).
+
+        Args:
+            states, actions, rewards, next_states, dones: (N,) arrays
+        """
+        count = len(states)
+        if count > self.capacity:
+            raise ValueError("Batch is larger than the replay buffer")
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.priorities[indices] = self.max_priority
+        self._mark_dirty(indices)
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size, prioritized=False, beta=REPLAY_PRIORITY_BETA):
+        """
+        Draw a minibatch of stored transitions (with replacement).
+
+        Args:
+            batch_size: Number of transitions to draw
+            prioritized: Sample in proportion to priority instead of uniformly
+            beta: Importance-sampling exponent correcting the prioritized bias
+                (1 corrects fully)
+
+        Returns:
+            Tuple of (indices, states, actions, rewards, next_states, dones,
+            weights) arrays; weights are all 1 for uniform sampling
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        if prioritized:
+            if self.size <= self.LINEAR_SAMPLE_LIMIT:
+                cumulative = np.cumsum(self.priorities[:self.size])
+                total = cumulative[-1]
+                indices = np.searchsorted(cumulative, self.rng.random(batch_size) * total,
+                                          side="right")
+            else:
+                self._sync_tree()
+                total = self.tree.total
+                indices = self.tree.find(self.rng.random(batch_size) * total)
+            indices = np.minimum(indices, self.size - 1)
+            weights = (self.size * self.priorities[indices] / total) ** -beta
+            weights /= weights.max()
+        else:
+            indices = self.rng.integers(0, self.size, size=batch_size)
+            weights = np.ones(batch_size)
+        return (indices, self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices], weights)
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Set the priorities of replayed transitions from their new TD errors.
+
+        Args:
+            indices: Buffer indices returned by sample()
+            td_errors: TD errors of those transitions
+        """
+        priorities = (np.abs(td_errors) + REPLAY_PRIORITY_EPSILON) ** self.alpha
+        self.priorities[indices] = priorities
+        self._mark_dirty(np.asarray(indices))
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def clear(self):
+        """Discard all stored transitions."""
+        self.position = 0
+        self.size = 0
+        self.max_priority = 1.0
+        self.tree.fill(0.0)
+        self._dirty = []
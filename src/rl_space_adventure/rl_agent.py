@@ -3,24 +3,243 @@ Reinforcement Learning agent implementation using Q-learning.
 """
 
 import numpy as np
-import random
 from .config import *
+from .qtable import DenseQTable, TileCodingQTable, make_q_table
+from .checkpoint import (open_checkpoint, open_policy, save_checkpoint, save_policy,
+                         update_epsilon)
+from .spatial import NearestIndex
+from .rng import RandomStream
 
 
 class RLAgent:
     """Q-Learning agent for the space adventure game."""
 
-    def __init__(self):
-        # Initialize Q-table with state space dimensions
+    def __init__(self, dtype=Q_TABLE_DTYPE, backend=Q_TABLE_BACKEND,
+                 state_bins=None, fuel_bins=None, seed=None, config=DEFAULT_CONFIG):
+        """
+        Args:
+            dtype: Q-value dtype
+            backend: Q-table backend name or instance (None for a policy-only agent);
+                "tiles" (or a TileCodingQTable) makes an approximate agent
+            state_bins, fuel_bins: Discretization (config's by default; unused
+                by approximate agents)
+            seed: Optional seed for the exploration stream
+            config: GameConfig with the grid size, learning rates and epsilon schedule
+        """
+        if state_bins is not None:
+            config = config.replace(state_bins=state_bins)
+        if fuel_bins is not None:
+            config = config.replace(fuel_bins=fuel_bins)
+        self.config = config
+        self.alpha = config.alpha
+        self.gamma = config.gamma
+        self.grid_width = config.grid_width
+        self.grid_height = config.grid_height
+
         # State: (player_x, player_y, fuel_bin, coin_dx, coin_dy, enemy_dx, enemy_dy)
-        self.q_table = np.zeros((STATE_BINS, STATE_BINS, FUEL_BINS,
-                                STATE_BINS, STATE_BINS, STATE_BINS, STATE_BINS,
-                                len(ACTIONS)))
-        self.epsilon = EPSILON_START
+        # encoded as one flat index using row-major strides over these dims.
+        # Approximate agents keep every component undiscretized: grid cells,
+        # whole fuel units and deltas offset by the grid size to be non-negative.
+        self.state_bins = state_bins = config.state_bins
+        self.fuel_bins = fuel_bins = config.fuel_bins
+        self.approximate = backend == "tiles" or isinstance(backend, TileCodingQTable)
+        if self.approximate:
+            width, height = self.grid_width, self.grid_height
+            self.state_dims = (width, height, 101,
+                               2 * width - 1, 2 * height - 1, 2 * width - 1, 2 * height - 1)
+        else:
+            self.state_dims = (state_bins, state_bins, fuel_bins,
+                               state_bins, state_bins, state_bins, state_bins)
+        self.state_strides = tuple(
+            int(np.prod(self.state_dims[i + 1:])) for i in range(len(self.state_dims)))
+        self.num_states = int(np.prod(self.state_dims))
+
+        # Q-table backend keyed by flat state index (None for a policy-only agent)
+        self.table = (make_q_table(backend, self.num_states, len(ACTIONS), dtype,
+                                   self.state_dims)
+                      if backend is not None else None)
+        self.epsilon = config.epsilon_start
+        self.rng = RandomStream(seed)
+        self.checkpoint_path = None
+
+        # Optional int8 greedy action per state (see cache_policy)
+        self.policy = None
+        self.policy_frozen = False
+
+    @classmethod
+    def load(cls, path, mode="r", state_bins=None, fuel_bins=None, config=DEFAULT_CONFIG):
+        """
+        Create an agent backed by a memory-mapped checkpoint.
+
+        Args:
+            path: Checkpoint file path
+            mode: "r" to share the table read-only (e.g. between evaluators),
+                "r+" to keep learning into the file, "c" for private changes
+            state_bins, fuel_bins: Discretization the checkpoint must match
+                (config's by default)
+            config: GameConfig of the agent (its grid size must match the file)
+
+        Returns:
+            RLAgent whose Q-table is mapped from the checkpoint
+        """
+        state_bins = config.state_bins if state_bins is None else state_bins
+        fuel_bins = config.fuel_bins if fuel_bins is None else fuel_bins
+        header, values, visits = open_checkpoint(path, mode, state_bins, fuel_bins,
+                                                 (config.grid_width, config.grid_height))
+        agent = cls(backend=DenseQTable.from_arrays(values, visits),
+                    state_bins=state_bins, fuel_bins=fuel_bins, config=config)
+        if header["num_states"] != agent.num_states:
+            raise ValueError(f"Checkpoint has {header['num_states']} states, "
+                             f"configuration expects {agent.num_states}")
+        agent.epsilon = header["epsilon"]
+        agent.checkpoint_path = path if mode == "r+" else None
+        return agent
+
+    def save(self, path):
+        """
+        Save the Q-table and exploration rate to a checkpoint file.
+
+        Args:
+            path: Checkpoint file path
+        """
+        if not isinstance(self.table, DenseQTable):
+            raise TypeError("Checkpoints are only supported for the dense Q-table backend")
+        if path == self.checkpoint_path:
+            self.flush()
+        else:
+            save_checkpoint(path, self.table.values, self.table.visits, self.epsilon,
+                            self.state_bins, self.fuel_bins, (self.grid_width, self.grid_height))
+
+    @classmethod
+    def load_policy(cls, path, state_bins=None, fuel_bins=None, config=DEFAULT_CONFIG):
+        """
+        Create an inference-only agent from a greedy-policy file.
+
+        The agent has no Q-table: it acts greedily with one byte lookup per
+        step and cannot learn.
+
+        Args:
+            path: Policy file written by save_policy
+            state_bins, fuel_bins: Discretization the policy must match
+                (config's by default)
+            config: GameConfig of the agent (its grid size must match the file)
+
+        Returns:
+            RLAgent with a frozen, memory-mapped policy and epsilon 0
+        """
+        state_bins = config.state_bins if state_bins is None else state_bins
+        fuel_bins = config.fuel_bins if fuel_bins is None else fuel_bins
+        _, actions = open_policy(path, state_bins, fuel_bins,
+                                 (config.grid_width, config.grid_height))
+        agent = cls(backend=None, state_bins=state_bins, fuel_bins=fuel_bins, config=config)
+        if len(actions) != agent.num_states:
+            raise ValueError(f"Policy has {len(actions)} states, "
+                             f"configuration expects {agent.num_states}")
+        agent.policy = actions
+        agent.policy_frozen = True
+        agent.epsilon = 0.0
+        return agent
+
+    def greedy_actions(self):
+        """
+        Compute the greedy action of every state from the Q-table.
+
+        Returns:
+            (num_states,) int8 array; states the table does not hold map to
+            action 0, as np.argmax over an all-zero row would
+        """
+        if self.approximate:
+            raise TypeError("Greedy policies need a tabular Q-table backend")
+        if isinstance(self.table, DenseQTable):
+            return self.table.values.argmax(axis=1).astype(np.int8)
+        actions = np.zeros(self.num_states, dtype=np.int8)
+        states, _ = self.table.visit_counts()
+        actions[states] = self.table.rows(states).argmax(axis=1)
+        return actions
+
+    def cache_policy(self, frozen=False):
+        """
+        Keep an int8 greedy action per state for fast exploitation.
+
+        Args:
+            frozen: If False, Q-value updates refresh the cached actions of
+                the rows they change; if True, the cache stays as built
+                (e.g. for evaluation while the table keeps learning)
+        """
+        self.policy = self.greedy_actions()
+        self.policy_frozen = frozen
+
+    def save_policy(self, path):
+        """
+        Export the greedy policy alone as a small policy file.
+
+        Args:
+            path: Policy file path
+        """
+        actions = self.policy if self.policy is not None else self.greedy_actions()
+        save_policy(path, actions, self.state_bins, self.fuel_bins,
+                    (self.grid_width, self.grid_height))
+
+    def flush(self):
+        """Write pending changes of a checkpoint-backed table to disk."""
+        if self.checkpoint_path is None:
+            return
+        self.table.values.flush()
+        self.table.visits.flush()
+        update_epsilon(self.checkpoint_path, self.epsilon)
+
+    @property
+    def q_values(self):
+        """Contiguous (num_states, num_actions) Q-table of the dense backend."""
+        if not isinstance(self.table, DenseQTable):
+            raise TypeError("q_values is only available with the dense Q-table backend")
+        return self.table.values
+
+    @property
+    def q_table(self):
+        """Q-table viewed as an 8-D array indexed by state tuples (shares memory)."""
+        return self.q_values.reshape(self.state_dims + (len(ACTIONS),))
+
+    def encode_state(self, components):
+        """
+        Encode a tuple of discrete state components as a flat state index.
+
+        Negative components wrap within their own axis, as indexing the
+        8-D table with the tuple would, instead of borrowing from the
+        higher components.
+        """
+        index = 0
+        for component, dim, stride in zip(components, self.state_dims, self.state_strides):
+            index += (component % dim) * stride
+        return index
+
+    def decode_state(self, index):
+        """Decode a flat state index into its tuple of discrete components."""
+        return tuple(int(c) for c in np.unravel_index(index, self.state_dims))
+
+    def _state_index(self, state):
+        """Accept either a flat state index or a legacy state tuple."""
+        return self.encode_state(state) if isinstance(state, tuple) else state
+
+    def _state_indices(self, states):
+        """Accept either (N,) flat state indices or (N, 7) state components."""
+        states = np.asarray(states)
+        if states.ndim == 2:
+            return (states % np.asarray(self.state_dims)) @ np.asarray(self.state_strides)
+        return states
 
     def discretize(self, value, max_value, bins):
-        """Discretize a continuous value into bins."""
-        return min(bins - 1, int(value / max_value * bins))
+        """
+        Discretize a continuous value into bins.
+
+        Negative values (deltas from the binned player position) wrap to
+        the top bins, so every result is a valid component in [0, bins).
+        """
+        return min(bins - 1, int(value / max_value * bins)) % bins
+
+    def discretize_array(self, values, max_value, bins):
+        """Discretize an array of values into bins (see discretize)."""
+        return np.minimum(bins - 1, (values / max_value * bins).astype(np.int64)) % bins
 
     def get_state(self, player_pos, fuel, coins, enemies):
         """
@@ -29,47 +248,135 @@ class RLAgent:
         Args:
             player_pos: (x, y) tuple for player position
             fuel: Current fuel level (0-100)
-            coins: List of coin positions
-            enemies: List of enemy positions
+            coins: List of coin positions or a NearestIndex over them
+            enemies: List of enemy positions or a NearestIndex over them
 
         Returns:
-            Tuple representing the discrete state
+            Flat integer index of the discrete state
         """
         px, py = player_pos
 
         # Find nearest coin and enemy
-        coin = min(coins, key=lambda c: abs(c[0] - px) + abs(c[1] - py)) if coins else [px, py]
-        enemy = min(enemies, key=lambda e: abs(e[0] - px) + abs(e[1] - py)) if enemies else [px, py]
+        cx, cy = self._nearest_position(coins, px, py)
+        ex, ey = self._nearest_position(enemies, px, py)
 
-        cx, cy = coin
-        ex, ey = enemy
+        if self.approximate:
+            s0, s1, s2, s3, s4, s5, s6 = self.state_strides
+            dx, dy = self.grid_width - 1 - px, self.grid_height - 1 - py
+            return (px * s0 + py * s1 + int(fuel) * s2 + (cx + dx) * s3 + (cy + dy) * s4
+                    + (ex + dx) * s5 + (ey + dy) * s6)
 
         # Discretize all components
-        px = self.discretize(px, GRID_WIDTH, STATE_BINS)
-        py = self.discretize(py, GRID_HEIGHT, STATE_BINS)
-        fuel_bin = self.discretize(fuel, 100, FUEL_BINS)
-        cdx = self.discretize(cx - px, GRID_WIDTH, STATE_BINS)
-        cdy = self.discretize(cy - py, GRID_HEIGHT, STATE_BINS)
-        edx = self.discretize(ex - px, GRID_WIDTH, STATE_BINS)
-        edy = self.discretize(ey - py, GRID_HEIGHT, STATE_BINS)
+        width, height = self.grid_width, self.grid_height
+        px = self.discretize(px, width, self.state_bins)
+        py = self.discretize(py, height, self.state_bins)
+        fuel_bin = self.discretize(fuel, 100, self.fuel_bins)
+        cdx = self.discretize(cx - px, width, self.state_bins)
+        cdy = self.discretize(cy - py, height, self.state_bins)
+        edx = self.discretize(ex - px, width, self.state_bins)
+        edy = self.discretize(ey - py, height, self.state_bins)
+
+        s0, s1, s2, s3, s4, s5, s6 = self.state_strides
+        return px * s0 + py * s1 + fuel_bin * s2 + cdx * s3 + cdy * s4 + edx * s5 + edy * s6
+
+    def _nearest_position(self, positions, px, py):
+        """Find the position nearest to (px, py), or (px, py) if there is none."""
+        if isinstance(positions, NearestIndex):
+            nearest = positions.nearest(px, py)
+            return nearest if nearest is not None else (px, py)
+        if not positions:
+            return (px, py)
+        return min(positions, key=lambda p: abs(p[0] - px) + abs(p[1] - py))
 
-        return (px, py, fuel_bin, cdx, cdy, edx, edy)
+    def _nearest(self, positions, player_pos):
+        """Pick the nearest position (Manhattan) per row; ties go to the first."""
+        if positions.shape[1] == 0:
+            return player_pos
+        distances = np.abs(positions - player_pos[:, None, :]).sum(axis=2)
+        return positions[np.arange(len(positions)), distances.argmin(axis=1)]
+
+    def get_states(self, player_pos, fuel, coins, enemies):
+        """
+        Convert a batch of game states to discrete representations.
+
+        Args:
+            player_pos: (N, 2) array of player positions
+            fuel: (N,) array of fuel levels
+            coins: (N, num_coins, 2) array of coin positions
+            enemies: (N, num_enemies, 2) array of enemy positions
+
+        Returns:
+            (N,) array of flat state indices
+        """
+        player_pos = np.asarray(player_pos)
+        coin = self._nearest(np.asarray(coins), player_pos)
+        enemy = self._nearest(np.asarray(enemies), player_pos)
+
+        width, height = self.grid_width, self.grid_height
+        if self.approximate:
+            s0, s1, s2, s3, s4, s5, s6 = self.state_strides
+            px, py = player_pos[:, 0], player_pos[:, 1]
+            dx, dy = width - 1 - px, height - 1 - py
+            return (px * s0 + py * s1 + np.asarray(fuel).astype(np.int64) * s2
+                    + (coin[:, 0] + dx) * s3 + (coin[:, 1] + dy) * s4
+                    + (enemy[:, 0] + dx) * s5 + (enemy[:, 1] + dy) * s6)
+
+        px = self.discretize_array(player_pos[:, 0], width, self.state_bins)
+        py = self.discretize_array(player_pos[:, 1], height, self.state_bins)
+
+        s0, s1, s2, s3, s4, s5, s6 = self.state_strides
+        return (px * s0 + py * s1
+                + self.discretize_array(np.asarray(fuel), 100, self.fuel_bins) * s2
+                + self.discretize_array(coin[:, 0] - px, width, self.state_bins) * s3
+                + self.discretize_array(coin[:, 1] - py, height, self.state_bins) * s4
+                + self.discretize_array(enemy[:, 0] - px, width, self.state_bins) * s5
+                + self.discretize_array(enemy[:, 1] - py, height, self.state_bins) * s6)
 
     def choose_action(self, state):
         """
         Choose an action using epsilon-greedy policy.
 
         Args:
-            state: Current discrete state
+            state: Current discrete state (flat index or legacy tuple)
 
         Returns:
             Index of chosen action
         """
-        if random.random() < self.epsilon:
-            return random.randint(0, len(ACTIONS) - 1)
-        return np.argmax(self.q_table[state])
+        if self.epsilon > 0:
+            # One draw decides both whether to explore and which action
+            draw = self.rng.random()
+            if draw < self.epsilon:
+                return min(int(draw / self.epsilon * len(ACTIONS)), len(ACTIONS) - 1)
+        if self.policy is not None:
+            return self.policy[self._state_index(state)]
+        return np.argmax(self.table.row(self._state_index(state)))
 
-    def update_q_value(self, state, action, reward, next_state):
+    def choose_actions(self, states):
+        """
+        Choose actions for a batch of states using epsilon-greedy policy.
+
+        A single uniform draw per state decides both whether to explore and,
+        if so, which action to take.
+
+        Args:
+            states: (N,) array of flat state indices
+
+        Returns:
+            (N,) array of action indices
+        """
+        states = self._state_indices(states)
+        if self.policy is not None:
+            actions = self.policy[states].astype(np.int64)
+        else:
+            actions = self.table.rows(states).argmax(axis=1)
+        if self.epsilon > 0:
+            draws = self.rng.generator.random(len(actions))
+            explore = draws < self.epsilon
+            random_actions = (draws[explore] / self.epsilon * len(ACTIONS)).astype(np.int64)
+            actions[explore] = np.minimum(random_actions, len(ACTIONS) - 1)
+        return actions
+
+    def update_q_value(self, state, action, reward, next_state, done=False):
         """
         Update Q-value using Q-learning update rule.
 
@@ -78,11 +385,82 @@ class RLAgent:
             action: Action taken
             reward: Reward received
             next_state: Next state
+            done: Whether the episode ended, in which case next_state is not
+                bootstrapped from
+        """
+        state = self._state_index(state)
+        if self.approximate:
+            # Semi-gradient step on the active tiles' weights
+            current_q = self.table.row(state)[action]
+            next_max_q = 0.0 if done else self.table.row(self._state_index(next_state)).max()
+            self.table.add(state, action,
+                           self.alpha * (reward + self.gamma * next_max_q - current_q))
+            return
+        row = self.table.writable_row(state)
+        current_q = row[action]
+        next_max_q = 0.0 if done else self.table.row(self._state_index(next_state)).max()
+        row[action] = current_q + self.alpha * (reward + self.gamma * next_max_q - current_q)
+        if self.policy is not None and not self.policy_frozen:
+            self.policy[state] = row.argmax()
+
+    def update_q_values(self, states, actions, rewards, next_states, dones=None, weights=None):
+        """
+        Apply a batch of Q-learning updates.
+
+        TD errors are computed against the Q-table before the batch and the
+        updates are scatter-added, so duplicate (state, action) pairs each
+        contribute their own increment instead of overwriting one another
+        (with the tile coding backend, this is a batched semi-gradient step).
+
+        Args:
+            states: (N,) array of current state indices
+            actions: (N,) array of actions taken
+            rewards: (N,) array of rewards received
+            next_states: (N,) array of next state indices
+            dones: Optional (N,) boolean array; finished transitions are not
+                bootstrapped from next_states
+            weights: Optional (N,) array scaling each update's step size
+                (importance-sampling weights of prioritized replay)
+
+        Returns:
+            (N,) array of TD errors
+        """
+        states = self._state_indices(states)
+        actions = np.asarray(actions)
+        current_q = self.table.rows(states)[np.arange(len(states)), actions]
+        next_max_q = self.table.rows(self._state_indices(next_states)).max(axis=1)
+        if dones is not None:
+            next_max_q = np.where(dones, 0.0, next_max_q)
+        td_errors = rewards + self.gamma * next_max_q - current_q
+        steps = self.alpha * td_errors if weights is None else self.alpha * weights * td_errors
+        self.table.add_at(states, actions, steps)
+        if self.policy is not None and not self.policy_frozen:
+            changed = np.unique(states)
+            self.policy[changed] = self.table.rows(changed).argmax(axis=1)
+        return td_errors
+
+    def replay(self, buffer, batch_size=REPLAY_BATCH_SIZE, prioritized=REPLAY_PRIORITIZED):
+        """
+        Learn from a minibatch of stored transitions in one batched update.
+
+        Args:
+            buffer: ReplayBuffer to sample from
+            batch_size: Number of transitions to replay
+            prioritized: Sample by TD error and refresh the replayed priorities
+
+        Returns:
+            (batch_size,) array of TD errors, or None if the buffer is empty
         """
-        current_q = self.q_table[state][action]
-        next_max_q = np.max(self.q_table[next_state])
-        self.q_table[state][action] = current_q + ALPHA * (reward + GAMMA * next_max_q - current_q)
+        if len(buffer) == 0:
+            return None
+        indices, states, actions, rewards, next_states, dones, weights = buffer.sample(
+            batch_size, prioritized)
+        td_errors = self.update_q_values(states, actions, rewards, next_states, dones,
+                                         weights if prioritized else None)
+        if prioritized:
+            buffer.update_priorities(indices, td_errors)
+        return td_errors
 
     def decay_epsilon(self):
         """Decay exploration rate."""
-        self.epsilon = max(EPSILON_END, self.epsilon * EPSILON_DECAY)
+        self.epsilon = max(self.config.epsilon_end, self.epsilon * self.config.epsilon_decay)
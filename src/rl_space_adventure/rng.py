@@ -0,0 +1,57 @@
+"""
+Seeded random number streams for RL Space Adventure.
+
+Each environment and agent owns a RandomStream instead of sharing the global
+random module, so runs are reproducible from their seeds and independent
+across processes. Scalar draws are served from a block of numbers drawn in
+bulk by a numpy.random.Generator, which costs far less than one Generator
+call per draw.
+"""
+
+from itertools import chain
+import numpy as np
+from .config import *
+
+
+class RandomStream:
+    """
+    Buffered uniform random numbers from a seeded numpy Generator.
+
+    Offers the subset of the random.Random interface the game uses:
+    random() returns the next uniform float in [0, 1), plus randrange,
+    randint and seed. Bulk draws should use the underlying generator
+    directly.
+    """
+
+    def __init__(self, seed=None, block_size=RANDOM_BLOCK_SIZE):
+        """
+        Args:
+            seed: Optional seed (int, SeedSequence or None for fresh entropy)
+            block_size: Number of uniforms drawn per refill
+        """
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Restart the stream from a seed, discarding buffered numbers."""
+        self.generator = np.random.default_rng(seed)
+        # random() is the C-level __next__ of an iterator over bulk-drawn
+        # blocks, which is much cheaper than a Python method per draw
+        self.random = chain.from_iterable(self._blocks()).__next__
+
+    def _blocks(self):
+        """Yield blocks of uniforms drawn in bulk, as lists of Python floats."""
+        while True:
+            yield self.generator.random(self.block_size).tolist()
+
+    def draw_seed(self):
+        """Draw a seed for a new stream (e.g. to reseed an episode)."""
+        return int(self.generator.integers(2 ** 63))
+
+    def randrange(self, n):
+        """Get a uniform integer in [0, n)."""
+        return int(self.random() * n)
+
+    def randint(self, a, b):
+        """Get a uniform integer in [a, b], both inclusive."""
+        return a + int(self.random() * (b - a + 1))
@@ -0,0 +1,104 @@
+"""
+Game loop scheduling for RL Space Adventure.
+
+Decouples the simulation clock from the render clock: each loop iteration
+("frame") runs some number of simulation steps and optionally renders.
+"""
+
+import time
+from .config import *
+
+
+class GameLoopScheduler:
+    """
+    Plans simulation steps and rendering for each frame of the game loop.
+
+    Normal mode runs one step per frame at FPS, so the game stays watchable
+    and playable by hand. Turbo mode runs as many steps per frame as fit in
+    a 1 / TURBO_FPS frame budget, adapting the count from measured step and
+    render times, and renders every render_interval-th frame (or only when
+    requested if render_interval is 0).
+    """
+
+    def __init__(self, fps=FPS, turbo_fps=TURBO_FPS, render_interval=TURBO_RENDER_INTERVAL,
+                 max_steps_per_frame=MAX_STEPS_PER_FRAME, smoothing=0.2):
+        self.fps = fps
+        self.turbo_fps = turbo_fps
+        self.render_interval = render_interval
+        self.max_steps_per_frame = max_steps_per_frame
+        self.smoothing = smoothing
+
+        self.turbo = False
+        self.steps_per_frame = 1
+        self.step_time = None
+        self.render_time = 0.0
+        self.frame_index = 0
+        self.render_requested = True
+
+    @property
+    def target_fps(self):
+        """Frame rate the loop should be paced at (0 means unpaced)."""
+        return 0 if self.turbo else self.fps
+
+    def toggle_turbo(self):
+        """Switch between normal and turbo mode."""
+        self.turbo = not self.turbo
+        self.steps_per_frame = 1
+        self.render_requested = True
+
+    def request_render(self):
+        """Render on the next frame regardless of the render interval."""
+        self.render_requested = True
+
+    def plan_frame(self):
+        """
+        Plan the next frame.
+
+        Returns:
+            Tuple of (number of simulation steps, whether to render)
+        """
+        self.frame_index += 1
+        render = self.render_requested or not self.turbo or (
+            self.render_interval > 0 and self.frame_index % self.render_interval == 0)
+        self.render_requested = False
+        return (self.steps_per_frame if self.turbo else 1), render
+
+    def _smooth(self, average, sample):
+        """Exponential moving average update."""
+        if average is None:
+            return sample
+        return average + self.smoothing * (sample - average)
+
+    def record(self, steps, simulation_time, render_time=None):
+        """
+        Record measured frame timings and adapt the steps per frame.
+
+        Args:
+            steps: Number of simulation steps run this frame
+            simulation_time: Seconds spent simulating
+            render_time: Seconds spent rendering, or None if nothing rendered
+        """
+        if steps > 0:
+            self.step_time = self._smooth(self.step_time, simulation_time / steps)
+        if render_time is not None:
+            self.render_time = self._smooth(self.render_time, render_time)
+        if self.turbo and self.step_time:
+            # Amortize rendering over the frames that actually render
+            interval = self.render_interval or 1
+            budget = 1.0 / self.turbo_fps - self.render_time / interval
+            steps = int(budget / self.step_time)
+            self.steps_per_frame = max(1, min(self.max_steps_per_frame, steps))
+
+    def frame_delay(self, frame_start):
+        """
+        Get how long to wait to pace a frame that started at frame_start.
+
+        Args:
+            frame_start: time.perf_counter() value at the start of the frame
+
+        Returns:
+            Seconds to wait before starting the next frame (0 in turbo mode)
+        """
+        if not self.target_fps:
+            return 0.0
+        return max(0.0, 1.0 / self.target_fps - (time.perf_counter() - frame_start))
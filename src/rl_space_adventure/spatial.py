@@ -0,0 +1,207 @@
+"""
+Spatial indexes over the game grid for RL Space Adventure.
+
+These structures are updated as entities move, so collision checks and
+entity spawning do not need to scan every entity on every step.
+"""
+
+
+class OccupancyGrid:
+    """
+    Per-cell occupancy of the game grid.
+
+    Tracks which coin slot occupies each cell, how many enemies are on each
+    cell and where the player is. Cells holding neither a coin nor the player
+    are kept in a free-cell list with swap-remove, so a spawn position for a
+    new coin can be sampled in O(1).
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.num_cells = width * height
+        self.clear()
+
+    def clear(self):
+        """Remove all entities from the grid."""
+        self.coin_slots = [-1] * self.num_cells
+        self.enemy_counts = [0] * self.num_cells
+        self.blocked = [0] * self.num_cells
+        self.free_cells = list(range(self.num_cells))
+        self.free_index = list(range(self.num_cells))
+
+    def cell(self, pos):
+        """Get the cell index of an (x, y) position."""
+        return pos[0] * self.height + pos[1]
+
+    def position(self, cell):
+        """Get the (x, y) position of a cell index."""
+        return divmod(cell, self.height)
+
+    def _block(self, cell):
+        """Mark a cell as holding a coin or the player."""
+        self.blocked[cell] += 1
+        if self.blocked[cell] == 1:
+            index = self.free_index[cell]
+            last = self.free_cells.pop()
+            if last != cell:
+                self.free_cells[index] = last
+                self.free_index[last] = index
+            self.free_index[cell] = -1
+
+    def _unblock(self, cell):
+        """Release a cell previously marked with _block."""
+        self.blocked[cell] -= 1
+        if self.blocked[cell] == 0:
+            self.free_index[cell] = len(self.free_cells)
+            self.free_cells.append(cell)
+
+    @property
+    def num_free(self):
+        """Number of cells holding neither a coin nor the player."""
+        return len(self.free_cells)
+
+    def sample_free(self, rng):
+        """
+        Sample a cell holding neither a coin nor the player.
+
+        Args:
+            rng: RandomStream (or random.Random) source of randomness
+
+        Returns:
+            (x, y) position of the sampled cell
+        """
+        return self.position(self.free_cells[rng.randrange(len(self.free_cells))])
+
+    def place_player(self, pos):
+        """Place the player on the grid."""
+        self._block(self.cell(pos))
+
+    def move_player(self, old_pos, new_pos):
+        """Update the player's cell after a move."""
+        if old_pos != new_pos:
+            self._unblock(self.cell(old_pos))
+            self._block(self.cell(new_pos))
+
+    def add_coin(self, slot, pos):
+        """Place the coin in the given slot on a cell."""
+        cell = self.cell(pos)
+        self.coin_slots[cell] = slot
+        self._block(cell)
+
+    def remove_coin(self, pos):
+        """Remove the coin on a cell."""
+        cell = self.cell(pos)
+        self.coin_slots[cell] = -1
+        self._unblock(cell)
+
+    def coin_at(self, pos):
+        """Get the slot of the coin on a cell, or -1 if there is none."""
+        return self.coin_slots[self.cell(pos)]
+
+    def add_enemy(self, pos):
+        """Place an enemy on a cell."""
+        self.enemy_counts[self.cell(pos)] += 1
+
+    def remove_enemy(self, pos):
+        """Remove an enemy from a cell."""
+        self.enemy_counts[self.cell(pos)] -= 1
+
+    def move_enemy(self, old_pos, new_pos):
+        """Update an enemy's cell after a move."""
+        self.enemy_counts[self.cell(old_pos)] -= 1
+        self.enemy_counts[self.cell(new_pos)] += 1
+
+    def enemies_at(self, pos):
+        """Get the number of enemies on a cell."""
+        return self.enemy_counts[self.cell(pos)]
+
+
+class NearestIndex:
+    """
+    Bucketed grid index for nearest-entity queries under Manhattan distance.
+
+    Entities are identified by slot and filed into square buckets of
+    bucket_size cells. A query scans rings of buckets outward from the query
+    point and stops once no farther ring can hold a closer entity. Ties are
+    broken by the lowest slot, matching min() over a list in slot order.
+    Small indexes are scanned linearly, which is faster than the ring search.
+    """
+
+    LINEAR_SCAN_LIMIT = 8
+
+    def __init__(self, width, height, bucket_size=4):
+        self.bucket_size = bucket_size
+        self.buckets_x = -(-width // bucket_size)
+        self.buckets_y = -(-height // bucket_size)
+        self.clear()
+
+    def clear(self):
+        """Remove all entities from the index."""
+        self.positions = {}
+        self.buckets = [set() for _ in range(self.buckets_x * self.buckets_y)]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _bucket(self, pos):
+        """Get the bucket set holding a position."""
+        return self.buckets[(pos[0] // self.bucket_size) * self.buckets_y
+                            + pos[1] // self.bucket_size]
+
+    def add(self, slot, pos):
+        """Add an entity at a position."""
+        self.positions[slot] = pos
+        self._bucket(pos).add(slot)
+
+    def remove(self, slot):
+        """Remove an entity."""
+        self._bucket(self.positions.pop(slot)).discard(slot)
+
+    def move(self, slot, pos):
+        """Update the position of an entity."""
+        old_bucket = self._bucket(self.positions[slot])
+        new_bucket = self._bucket(pos)
+        if old_bucket is not new_bucket:
+            old_bucket.discard(slot)
+            new_bucket.add(slot)
+        self.positions[slot] = pos
+
+    def nearest(self, x, y):
+        """
+        Find the entity nearest to a point.
+
+        Args:
+            x, y: Query position
+
+        Returns:
+            (x, y) position of the nearest entity, or None if the index is empty
+        """
+        positions = self.positions
+        if not positions:
+            return None
+        if len(positions) <= self.LINEAR_SCAN_LIMIT:
+            return min(positions.items(), key=lambda item: (
+                abs(item[1][0] - x) + abs(item[1][1] - y), item[0]))[1]
+        size = self.bucket_size
+        bx, by = x // size, y // size
+        best_distance, best_slot = None, None
+
+        for ring in range(max(self.buckets_x, self.buckets_y)):
+            # No cell in this ring can be closer than this bound
+            if best_distance is not None and (ring - 1) * size + 1 > best_distance:
+                break
+            for i in range(max(0, bx - ring), min(self.buckets_x, bx + ring + 1)):
+                if i == bx - ring or i == bx + ring:
+                    columns = range(max(0, by - ring), min(self.buckets_y, by + ring + 1))
+                else:
+                    columns = [j for j in (by - ring, by + ring) if 0 <= j < self.buckets_y]
+                for j in columns:
+                    for slot in self.buckets[i * self.buckets_y + j]:
+                        ex, ey = positions[slot]
+                        distance = abs(ex - x) + abs(ey - y)
+                        if (best_distance is None or distance < best_distance
+                                or (distance == best_distance and slot < best_slot)):
+                            best_distance, best_slot = distance, slot
+
+        return positions[best_slot]
@@ -0,0 +1,334 @@
+"""
+Concurrent hyperparameter sweeps for RL Space Adventure.
+
+Each trial trains a fresh agent under its own GameConfig on a process pool.
+Trials report their rolling score every few episodes, and a trial whose
+score falls below a percentile of the scores other trials had at the same
+episode is stopped early (the median stopping rule by default).
+
+Usage:
+    python -m src.rl_space_adventure sweep --param alpha=0.05,0.1,0.2 \
+        --param gamma=0.9,0.99 --episodes 2000
+    python -m src.rl_space_adventure sweep --param alpha=0.01:0.5 --random 16
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from .config import *
+from .env import SpaceAdventureEnv
+from .rl_agent import RLAgent
+from .training import run_episode
+
+SWEEP_METRICS = ("coins", "return", "length")
+
+
+def grid_search(space):
+    """
+    Expand a parameter space into every combination of its values.
+
+    Args:
+        space: Dictionary of GameConfig field name -> list of values
+
+    Returns:
+        List of parameter dictionaries
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_search(space, trials, seed=0):
+    """
+    Sample parameter combinations at random.
+
+    Args:
+        space: Dictionary of GameConfig field name -> list of values (picked
+            uniformly) or (low, high) tuple (sampled uniformly; integers if
+            both bounds are ints, high inclusive)
+        trials: Number of combinations
+        seed: Sampling seed
+
+    Returns:
+        List of parameter dictionaries
+    """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(trials):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = int(rng.integers(low, high + 1))
+                else:
+                    params[name] = float(rng.uniform(low, high))
+            else:
+                params[name] = values[int(rng.integers(len(values)))]
+        samples.append(params)
+    return samples
+
+
+def run_trial(trial_id, params, episodes, seed, report, report_interval=SWEEP_REPORT_INTERVAL,
+              window=SWEEP_SCORE_WINDOW, metric="coins"):
+    """
+    Train a fresh agent under one parameter setting.
+
+    Args:
+        trial_id: Trial number
+        params: GameConfig overrides
+        episodes: Episode budget
+        seed: Seed of the trial's agent and environment streams
+        report: Callable (trial_id, episodes, score) -> bool, called every
+            report_interval episodes; returning True stops the trial
+        report_interval: Episodes between reports
+        window: Episodes in the rolling score
+        metric: run_episode result the score averages
+
+    Returns:
+        Dictionary with the trial id, parameters, episodes played, final
+        rolling score, whether it was stopped early and its run time
+    """
+    config = DEFAULT_CONFIG.replace(**params)
+    agent_seed, env_seed = np.random.SeedSequence(seed).spawn(2)
+    agent = RLAgent(seed=agent_seed, config=config)
+    env = SpaceAdventureEnv(seed=env_seed, config=config)
+    scores = deque(maxlen=window)
+    stopped = False
+    start = time.perf_counter()
+
+    episode = 0
+    while episode < episodes:
+        result = run_episode(env, agent, max_steps=config.max_episode_steps)
+        scores.append(result[metric])
+        episode += 1
+        if episode % report_interval == 0 and episode < episodes:
+            if report(trial_id, episode, float(np.mean(scores))):
+                stopped = True
+                break
+
+    return {
+        "trial": trial_id,
+        "params": params,
+        "episodes": episode,
+        "score": float(np.mean(scores)),
+        "stopped": stopped,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+class _QueueReporter:
+    """Picklable report callable for pool workers, backed by manager proxies."""
+
+    def __init__(self, reports, stops):
+        self.reports = reports
+        self.stops = stops
+
+    def __call__(self, trial_id, episodes, score):
+        # Decisions are made in the scheduler process, so a stop takes
+        # effect at the trial's next report
+        self.reports.put((trial_id, episodes, score))
+        return self.stops.get(trial_id, False)
+
+
+class SweepScheduler:
+    """
+    Runs trials concurrently and stops poor ones early.
+
+    A trial reporting score s after e episodes is stopped if e is at least
+    grace_episodes, at least min_peers other trials have reported at e, and
+    s is below the stop_percentile of their scores.
+    """
+
+    def __init__(self, trials, episodes, workers=None, seed=0,
+                 report_interval=SWEEP_REPORT_INTERVAL, window=SWEEP_SCORE_WINDOW,
+                 grace_episodes=SWEEP_GRACE_EPISODES, min_peers=SWEEP_MIN_PEERS,
+                 stop_percentile=SWEEP_STOP_PERCENTILE, metric="coins"):
+        """
+        Args:
+            trials: List of GameConfig override dictionaries
+            episodes: Episode budget per trial
+            workers: Worker processes (CPU count by default; 0 runs trials
+                one after another in this process)
+            seed: Seed shared by every trial, so trials differ only in
+                their parameters
+            report_interval, window: See run_trial
+            grace_episodes, min_peers, stop_percentile: Early stopping rule
+            metric: "coins", "return" or "length"
+        """
+        if metric not in SWEEP_METRICS:
+            raise ValueError(f"Unknown sweep metric: {metric}")
+        fields = {field.name for field in dataclasses.fields(GameConfig)}
+        for params in trials:
+            unknown = set(params) - fields
+            if unknown:
+                raise ValueError(f"Unknown GameConfig parameters: {sorted(unknown)}")
+        self.trials = trials
+        self.episodes = episodes
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.seed = seed
+        self.report_interval = report_interval
+        self.window = window
+        self.grace_episodes = grace_episodes
+        self.min_peers = min_peers
+        self.stop_percentile = stop_percentile
+        self.metric = metric
+        # Reported scores: episodes -> {trial id: score}
+        self.history = {}
+
+    def should_stop(self, trial_id, episodes, score):
+        """Record a trial's report and decide whether to stop it."""
+        reports = self.history.setdefault(episodes, {})
+        reports[trial_id] = score
+        if episodes < self.grace_episodes:
+            return False
+        peers = [peer_score for peer, peer_score in reports.items() if peer != trial_id]
+        if len(peers) < self.min_peers:
+            return False
+        return bool(score < np.percentile(peers, self.stop_percentile))
+
+    def _trial_args(self, trial_id, report):
+        """Positional arguments of run_trial for a trial."""
+        return (trial_id, self.trials[trial_id], self.episodes, self.seed, report,
+                self.report_interval, self.window, self.metric)
+
+    def run(self, on_result=None):
+        """
+        Run every trial.
+
+        Args:
+            on_result: Optional callback receiving each finished trial's
+                result, for streaming
+
+        Returns:
+            List of run_trial results, best score first
+        """
+        results = []
+
+        def finish(result):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        if self.workers == 0:
+            for trial_id in range(len(self.trials)):
+                finish(run_trial(*self._trial_args(trial_id, self.should_stop)))
+        else:
+            with multiprocessing.Manager() as manager, \
+                    ProcessPoolExecutor(max_workers=self.workers) as pool:
+                reports = manager.Queue()
+                stops = manager.dict()
+                reporter = _QueueReporter(reports, stops)
+                pending = {pool.submit(run_trial, *self._trial_args(trial_id, reporter))
+                           for trial_id in range(len(self.trials))}
+                while pending:
+                    self._apply_reports(reports, stops)
+                    done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future.result())
+
+        results.sort(key=lambda result: result["score"], reverse=True)
+        return results
+
+    def _apply_reports(self, reports, stops):
+        """Decide on every queued report, flagging trials to stop."""
+        while not reports.empty():
+            trial_id, episodes, score = reports.get()
+            if self.should_stop(trial_id, episodes, score):
+                stops[trial_id] = True
+
+
+def parse_space(specs):
+    """
+    Parse --param specifications into a parameter space.
+
+    Args:
+        specs: Strings of the form "name=v1,v2,..." (values) or
+            "name=low:high" (range, random search only)
+
+    Returns:
+        Dictionary of GameConfig field name -> list of values or (low, high)
+    """
+    types = {field.name: field.type for field in dataclasses.fields(GameConfig)}
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in types or not values:
+            raise ValueError(f"Invalid parameter {spec!r}; expected one of {sorted(types)}")
+        cast = types[name]
+        if ":" in values:
+            low, high = values.split(":")
+            space[name] = (cast(low), cast(high))
+        else:
+            space[name] = [cast(value) for value in values.split(",")]
+    return space
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="rl-space-adventure sweep",
+                                     description="Sweep GameConfig parameters concurrently.")
+    parser.add_argument("--param", action="append", required=True,
+                        help="name=v1,v2,... or name=low:high (repeatable)")
+    parser.add_argument("--random", type=int, metavar="TRIALS",
+                        help="Sample this many random combinations instead of the full grid")
+    parser.add_argument("--episodes", type=int, default=1000, help="Episode budget per trial")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed shared by the trials")
+    parser.add_argument("--metric", choices=SWEEP_METRICS, default="coins",
+                        help="Episode result the rolling score averages")
+    parser.add_argument("--grace-episodes", type=int, default=SWEEP_GRACE_EPISODES,
+                        help="Episodes before a trial can be stopped early")
+    parser.add_argument("--results", help="Stream per-trial results to this JSON lines file")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a sweep from the command line and return the exit status."""
+    args = parse_args(argv)
+    space = parse_space(args.param)
+    if args.random:
+        trials = random_search(space, args.random, args.seed)
+    elif any(isinstance(values, tuple) for values in space.values()):
+        raise SystemExit("Ranges (low:high) need --random")
+    else:
+        trials = grid_search(space)
+
+    results_file = open(args.results, "w", encoding="utf-8") if args.results else None
+    finished = []
+
+    def on_result(result):
+        finished.append(result)
+        if results_file is not None:
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+        status = "stopped" if result["stopped"] else "done"
+        print(f"[{len(finished):>{len(str(len(trials)))}}/{len(trials)}] {result['params']} "
+              f"{args.metric} {result['score']:.3f} after {result['episodes']} episodes ({status})",
+              file=sys.stderr)
+
+    try:
+        scheduler = SweepScheduler(trials, args.episodes, args.workers, args.seed,
+                                   grace_episodes=args.grace_episodes, metric=args.metric)
+        results = scheduler.run(on_result)
+    finally:
+        if results_file is not None:
+            results_file.close()
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
@@ -0,0 +1,183 @@
+"""
+Training telemetry for RL Space Adventure.
+
+Per-episode metrics are appended to a bounded in-memory buffer and written
+to rotating JSON lines or CSV files by a background thread, so the training
+loop never waits on disk I/O and long runs use constant memory.
+
+Usage:
+    with TelemetryWriter("telemetry.jsonl") as telemetry:
+        for _ in range(episodes):
+            run_episode(env, agent, telemetry=telemetry)
+"""
+
+import csv
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from .config import *
+
+TELEMETRY_FIELDS = ("episode", "time", "return", "length", "coins", "termination",
+                    "epsilon", "coverage", "steps_per_sec")
+TELEMETRY_FORMATS = ("jsonl", "csv")
+
+
+class TelemetryWriter:
+    """
+    Background writer of per-episode metrics.
+
+    record() only appends to a deque, which is thread-safe without locks
+    in CPython. When the buffer is full the oldest unwritten rows are
+    dropped (and counted) rather than blocking or growing. The writer
+    thread drains the buffer every flush_interval seconds and rotates the
+    file once it exceeds max_bytes, keeping `backups` old files as
+    <path>.1 (newest) to <path>.<backups>.
+    """
+
+    def __init__(self, path, format=None, buffer_size=TELEMETRY_BUFFER_SIZE,
+                 flush_interval=TELEMETRY_FLUSH_INTERVAL, max_bytes=TELEMETRY_MAX_BYTES,
+                 backups=TELEMETRY_BACKUPS, coverage_interval=TELEMETRY_COVERAGE_INTERVAL):
+        """
+        Args:
+            path: Output file path
+            format: "jsonl" or "csv" (from the file extension by default)
+            buffer_size: Rows buffered before the oldest are dropped
+            flush_interval: Seconds between background writes
+            max_bytes: File size that triggers a rotation
+            backups: Rotated files kept
+            coverage_interval: Episodes between Q-table coverage scans
+        """
+        if format is None:
+            format = "csv" if path.endswith(".csv") else "jsonl"
+        if format not in TELEMETRY_FORMATS:
+            raise ValueError(f"Unknown telemetry format {format!r}; expected one of {TELEMETRY_FORMATS}")
+        self.path = path
+        self.format = format
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.coverage_interval = coverage_interval
+
+        self.buffer = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self.written = 0
+        self.episodes = 0
+        self.coverage = None
+        self.last_time = time.perf_counter()
+
+        self.file = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+
+    def record(self, metrics):
+        """
+        Queue one row of metrics without blocking.
+
+        Args:
+            metrics: Dictionary keyed by TELEMETRY_FIELDS (missing fields
+                are written empty)
+        """
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1  # Approximate: the writer may drain concurrently
+        self.buffer.append(metrics)
+
+    def record_episode(self, result, agent):
+        """
+        Queue the metrics of a finished episode.
+
+        Args:
+            result: run_episode-style result dictionary with the return,
+                length, coins and termination cause
+            agent: RLAgent that played the episode
+        """
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+        self.episodes += 1
+        if agent.table is not None and (self.coverage is None
+                                        or self.episodes % self.coverage_interval == 0):
+            self.coverage = agent.table.stats()["coverage"]
+        self.record({
+            "episode": self.episodes,
+            "time": time.time(),
+            "return": result["return"],
+            "length": result["length"],
+            "coins": result["coins"],
+            "termination": result["termination"],
+            "epsilon": agent.epsilon,
+            "coverage": self.coverage,
+            "steps_per_sec": result["length"] / elapsed if elapsed > 0 else None,
+        })
+
+    def _open(self):
+        """Open a fresh output file, writing the CSV header if needed."""
+        self.file = open(self.path, "w", encoding="utf-8", newline="")
+        if self.format == "csv":
+            csv.writer(self.file).writerow(TELEMETRY_FIELDS)
+
+    def _rotate(self):
+        """Shift the backups along and start a new file."""
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._open()
+
+    def _format(self, rows):
+        """Serialize a batch of rows."""
+        if self.format == "jsonl":
+            return "".join(json.dumps({field: row.get(field) for field in TELEMETRY_FIELDS}) + "\n"
+                           for row in rows)
+        text = io.StringIO()
+        writer = csv.writer(text)
+        for row in rows:
+            writer.writerow(["" if row.get(field) is None else row.get(field)
+                             for field in TELEMETRY_FIELDS])
+        return text.getvalue()
+
+    def _drain(self):
+        """Write every buffered row as one batch."""
+        rows = []
+        buffer = self.buffer
+        while buffer:
+            rows.append(buffer.popleft())
+        if not rows:
+            return
+        self.file.write(self._format(rows))
+        self.file.flush()
+        self.written += len(rows)
+        if self.file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def start(self):
+        """Open the output file and start writing in the background."""
+        self._open()
+        self.last_time = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background thread, write what is left and close the file."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.file is not None:
+            self._drain()
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
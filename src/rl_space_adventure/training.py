@@ -0,0 +1,255 @@
+"""
+Headless training loops for RL Space Adventure.
+
+Includes a single-episode loop shared by the tools in this package and a
+multi-process trainer whose workers learn into one shared-memory Q-table.
+"""
+
+import os
+import queue
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from .config import *
+from .env import SpaceAdventureEnv
+from .qtable import DenseQTable
+from .rl_agent import RLAgent
+
+
+def run_episode(env, agent, learn=True, max_steps=MAX_EPISODE_STEPS, replay=None,
+                replay_interval=REPLAY_INTERVAL, planner=None, recorder=None, telemetry=None):
+    """
+    Play one episode headless.
+
+    Args:
+        env: SpaceAdventureEnv to play in (reset at the start)
+        agent: RLAgent choosing the actions
+        learn: Whether to update the Q-table and decay epsilon
+        max_steps: Episode length cap, since staying put costs no fuel
+        replay: Optional ReplayBuffer; when learning, each transition is
+            stored and a minibatch is replayed every replay_interval steps
+        replay_interval: Steps between replayed minibatches (0 only stores)
+        planner: Optional Planner; when learning, it observes each
+            transition and runs its planning budget after every step
+        recorder: Optional TrajectoryRecorder the episode is logged to,
+            with a fresh episode seed drawn from the env's stream
+        telemetry: Optional TelemetryWriter the episode's metrics are queued to
+
+    Returns:
+        Dictionary with the episode return, length, coins collected, final
+        fuel and termination cause (None if the episode hit max_steps)
+    """
+    if recorder is not None:
+        # Reseed recorded episodes so the logged seed reproduces them
+        env.reset(env.rng.draw_seed())
+        recorder.begin_episode(env, env.episode_seed)
+    else:
+        env.reset()
+    state = agent.get_state(*env.get_indexed_observation())
+    total_reward = 0.0
+    coins = 0
+    info = {"termination": None}
+
+    steps = 0
+    while steps < max_steps:
+        action = agent.choose_action(state)
+        _, reward, done, info = env.step(action, observe=False)
+        next_state = agent.get_state(*env.get_indexed_observation())
+        steps += 1
+        if recorder is not None:
+            recorder.record_step(env, action, reward)
+        if learn:
+            agent.update_q_value(state, action, reward, next_state, done)
+            if replay is not None:
+                replay.add(state, action, reward, next_state, done)
+                if replay_interval and steps % replay_interval == 0:
+                    agent.replay(replay)
+            if planner is not None:
+                planner.step(state, action, reward, next_state, done)
+
+        state = next_state
+        total_reward += reward
+        coins += info["coins"]
+        if done:
+            break
+
+    if recorder is not None:
+        recorder.end_episode(info["termination"])
+    result = {
+        "return": total_reward,
+        "length": steps,
+        "coins": coins,
+        "fuel": env.player.fuel,
+        "termination": info["termination"],
+    }
+    if telemetry is not None:
+        telemetry.record_episode(result, agent)
+    if learn:
+        agent.decay_epsilon()
+    return result
+
+
+def worker_epsilon(worker_id, num_workers, spread=1.0):
+    """
+    Starting exploration rate of a worker.
+
+    Rates are spread geometrically from EPSILON_START (worker 0) down to
+    EPSILON_START ** (1 + spread), so workers explore at different levels.
+    Each worker then decays its own rate with RLAgent.decay_epsilon.
+    """
+    fraction = worker_id / max(1, num_workers - 1)
+    return EPSILON_START ** (1 + spread * fraction)
+
+
+def _attach_table(shm, num_states, num_actions, dtype):
+    """View a shared-memory block as Q-value and visit arrays."""
+    values = np.ndarray((num_states, num_actions), dtype=dtype, buffer=shm.buf)
+    visits = np.ndarray((num_states,), dtype=np.uint32, buffer=shm.buf, offset=values.nbytes)
+    return values, visits
+
+
+def _worker_loop(shm, worker_id, num_workers, num_states, dtype, mode, episodes,
+                 sync_interval, epsilon_spread, seed, lock, config=DEFAULT_CONFIG):
+    """Run one worker's episodes against the shared table and return its stats."""
+    shared_values, shared_visits = _attach_table(shm, num_states, len(ACTIONS), dtype)
+    if mode == "hogwild":
+        # Lock-free: every worker updates the shared arrays directly
+        table = DenseQTable.from_arrays(shared_values, shared_visits)
+    else:
+        with lock:
+            table = DenseQTable.from_arrays(shared_values.copy(), shared_visits.copy())
+        base_values = table.values.copy()
+        base_visits = table.visits.copy()
+
+    # Separate agent and environment streams spawned from the worker seed
+    agent_seed, env_seed = np.random.SeedSequence(seed).spawn(2)
+    agent = RLAgent(backend=table, seed=agent_seed, config=config)
+    agent.epsilon = worker_epsilon(worker_id, num_workers, epsilon_spread)
+    env = SpaceAdventureEnv(seed=env_seed, config=config)
+
+    steps = 0
+    total_return = 0.0
+    for episode in range(1, episodes + 1):
+        result = run_episode(env, agent)
+        steps += result["length"]
+        total_return += result["return"]
+
+        if mode == "average" and (episode % sync_interval == 0 or episode == episodes):
+            # Merge this worker's share of the averaged update, then resync
+            with lock:
+                shared_values += ((table.values - base_values) / num_workers).astype(dtype)
+                shared_visits += table.visits - base_visits
+                table.values[:] = shared_values
+                table.visits[:] = shared_visits
+            base_values[:] = table.values
+            base_visits[:] = table.visits
+
+    return {
+        "worker": worker_id,
+        "episodes": episodes,
+        "steps": steps,
+        "mean_return": total_return / max(1, episodes),
+        "epsilon": agent.epsilon,
+    }
+
+
+def _train_worker(shm_name, results, *worker_args):
+    """Worker process entry point (see _worker_loop for worker_args)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    stats = _worker_loop(shm, *worker_args)
+    shm.close()
+    results.put(stats)
+
+
+class ParallelTrainer:
+    """
+    Train one Q-table with several worker processes.
+
+    Modes:
+        "hogwild": workers update the shared table without locking
+        "average": workers learn on private copies and every sync_interval
+            episodes add their averaged change to the shared table under a lock
+    """
+
+    MODES = ("hogwild", "average")
+
+    def __init__(self, num_workers=None, mode="hogwild", sync_interval=10,
+                 epsilon_spread=1.0, dtype=Q_TABLE_DTYPE, seed=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown training mode: {mode}")
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.mode = mode
+        self.sync_interval = sync_interval
+        self.epsilon_spread = epsilon_spread
+        self.dtype = np.dtype(dtype)
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2 ** 31)
+
+    def train(self, episodes_per_worker, agent=None):
+        """
+        Run the workers to completion.
+
+        Args:
+            episodes_per_worker: Number of episodes each worker plays
+            agent: Optional dense RLAgent whose table is used as the starting
+                point and receives the trained values; workers play with its config
+
+        Returns:
+            Tuple of (agent, stats) where stats summarizes throughput and the
+            per-worker results
+        """
+        agent = agent or RLAgent(dtype=self.dtype)
+        values = agent.q_values
+        shm = shared_memory.SharedMemory(create=True, size=values.nbytes + agent.table.visits.nbytes)
+        try:
+            shared_values, shared_visits = _attach_table(
+                shm, agent.num_states, len(ACTIONS), values.dtype)
+            shared_values[:] = values
+            shared_visits[:] = agent.table.visits
+
+            context = multiprocessing.get_context()
+            lock = context.Lock()
+            results = context.Queue()
+            workers = [
+                context.Process(target=_train_worker, args=(
+                    shm.name, results, worker_id, self.num_workers, agent.num_states,
+                    values.dtype, self.mode, episodes_per_worker, self.sync_interval,
+                    self.epsilon_spread, self.seed + worker_id, lock, agent.config))
+                for worker_id in range(self.num_workers)
+            ]
+
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            worker_stats = []
+            while len(worker_stats) < len(workers):
+                try:
+                    worker_stats.append(results.get(timeout=1.0))
+                except queue.Empty:
+                    if any(worker.exitcode not in (None, 0) for worker in workers):
+                        for worker in workers:
+                            worker.terminate()
+                        raise RuntimeError("A training worker exited with an error")
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+
+            values[:] = shared_values
+            agent.table.visits[:] = shared_visits
+            del shared_values, shared_visits
+        finally:
+            shm.close()
+            shm.unlink()
+
+        episodes = sum(stats["episodes"] for stats in worker_stats)
+        steps = sum(stats["steps"] for stats in worker_stats)
+        return agent, {
+            "mode": self.mode,
+            "num_workers": self.num_workers,
+            "episodes": episodes,
+            "steps": steps,
+            "elapsed": elapsed,
+            "episodes_per_sec": episodes / elapsed,
+            "steps_per_sec": steps / elapsed,
+            "workers": sorted(worker_stats, key=lambda stats: stats["worker"]),
+        }
@@ -0,0 +1,167 @@
+"""
+Vectorized batch environment for RL Space Adventure.
+
+All games are stored as struct-of-arrays NumPy buffers and stepped together,
+applying the same rules as SpaceAdventureEnv without per-entity Python objects.
+"""
+
+import numpy as np
+from .config import *
+
+
+class VectorSpaceAdventureEnv:
+    """
+    N independent games stepped in lockstep with NumPy.
+
+    State buffers (x in column 0, y in column 1):
+        player_pos: (N, 2) player positions
+        fuel: (N,) player fuel
+        coins: (N, MAX_COINS, 2) coin positions
+        enemies: (N, MAX_ENEMIES, 2) enemy positions
+
+    Finished games are reset automatically at the end of step().
+    """
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+        self.player_pos = np.empty((num_envs, 2), dtype=np.int64)
+        self.fuel = np.empty(num_envs, dtype=np.float64)
+        self.coins = np.empty((num_envs, MAX_COINS, 2), dtype=np.int64)
+        self.enemies = np.empty((num_envs, MAX_ENEMIES, 2), dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.episode_count = np.zeros(num_envs, dtype=np.int64)
+
+        self._grid_max = np.array([GRID_WIDTH - 1, GRID_HEIGHT - 1], dtype=np.int64)
+        self._grid_size = np.array([GRID_WIDTH, GRID_HEIGHT], dtype=np.int64)
+        self._actions = np.array(ACTIONS, dtype=np.int64)
+        self._moves = np.any(self._actions != 0, axis=1)
+
+        self.reset()
+
+    def _random_positions(self, shape):
+        """Draw uniformly random grid positions with the given leading shape."""
+        return self.rng.integers(0, self._grid_size, size=shape + (2,))
+
+    def _reset_envs(self, mask):
+        """Reset the games selected by a boolean mask."""
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+        self.player_pos[mask] = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+        self.fuel[mask] = 100.0
+        self.coins[mask] = self._random_positions((count, MAX_COINS))
+        self.enemies[mask] = self._random_positions((count, MAX_ENEMIES))
+
+    def reset(self):
+        """
+        Reset all games.
+
+        Returns:
+            Observation tuple (player_pos, fuel, coins, enemies)
+        """
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.get_observation()
+
+    def get_observation(self):
+        """
+        Get the current observation of all games.
+
+        Returns:
+            Tuple of (player_pos, fuel, coins, enemies) array views, matching
+            the arguments of RLAgent.get_states
+        """
+        return self.player_pos, self.fuel, self.coins, self.enemies
+
+    def _move_players(self, actions):
+        """Apply player movement and fuel consumption (see Player.move)."""
+        moving = self._moves[actions]
+        self.player_pos += self._actions[actions]
+        np.clip(self.player_pos, 0, self._grid_max, out=self.player_pos)
+        self.fuel[moving] = np.maximum(0, self.fuel[moving] - 0.1)
+
+    def update_enemies(self):
+        """Move each enemy toward its player with 50% probability."""
+        moving = self.rng.random(self.enemies.shape[:2]) < 0.5
+        step = np.sign(self.player_pos[:, None, :] - self.enemies)
+        self.enemies += step * moving[:, :, None]
+        np.clip(self.enemies, 0, self._grid_max, out=self.enemies)
+
+    def _respawn_coins(self, collected):
+        """
+        Respawn collected coins by rejection sampling.
+
+        New coins never overlap the player or another coin of the same game.
+        Only conflicting draws are redrawn, so the loop terminates quickly.
+        """
+        pending = collected
+        while True:
+            env_idx, coin_idx = np.nonzero(pending)
+            if len(env_idx) == 0:
+                return
+            self.coins[env_idx, coin_idx] = self._random_positions((len(env_idx),))
+
+            candidates = self.coins[env_idx, coin_idx]
+            on_player = np.all(candidates == self.player_pos[env_idx], axis=1)
+            same_cell = np.all(candidates[:, None, :] == self.coins[env_idx], axis=2)
+            same_cell[np.arange(len(env_idx)), coin_idx] = False
+            conflict = on_player | np.any(same_cell, axis=1)
+
+            pending = np.zeros_like(collected)
+            pending[env_idx[conflict], coin_idx[conflict]] = True
+
+    def check_collisions(self):
+        """
+        Check collisions for all games (see SpaceAdventureEnv.check_collisions).
+
+        Returns:
+            Tuple of (rewards, dones, info)
+        """
+        rewards = np.full(self.num_envs, FUEL_CONSUMPTION_REWARD, dtype=np.float64)
+
+        # Coin collection
+        collected = np.all(self.coins == self.player_pos[:, None, :], axis=2)
+        num_collected = np.count_nonzero(collected, axis=1)
+        scored = num_collected > 0
+        if np.any(scored):
+            rewards[scored] = COIN_COLLECTION_REWARD
+            self.score += num_collected
+            self.fuel[scored] = np.minimum(
+                100, self.fuel[scored] + FUEL_RESTORE_PER_COIN * num_collected[scored])
+            self._respawn_coins(collected)
+
+        # Enemy collision or fuel depletion
+        enemy_collision = np.any(np.all(self.enemies == self.player_pos[:, None, :], axis=2), axis=1)
+        fuel_depleted = self.fuel <= 0
+        rewards[fuel_depleted] = FUEL_DEPLETION_REWARD
+        rewards[enemy_collision] = ENEMY_COLLISION_REWARD
+        dones = enemy_collision | fuel_depleted
+
+        info = {
+            "coins": num_collected,
+            "enemy_collision": enemy_collision,
+            "fuel_depleted": fuel_depleted & ~enemy_collision,
+        }
+        return rewards, dones, info
+
+    def step(self, actions):
+        """
+        Advance every game by one step.
+
+        Args:
+            actions: (N,) array of indices into ACTIONS
+
+        Returns:
+            Tuple of (observation, rewards, dones, info). The observation of
+            a finished game is the first observation of its next episode.
+        """
+        self._move_players(np.asarray(actions))
+        self.update_enemies()
+        rewards, dones, info = self.check_collisions()
+
+        if np.any(dones):
+            self.episode_count += dones
+            self._reset_envs(dones)
+
+        return self.get_observation(), rewards, dones, info
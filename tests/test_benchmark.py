@@ -0,0 +1,69 @@
+"""
+Unit tests for the benchmark module.
+"""
+
+import json
+import pytest
+from src.rl_space_adventure import benchmark
+from src.rl_space_adventure.benchmark import compare, main, run_benchmarks
+from src.rl_space_adventure.config import *
+
+
+@pytest.fixture
+def tiny_sizes(monkeypatch):
+    """Shrink the benchmark operation counts so the suite runs instantly."""
+    for name in benchmark.SIZES:
+        monkeypatch.setitem(benchmark.SIZES, name, (4, 4))
+
+
+def make_report(**rates):
+    """Build a minimal report with the given metric rates."""
+    return {"results": {name: {"rate": rate, "unit": "ops/s"} for name, rate in rates.items()}}
+
+
+class TestBenchmark:
+    """Test cases for the benchmark suite."""
+
+    def test_scaled_metrics(self, tiny_sizes):
+        """Test each group reports a positive rate for every scale."""
+        report = run_benchmarks(["env", "agent", "training"], quick=True, repeats=1)
+        results = report["results"]
+
+        for max_coins, max_enemies in benchmark.ENTITY_SCALES:
+            assert results[f"env.step[coins={max_coins},enemies={max_enemies}]"]["rate"] > 0
+        for bins in benchmark.STATE_BIN_SCALES:
+            assert results[f"agent.update_q_value[bins={bins}]"]["rate"] > 0
+        assert results["training.run_episode"]["unit"] == "episodes/s"
+        assert report["meta"]["seed"] == benchmark.BENCHMARK_SEED
+
+    def test_compare_flags_regressions(self):
+        """Test only metrics slower than the tolerance allows are reported."""
+        baseline = make_report(fast=100.0, slow=100.0, dropped=100.0)
+        report = make_report(fast=90.0, slow=50.0)
+
+        regressions = compare(report, baseline, tolerance=0.25)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("slow:")
+        assert regressions[1] == "dropped: missing from the report"
+
+    def test_compare_skips_groups_not_run(self):
+        """Test metrics of groups left out of a run are not reported missing."""
+        baseline = make_report(kept=100.0, other=100.0)
+        baseline["results"]["kept"]["group"] = "env"
+        baseline["results"]["other"]["group"] = "agent"
+        report = {"meta": {"groups": ["env"]}, "results": {}}
+
+        assert compare(report, baseline) == ["kept: missing from the report"]
+
+    def test_baseline_regression_fails(self, tiny_sizes, tmp_path):
+        """Test the command exits non-zero when a baseline is not met."""
+        baseline = tmp_path / "baseline.json"
+        assert main(["--only", "training", "--repeats", "1", "--save-baseline", str(baseline)]) == 0
+
+        report = json.loads(baseline.read_text())
+        report["results"]["training.run_episode"]["rate"] *= 1000.0
+        baseline.write_text(json.dumps(report))
+
+        assert main(["--only", "training", "--repeats", "1",
+                     "--output", str(tmp_path / "run.json"), "--baseline", str(baseline)]) == 1
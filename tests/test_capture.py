@@ -0,0 +1,79 @@
+"""
+Unit tests for the capture module.
+"""
+
+import os
+import pytest
+import numpy as np
+from src.rl_space_adventure.capture import (
+    COIN_CHANNEL, ENEMY_CHANNEL, PLAYER_CHANNEL, FrameCapture, rasterize, rasterize_batch
+)
+from src.rl_space_adventure.vector_env import VectorSpaceAdventureEnv
+from src.rl_space_adventure.config import *
+
+
+class TestRasterize:
+    """Test cases for the grid rasterizers."""
+
+    def test_rasterize(self):
+        """Test entities are drawn into their channels at (row y, column x)."""
+        frame = rasterize((1, 2), [(3, 4), (5, 6)], [(7, 8)])
+
+        assert frame.shape == (GRID_HEIGHT, GRID_WIDTH, 3)
+        assert frame[2, 1, PLAYER_CHANNEL] == 255
+        assert frame[4, 3, COIN_CHANNEL] == frame[6, 5, COIN_CHANNEL] == 255
+        assert frame[8, 7, ENEMY_CHANNEL] == 255
+        assert np.count_nonzero(frame) == 4
+
+    def test_reuses_output_and_scales(self):
+        """Test drawing into an output array clears it, and cells scale up."""
+        out = np.full((GRID_HEIGHT, GRID_WIDTH, 3), 9, dtype=np.uint8)
+
+        assert rasterize((0, 0), [], [], out=out) is out
+        assert np.count_nonzero(out) == 1
+        scaled = rasterize((1, 0), [], [], cell_size=3)
+        assert scaled.shape == (3 * GRID_HEIGHT, 3 * GRID_WIDTH, 3)
+        assert scaled[0:3, 3:6, PLAYER_CHANNEL].min() == 255
+
+    def test_batch_matches_single(self):
+        """Test batch rasterization matches rasterizing each game."""
+        env = VectorSpaceAdventureEnv(8, seed=0)
+        frames = rasterize_batch(env.player_pos, env.coins, env.enemies)
+
+        for i in range(env.num_envs):
+            expected = rasterize(env.player_pos[i], env.coins[i].tolist(), env.enemies[i].tolist())
+            assert np.array_equal(frames[i], expected)
+
+
+class TestFrameCapture:
+    """Test cases for the FrameCapture class."""
+
+    def test_npz_batches(self, tmp_path):
+        """Test frames are copied on add and written batch by batch."""
+        frame = np.zeros((4, 5, 3), dtype=np.uint8)
+        with FrameCapture(str(tmp_path), frame.shape, "npz", batch_size=3) as capture:
+            for i in range(7):
+                frame[:] = i  # Reused buffer, like a renderer's pixel view
+                capture.add(frame)
+
+        names = sorted(os.listdir(tmp_path))
+        assert names == ["frame_00000000.npz", "frame_00000003.npz", "frame_00000006.npz"]
+        frames = np.concatenate([np.load(tmp_path / name)["frames"] for name in names])
+        assert frames[:, 0, 0, 0].tolist() == list(range(7))
+
+    def test_png_sequence(self, tmp_path):
+        """Test PNG capture writes one numbered image per frame."""
+        pygame = pytest.importorskip("pygame")
+        frame = rasterize((1, 2), [], [], cell_size=2)
+        with FrameCapture(str(tmp_path), frame.shape, prefix="ep", batch_size=2) as capture:
+            for _ in range(3):
+                capture.add(frame)
+
+        assert sorted(os.listdir(tmp_path)) == [f"ep_{i:08d}.png" for i in range(3)]
+        image = pygame.surfarray.array3d(pygame.image.load(str(tmp_path / "ep_00000002.png")))
+        assert np.array_equal(image.transpose(1, 0, 2), frame)
+
+    def test_rejects_unknown_format(self, tmp_path):
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError):
+            FrameCapture(str(tmp_path), (1, 1, 3), "gif")
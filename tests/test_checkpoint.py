@@ -0,0 +1,119 @@
+"""
+Unit tests for the checkpoint module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure import checkpoint
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.config import *
+
+
+class TestCheckpoint:
+    """Test cases for saving and loading Q-table checkpoints."""
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved table and epsilon are restored."""
+        path = str(tmp_path / "agent.qt")
+        agent = RLAgent()
+        agent.update_q_value(3, 1, 10.0, 4)
+        agent.epsilon = 0.05
+        agent.save(path)
+
+        loaded = RLAgent.load(path)
+
+        assert isinstance(loaded.q_values, np.memmap)
+        assert np.array_equal(loaded.q_values, agent.q_values)
+        assert loaded.epsilon == pytest.approx(0.05)
+        assert loaded.table.visits[3] == 1
+
+    def test_read_write_checkpoint_flushes_in_place(self, tmp_path):
+        """Test a read-write agent persists updates with flush()."""
+        path = str(tmp_path / "agent.qt")
+        RLAgent().save(path)
+
+        agent = RLAgent.load(path, mode="r+")
+        agent.update_q_value(7, 2, 10.0, 8)
+        agent.decay_epsilon()
+        agent.flush()
+
+        reader = RLAgent.load(path)
+        assert reader.q_values[7, 2] == pytest.approx(ALPHA * 10.0)
+        assert reader.epsilon == pytest.approx(agent.epsilon)
+
+    def test_header_validation(self, tmp_path):
+        """Test checkpoints from a different configuration are rejected."""
+        path = str(tmp_path / "agent.qt")
+        RLAgent().save(path)
+        header = checkpoint.read_header(path)
+        header["state_bins"] = STATE_BINS + 1
+        with open(path, "r+b") as file:
+            checkpoint.write_header(file, header)
+
+        with pytest.raises(ValueError):
+            RLAgent.load(path)
+
+    def test_grid_size_validation(self, tmp_path):
+        """Test checkpoints and policies only load into a config with their grid size."""
+        path = str(tmp_path / "agent.qt")
+        policy_path = str(tmp_path / "agent.policy")
+        small = DEFAULT_CONFIG.replace(grid_width=10, grid_height=10)
+        RLAgent(config=small).save(path)
+        RLAgent(config=small).save_policy(policy_path)
+
+        assert RLAgent.load(path, config=small).grid_width == 10
+        assert RLAgent.load_policy(policy_path, config=small).grid_width == 10
+        with pytest.raises(ValueError):
+            RLAgent.load(path)
+        with pytest.raises(ValueError):
+            RLAgent.load_policy(policy_path)
+
+    def test_header_without_grid(self, tmp_path):
+        """Test checkpoints written before grids were configurable load on the default grid."""
+        path = str(tmp_path / "agent.qt")
+        RLAgent().save(path)
+        header = checkpoint.read_header(path)
+        del header["grid"]
+        with open(path, "r+b") as file:
+            checkpoint.write_header(file, header)
+
+        RLAgent.load(path)
+        with pytest.raises(ValueError):
+            RLAgent.load(path, config=DEFAULT_CONFIG.replace(grid_width=10))
+
+    def test_custom_state_bins(self, tmp_path):
+        """Test the discretization an agent was built with round-trips through a checkpoint."""
+        path = str(tmp_path / "agent.qt")
+        RLAgent(state_bins=2).save(path)
+
+        agent = RLAgent.load(path, state_bins=2)
+
+        assert agent.num_states == 2 ** 6 * FUEL_BINS
+        with pytest.raises(ValueError):
+            RLAgent.load(path)
+
+    def test_policy_file(self, tmp_path):
+        """Test an exported greedy policy loads as a small inference-only agent."""
+        path = str(tmp_path / "agent.policy")
+        agent = RLAgent()
+        agent.update_q_value(3, 2, 10.0, 4)
+        agent.save_policy(path)
+
+        policy_agent = RLAgent.load_policy(path)
+
+        assert policy_agent.table is None
+        assert policy_agent.policy.nbytes == agent.num_states
+        assert policy_agent.choose_action(3) == 2
+        with pytest.raises(ValueError):
+            RLAgent.load(path)
+
+    def test_flusher(self, tmp_path):
+        """Test the background flusher writes a final flush on stop."""
+        path = str(tmp_path / "agent.qt")
+        RLAgent().save(path)
+        agent = RLAgent.load(path, mode="r+")
+
+        with checkpoint.CheckpointFlusher(agent, interval=60.0):
+            agent.epsilon = 0.123
+
+        assert checkpoint.read_header(path)["epsilon"] == pytest.approx(0.123)
@@ -0,0 +1,65 @@
+"""
+Unit tests for the per-instance GameConfig.
+"""
+
+import pytest
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+class TestGameConfig:
+    """Test cases for the GameConfig class."""
+
+    def test_defaults_match_constants(self):
+        """Test the default config is the module constants."""
+        assert DEFAULT_CONFIG.grid_width == GRID_WIDTH
+        assert DEFAULT_CONFIG.alpha == ALPHA
+        assert (DEFAULT_CONFIG.width, DEFAULT_CONFIG.height) == (WIDTH, HEIGHT)
+
+    def test_replace_and_round_trip(self):
+        """Test configs are immutable values that copy with overrides."""
+        config = DEFAULT_CONFIG.replace(gamma=0.5)
+
+        assert config.gamma == 0.5 and DEFAULT_CONFIG.gamma == GAMMA
+        assert GameConfig.from_dict(config.to_dict()) == config
+        with pytest.raises(TypeError):
+            GameConfig.from_dict({"not_a_field": 1})
+
+    def test_env_uses_config(self):
+        """Test the environment's grid, entity counts and rewards come from its config."""
+        config = GameConfig(grid_width=6, grid_height=5, max_coins=1, max_enemies=0,
+                            fuel_consumption_reward=-1.0)
+        env = SpaceAdventureEnv(seed=0, config=config)
+        env.set_coins([(0, 0)])
+
+        _, reward, _, _ = env.step(ACTIONS.index((0, 1)))
+        for _ in range(10):
+            env.step(ACTIONS.index((1, 0)))
+            env.step(ACTIONS.index((0, 1)))
+
+        assert env.player.position == (5, 4)
+        assert len(env.coins) == 1 and not env.enemies
+        assert reward == -1.0
+
+    def test_agent_uses_config(self):
+        """Test the agent's table shape and learning rates come from its config."""
+        config = GameConfig(state_bins=2, fuel_bins=2, alpha=0.5, gamma=0.0)
+        agent = RLAgent(config=config)
+        agent.update_q_value(0, 1, 10.0, 1)
+
+        assert agent.num_states == 2 ** 6 * 2
+        assert agent.q_values[0, 1] == pytest.approx(5.0)
+
+    def test_configs_coexist(self):
+        """Test two configurations train side by side in one process."""
+        small = GameConfig(grid_width=8, grid_height=8, state_bins=2)
+        agents = [RLAgent(seed=0, config=config) for config in (small, DEFAULT_CONFIG)]
+        envs = [SpaceAdventureEnv(seed=0, config=config) for config in (small, DEFAULT_CONFIG)]
+
+        for agent, env in zip(agents, envs):
+            run_episode(env, agent, max_steps=50)
+
+        assert agents[0].q_values.shape[0] < agents[1].q_values.shape[0]
+        assert max(max(pos) for pos in envs[0].coin_positions) < 8
@@ -0,0 +1,136 @@
+"""
+Unit tests for the headless environment module.
+"""
+
+import pytest
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.config import *
+
+
+class TestSpaceAdventureEnv:
+    """Test cases for the SpaceAdventureEnv class."""
+
+    def test_reset(self):
+        """Test reset places entities and returns an observation."""
+        env = SpaceAdventureEnv(seed=0)
+        player_pos, fuel, coins, enemies = env.reset()
+
+        assert player_pos == (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+        assert fuel == 100.0
+        assert len(coins) == MAX_COINS
+        assert len(enemies) == MAX_ENEMIES
+
+    def test_step_consumes_fuel(self):
+        """Test moving consumes fuel and staying does not."""
+        env = SpaceAdventureEnv(seed=0)
+        env.set_coins([])
+        env.set_enemies([])
+
+        observation, _, _, _ = env.step(0)
+        assert observation[1] == 100.0
+
+        observation, _, _, _ = env.step(1)
+        assert observation[1] == pytest.approx(99.9)
+
+    def test_coin_collection(self):
+        """Test collecting a coin rewards, refuels and respawns it."""
+        env = SpaceAdventureEnv(seed=0)
+        env.set_enemies([])
+        env.player.fuel = 50.0
+        env.set_coins([(env.player.x + 1, env.player.y)])
+
+        observation, reward, done, info = env.step(ACTIONS.index((1, 0)))
+
+        assert reward == COIN_COLLECTION_REWARD
+        assert not done
+        assert info["coins"] == 1
+        assert env.score == 1
+        assert observation[1] == pytest.approx(50.0 - 0.1 + FUEL_RESTORE_PER_COIN)
+        assert len(env.coins) == 1
+        assert env.player.position not in observation[2]
+
+    def test_enemy_collision_ends_episode(self):
+        """Test colliding with an enemy terminates the episode."""
+        env = SpaceAdventureEnv(seed=0)
+        env.set_enemies([env.player.position])
+
+        _, reward, done, info = env.step(0)
+
+        assert done
+        assert reward == ENEMY_COLLISION_REWARD
+        assert info["termination"] == "enemy"
+        assert env.episode_count == 1
+
+    def test_fuel_depletion_ends_episode(self):
+        """Test running out of fuel terminates the episode."""
+        env = SpaceAdventureEnv(seed=0)
+        env.set_enemies([])
+        env.player.fuel = 0.05
+
+        _, reward, done, info = env.step(1)
+
+        assert done
+        assert reward == FUEL_DEPLETION_REWARD
+        assert info["termination"] == "fuel"
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test two environments with the same seed produce the same episode."""
+        first, second = SpaceAdventureEnv(seed=42), SpaceAdventureEnv(seed=42)
+        for step in range(50):
+            assert first.step(step % len(ACTIONS)) == second.step(step % len(ACTIONS))
+
+    def test_does_not_import_pygame(self):
+        """Test the environment module is usable without pygame."""
+        import src.rl_space_adventure.env as env_module
+        assert "pygame" not in vars(env_module)
+
+    def test_coins_never_overlap(self):
+        """Test coins always occupy distinct cells away from the player."""
+        env = SpaceAdventureEnv(seed=3, max_coins=GRID_WIDTH * GRID_HEIGHT // 2)
+        for step in range(200):
+            observation, _, done, _ = env.step(step % len(ACTIONS))
+            if done:
+                observation = env.reset()
+            player_pos, _, coins, _ = observation
+            assert len(set(coins)) == len(coins)
+            assert player_pos not in coins
+
+    def test_position_views_track_entities(self):
+        """Test the live position lists follow moves and respawns in place."""
+        env = SpaceAdventureEnv(seed=4)
+        coin_positions, enemy_positions = env.coin_positions, env.enemy_positions
+        for step in range(100):
+            _, _, done, _ = env.step(step % len(ACTIONS))
+            if done:
+                break
+            assert env.coin_positions is coin_positions
+            assert enemy_positions == [enemy.position for enemy in env.enemies]
+            assert coin_positions == [coin.position for coin in env.coins]
+
+    def test_version_changes_only_with_observation(self):
+        """Test the observation version is bumped only when something moves."""
+        env = SpaceAdventureEnv(seed=0)
+        env.set_coins([(0, 0)])
+        env.set_enemies([])
+        version = env.version
+
+        env.step(0)
+        assert env.version == version
+
+        env.step(1)
+        assert env.version > version
+
+    def test_step_without_observation(self):
+        """Test skipping the observation copy leaves the dynamics unchanged."""
+        observed = SpaceAdventureEnv(seed=3)
+        unobserved = SpaceAdventureEnv(seed=3)
+
+        for step in range(20):
+            observation, reward, done, _ = observed.step(step % len(ACTIONS))
+            nothing, other_reward, other_done, _ = unobserved.step(step % len(ACTIONS),
+                                                                   observe=False)
+            assert nothing is None
+            assert (reward, done) == (other_reward, other_done)
+            assert observation == unobserved.get_observation()
+            if done:
+                break
@@ -0,0 +1,94 @@
+"""
+Unit tests for the evaluation module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.evaluation import (
+    EVALUATION_METRICS, evaluate, load_greedy_agent, summarize
+)
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+@pytest.fixture
+def trained_paths(tmp_path):
+    """Checkpoint and policy file of a briefly trained agent."""
+    agent = RLAgent()
+    env = SpaceAdventureEnv(seed=0)
+    for _ in range(20):
+        run_episode(env, agent)
+    checkpoint_path = str(tmp_path / "agent.qt")
+    policy_path = str(tmp_path / "agent.policy")
+    agent.save(checkpoint_path)
+    agent.save_policy(policy_path)
+    return checkpoint_path, policy_path
+
+
+class TestEvaluation:
+    """Test cases for policy evaluation."""
+
+    def test_summarize(self):
+        """Test summaries report means, intervals and termination counts."""
+        results = [
+            {"coins": coins, "return": 0.0, "length": 10, "fuel": 50.0, "termination": cause}
+            for coins, cause in [(0, "enemy"), (2, "enemy"), (4, None), (6, "fuel")]
+        ]
+
+        summary = summarize(results)
+
+        assert summary["episodes"] == 4
+        assert summary["terminations"] == {"enemy": 2, "max_steps": 1, "fuel": 1}
+        assert summary["coins"]["mean"] == pytest.approx(3.0)
+        low, high = summary["coins"]["ci95"]
+        assert low < 3.0 < high
+        assert summary["length"]["std"] == 0.0
+
+    def test_summarize_no_episodes(self):
+        """Test an empty evaluation summarizes without statistics."""
+        summary = summarize([])
+
+        assert summary["episodes"] == 0
+        assert summary["terminations"] == {}
+        assert all(summary[metric] is None for metric in EVALUATION_METRICS)
+
+    def test_loaded_agents_are_greedy(self, trained_paths):
+        """Test checkpoints and policy files load as the same greedy policy."""
+        from_checkpoint = load_greedy_agent(trained_paths[0])
+        from_policy = load_greedy_agent(trained_paths[1])
+
+        assert from_checkpoint.epsilon == from_policy.epsilon == 0.0
+        assert np.array_equal(from_checkpoint.policy, from_policy.policy)
+
+    @pytest.mark.parametrize("policy", [False, True])
+    def test_loads_non_default_config(self, tmp_path, policy):
+        """Test agents trained with other bins and grid evaluate with their config."""
+        config = DEFAULT_CONFIG.replace(state_bins=3, fuel_bins=2, grid_width=12,
+                                        grid_height=9)
+        agent = RLAgent(config=config)
+        run_episode(SpaceAdventureEnv(seed=0, config=config), agent)
+        path = str(tmp_path / "agent.qt")
+        if policy:
+            agent.save_policy(path)
+        else:
+            agent.save(path)
+
+        loaded = load_greedy_agent(path)
+        assert loaded.config == config
+        summary, _ = evaluate(path, episodes=3, workers=0)
+        assert summary["episodes"] == 3
+
+    def test_results_independent_of_workers(self, trained_paths):
+        """Test pooled evaluation streams every episode and matches a serial run."""
+        streamed = []
+        summary, results = evaluate(trained_paths[0], episodes=20, workers=2, seed=5,
+                                    chunk_size=3, on_results=streamed.extend)
+        serial_summary, serial_results = evaluate(trained_paths[1], episodes=20, workers=0,
+                                                  seed=5)
+
+        assert len(streamed) == summary["episodes"] == 20
+        assert [result["seed"] for result in results] == list(range(5, 25))
+        assert results == serial_results
+        assert summary == serial_summary
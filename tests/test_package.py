@@ -0,0 +1,37 @@
+"""
+Unit tests for the package's lazy imports.
+"""
+
+import subprocess
+import sys
+import pytest
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and list the modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sorted(sys.modules)))"],
+        capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class TestLazyImports:
+    """Test cases for lazy attribute loading in the package."""
+
+    def test_headless_imports_skip_pygame(self):
+        """Test importing the agent and environment never loads pygame."""
+        modules = imported_modules(
+            "from src.rl_space_adventure import RLAgent, SpaceAdventureEnv, WIDTH")
+
+        assert "pygame" not in modules
+        assert "src.rl_space_adventure.game" not in modules
+
+    def test_attributes_load_on_access(self):
+        """Test public classes resolve on first access and unknown names fail."""
+        import src.rl_space_adventure as package
+        from src.rl_space_adventure.rendering import Renderer
+
+        assert package.Renderer is Renderer
+        assert "SpaceAdventureGame" in dir(package)
+        with pytest.raises(AttributeError):
+            package.NoSuchThing
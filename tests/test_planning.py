@@ -0,0 +1,104 @@
+"""
+Unit tests for the planning module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.planning import Planner, TabularModel
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+def observe_chain(planner, length):
+    """Observe a chain of states 0 -> 1 -> ... -> length rewarded only at the end."""
+    for state in range(length):
+        reward = COIN_COLLECTION_REWARD if state == length - 1 else 0.0
+        planner.observe(state, 1, reward, state + 1, state == length - 1)
+
+
+class TestTabularModel:
+    """Test cases for the TabularModel class."""
+
+    def test_predecessors_follow_latest_outcome(self):
+        """Test a pair is re-indexed when its observed outcome changes."""
+        model = TabularModel(10, len(ACTIONS))
+        key = model.update(3, 2, 1.0, 4, False)
+        model.update(3, 2, 1.0, 5, False)
+
+        assert model.predecessors_of([4]).tolist() == []
+        assert model.predecessors_of([5]).tolist() == [key]
+        assert len(model) == 1
+
+    def test_grows_with_observed_pairs(self):
+        """Test storage follows the observed pairs, not the state space."""
+        model = TabularModel(10 ** 12, len(ACTIONS), capacity=2)
+        slots = [model.update(10 ** 11 + i, i % len(ACTIONS), float(i), i, False)
+                 for i in range(5)]
+
+        assert slots == list(range(5))
+        assert model.capacity == 8
+        assert model.states[4] == 10 ** 11 + 4
+        assert model.rewards[:5].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+class TestPlanner:
+    """Test cases for the Planner class."""
+
+    def test_sweeping_propagates_reward_backwards(self):
+        """Test prioritized sweeping carries a terminal reward to the chain start."""
+        agent = RLAgent()
+        planner = Planner(agent, mode="sweeping", budget=200, batch_size=4)
+        observe_chain(planner, 5)
+
+        planner.plan()
+
+        assert all(agent.q_values[state, 1] > 0 for state in range(5))
+        assert agent.q_values[4, 1] > agent.q_values[0, 1]
+
+    def test_sweeping_stops_when_converged(self):
+        """Test planning ends early once no TD error exceeds the threshold."""
+        agent = RLAgent()
+        planner = Planner(agent, mode="sweeping", budget=10 ** 6, threshold=0.1)
+        observe_chain(planner, 3)
+
+        performed = planner.plan()
+
+        assert 0 < performed < 10 ** 6
+        assert not planner.queue
+
+    def test_dyna_uses_full_budget(self):
+        """Test Dyna-Q backs up the requested number of sampled pairs."""
+        agent = RLAgent()
+        planner = Planner(agent, mode="dyna", budget=50, batch_size=16, seed=0)
+        assert planner.plan() == 0
+        observe_chain(planner, 3)
+
+        assert planner.plan() == 50
+        assert agent.q_values[2, 1] > 0
+
+    def test_sparse_backend(self):
+        """Test planning on a sparse table of a huge state space stays small."""
+        agent = RLAgent(backend="sparse", state_bins=16)
+        planner = Planner(agent, mode="sweeping", budget=200, batch_size=4)
+        observe_chain(planner, 5)
+
+        planner.plan()
+
+        assert agent.table.rows(np.arange(5))[:, 1].min() > 0
+        assert planner.model.nbytes + planner.priorities.nbytes < 1024 * 1024
+
+    def test_invalid_mode(self):
+        """Test unknown planning modes are rejected."""
+        with pytest.raises(ValueError):
+            Planner(RLAgent(), mode="mcts")
+
+    def test_run_episode_with_planner(self):
+        """Test a learning episode feeds the planner every transition."""
+        agent = RLAgent()
+        planner = Planner(agent, budget=5)
+        result = run_episode(SpaceAdventureEnv(seed=0), agent, planner=planner)
+
+        assert 0 < len(planner.model) <= result["length"]
+        assert planner.backups <= 5 * result["length"]
@@ -0,0 +1,42 @@
+"""
+Unit tests for the profiling module.
+"""
+
+import json
+import pytest
+from src.rl_space_adventure.profiling import Profiler
+
+
+class TestProfiler:
+    """Test cases for the Profiler class."""
+
+    def test_disabled_records_nothing(self):
+        """Test a disabled profiler keeps no samples."""
+        profiler = Profiler()
+        t = profiler.start()
+        profiler.lap("phase", t)
+
+        assert profiler.stats() == {}
+
+    def test_rolling_percentiles(self):
+        """Test percentiles are computed over the rolling window."""
+        profiler = Profiler(enabled=True, window=100)
+        for i in range(200):
+            profiler.lap("phase", profiler.start() - i * 1e-3)
+
+        stats = profiler.stats()["phase"]
+        assert stats["count"] == 200
+        assert stats["p50_ms"] == pytest.approx(149.5, abs=0.5)
+        assert stats["p99_ms"] == pytest.approx(198, abs=1)
+        assert stats["max_ms"] == pytest.approx(199, abs=0.5)
+
+    def test_dump(self, tmp_path):
+        """Test stats are dumped as JSON."""
+        profiler = Profiler(enabled=True)
+        profiler.lap("phase", profiler.start())
+        path = tmp_path / "profile.json"
+
+        profiler.dump(str(path))
+
+        assert set(json.loads(path.read_text())) == {"phase"}
+        assert profiler.summary_lines()[0].startswith("phase: ")
@@ -0,0 +1,180 @@
+"""
+Unit tests for the Q-table backend module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.qtable import (
+    DenseQTable, SparseQTable, TileCodingQTable, make_q_table
+)
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.planning import Planner
+from src.rl_space_adventure.config import *
+
+
+class TestSparseQTable:
+    """Test cases for the SparseQTable class."""
+
+    def test_unseen_states_read_as_zero(self):
+        """Test unseen states have zero values and are not stored."""
+        table = SparseQTable(10 ** 12, 5)
+
+        assert np.all(table.row(123456789) == 0)
+        assert table.size == 0
+
+    def test_writable_row_inserts_and_counts_visits(self):
+        """Test writing a row stores the state and counts visits."""
+        table = SparseQTable(10 ** 12, 5)
+
+        table.writable_row(42)[3] = 1.5
+        table.writable_row(42)[3] += 1.0
+
+        assert table.row(42)[3] == pytest.approx(2.5)
+        states, counts = table.visit_counts()
+        assert states.tolist() == [42]
+        assert counts.tolist() == [2]
+
+    def test_matches_dense_backend(self):
+        """Test batched updates give the same values as the dense backend."""
+        rng = np.random.default_rng(0)
+        dense = DenseQTable(1000, 5)
+        sparse = SparseQTable(1000, 5)
+        for _ in range(20):
+            states = rng.integers(0, 1000, size=64)
+            actions = rng.integers(0, 5, size=64)
+            deltas = rng.normal(size=64)
+            dense.add_at(states, actions, deltas)
+            sparse.add_at(states, actions, deltas)
+
+        probe = np.arange(1000)
+        assert np.allclose(sparse.rows(probe), dense.rows(probe))
+        assert sparse.stats()["visited_states"] == dense.stats()["visited_states"]
+
+    def test_memory_cap_and_eviction(self):
+        """Test the table stays within its memory cap by evicting rare states."""
+        table = SparseQTable(10 ** 12, 5, memory_limit=64 * 1024)
+        capacity = table.capacity
+
+        for state in range(3 * capacity):
+            table.writable_row(1000 + state)[0] = 1.0
+            if state % 10 == 0:
+                table.writable_row(7)
+
+        assert table.capacity == capacity
+        assert table.nbytes <= 64 * 1024
+        assert table.size <= table.max_size
+        assert table.evictions > 0
+        assert 7 in table.visit_counts()[0]
+
+
+class TestTileCodingQTable:
+    """Test cases for the TileCodingQTable class."""
+
+    def test_features_in_range_and_shared(self):
+        """Test every state activates one tile per tiling and group, shared with neighbours."""
+        table = TileCodingQTable((20, 20, 101), 5, groups=((0, 1), (2,)))
+        states = np.arange(table.num_states)
+
+        features = table.features(states)
+
+        assert features.shape == (table.num_states, table.num_active)
+        assert features.min() >= 0 and features.max() < table.num_features
+        near = np.intersect1d(features[0], features[7])
+        far = np.intersect1d(features[0], features[-1])
+        assert len(far) < len(near) < table.num_active
+
+    def test_add_moves_value_by_delta(self):
+        """Test a single update moves the state's value by the full delta."""
+        table = TileCodingQTable((20, 20), 5, groups=((0, 1),))
+
+        table.add(37, 2, 1.5)
+
+        assert table.row(37)[2] == pytest.approx(1.5)
+        assert 0 < table.row(38)[2] < 1.5
+        assert np.all(table.row(37)[[0, 1, 3, 4]] == 0)
+        with pytest.raises(TypeError):
+            table.writable_row(37)
+
+    def test_batched_updates_match_single(self):
+        """Test add_at and rows agree with repeated add and row calls."""
+        rng = np.random.default_rng(0)
+        single = TileCodingQTable((20, 20, 10), 5, groups=((0, 1), (2,)))
+        batched = TileCodingQTable((20, 20, 10), 5, groups=((0, 1), (2,)))
+        states = rng.integers(0, single.num_states, size=64)
+        states[1] = states[0]
+        actions = rng.integers(0, 5, size=64)
+        deltas = rng.normal(size=64)
+
+        for state, action, delta in zip(states, actions, deltas):
+            single.add(state, action, delta)
+        batched.add_at(states, actions, deltas)
+
+        np.testing.assert_allclose(batched.weights, single.weights, atol=1e-6)
+        np.testing.assert_array_equal(batched.visits, single.visits)
+        np.testing.assert_allclose(batched.rows(states),
+                                   [single.row(state) for state in states], atol=1e-6)
+
+
+class TestRLAgentBackends:
+    """Test cases for using RLAgent with different Q-table backends."""
+
+    def test_default_backend(self):
+        """Test the dense backend is used by default."""
+        assert isinstance(RLAgent().table, DenseQTable)
+
+    def test_sparse_agent_learns(self):
+        """Test the agent updates values through the sparse backend."""
+        agent = RLAgent(backend="sparse")
+        agent.epsilon = 0.0
+
+        for _ in range(10):
+            agent.update_q_value(5, 2, 10.0, 6)
+
+        assert agent.choose_action(5) == 2
+        assert agent.table.stats()["visited_states"] == 1
+        with pytest.raises(TypeError):
+            agent.q_values
+
+    def test_unknown_backend(self):
+        """Test unknown backend names are rejected."""
+        with pytest.raises(ValueError):
+            make_q_table("nope", 10, 5)
+
+    def test_tiles_agent_uses_raw_state(self):
+        """Test the tile coding agent encodes undiscretized, exact states."""
+        agent = RLAgent(backend="tiles")
+        rng = np.random.default_rng(0)
+        player_pos = rng.integers(0, GRID_WIDTH, size=(50, 2))
+        fuel = rng.uniform(0, 100, size=50)
+        coins = rng.integers(0, GRID_WIDTH, size=(50, MAX_COINS, 2))
+        enemies = rng.integers(0, GRID_WIDTH, size=(50, MAX_ENEMIES, 2))
+
+        states = agent.get_states(player_pos, fuel, coins, enemies)
+
+        assert agent.approximate and isinstance(agent.table, TileCodingQTable)
+        for i in range(50):
+            expected = agent.get_state(tuple(player_pos[i]), fuel[i],
+                                       [tuple(c) for c in coins[i]],
+                                       [tuple(e) for e in enemies[i]])
+            assert states[i] == expected
+        px, py, fuel_level, cdx, cdy, _, _ = agent.decode_state(
+            agent.get_state((3, 4), 57.5, [(5, 1)], [(3, 4)]))
+        assert (px, py, fuel_level) == (3, 4, 57)
+        assert (cdx - (GRID_WIDTH - 1), cdy - (GRID_HEIGHT - 1)) == (2, -3)
+
+    def test_tiles_agent_learns(self):
+        """Test the tile coding agent learns through single and batched updates."""
+        agent = RLAgent(backend="tiles")
+        agent.epsilon = 0.0
+
+        for _ in range(10):
+            agent.update_q_value(5, 2, 10.0, 6)
+        agent.update_q_values(np.array([5, 5]), np.array([2, 2]),
+                              np.array([10.0, 10.0]), np.array([6, 6]))
+
+        assert agent.choose_action(5) == 2
+        assert agent.choose_actions(np.array([5]))[0] == 2
+        with pytest.raises(TypeError):
+            agent.cache_policy()
+        with pytest.raises(TypeError):
+            Planner(agent)
@@ -0,0 +1,179 @@
+"""
+Unit tests for the recording module.
+"""
+
+import os
+import pytest
+import numpy as np
+from src.rl_space_adventure.recording import (
+    NO_ACTION, TrajectoryLog, TrajectoryPlayer, TrajectoryRecorder, export
+)
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+def snapshot(env):
+    """Frame fields of the environment's current state."""
+    return (env.player.position, list(env.coin_positions), list(env.enemy_positions),
+            env.score, pytest.approx(env.player.fuel))
+
+
+class FakeRenderer:
+    """Renderer stand-in recording render_frame arguments."""
+
+    def __init__(self):
+        self.frames = []
+
+    def render_frame(self, *args, **kwargs):
+        self.frames.append(args)
+
+
+class TestTrajectoryRecording:
+    """Test cases for recording and reading trajectory logs."""
+
+    def test_frames_match_episode(self, tmp_path):
+        """Test every recorded step reads back as the state the env was in."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=4)
+        agent = RLAgent(seed=4)
+        expected = []
+        with TrajectoryRecorder(path, buffer_steps=8) as recorder:
+            env.reset()
+            recorder.begin_episode(env, seed=4)
+            expected.append(snapshot(env))
+            for _ in range(50):
+                action = agent.choose_action(agent.get_state(*env.get_indexed_observation()))
+                _, reward, done, info = env.step(action)
+                recorder.record_step(env, action, reward)
+                expected.append(snapshot(env))
+                if done:
+                    break
+            recorder.end_episode(info["termination"])
+
+        log = TrajectoryLog(path)
+        info = log.episode_info(0)
+        assert len(log) == 1
+        assert info["seed"] == 4 and info["length"] == len(expected) - 1
+        assert log.frame(0, 0)[5] == NO_ACTION
+        for step, state in enumerate(expected):
+            assert log.frame(0, step)[:5] == state
+
+    def test_index_seeks_episodes(self, tmp_path):
+        """Test the index locates each episode recorded by run_episode."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=0)
+        agent = RLAgent(seed=0)
+        with TrajectoryRecorder(path) as recorder:
+            results = [run_episode(env, agent, max_steps=30, recorder=recorder)
+                       for _ in range(5)]
+
+        log = TrajectoryLog(path)
+        assert len(log) == 5
+        for episode, result in enumerate(results):
+            records = log.episode(episode)
+            assert log.episode_info(episode)["length"] == result["length"]
+            assert log.episode_info(episode)["termination"] == result["termination"]
+            assert records["reward"][1:].sum() == pytest.approx(result["return"], abs=1e-3)
+            assert records["action"][0] == NO_ACTION
+        assert isinstance(log.records, np.memmap)
+
+    def test_seed_replays_episode(self, tmp_path):
+        """Test the logged seed of a run_episode episode reproduces its reset state."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=6)
+        with TrajectoryRecorder(path) as recorder:
+            for _ in range(3):
+                run_episode(env, RLAgent(seed=6), max_steps=10, recorder=recorder)
+
+        log = TrajectoryLog(path)
+        seeds = [log.episode_info(episode)["seed"] for episode in range(len(log))]
+        assert min(seeds) >= 0 and len(set(seeds)) == 3
+        replay = SpaceAdventureEnv(seed=0)
+        replay.reset(seeds[2])
+        assert log.frame(2, 0)[:5] == snapshot(replay)
+
+    def test_reopen_appends_and_drops_unfinished(self, tmp_path):
+        """Test reopening a log appends after its last finished episode."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=1)
+        agent = RLAgent(seed=1)
+        with TrajectoryRecorder(path) as recorder:
+            run_episode(env, agent, max_steps=10, recorder=recorder)
+            env.reset()
+            recorder.begin_episode(env)  # Never finished
+        with TrajectoryRecorder(path) as recorder:
+            run_episode(env, agent, max_steps=10, recorder=recorder)
+
+        log = TrajectoryLog(path)
+        assert len(log) == 2
+        assert len(log.records) == log.index["start"][1] + log.index["length"][1] + 1
+
+    def test_new_log_truncates_stale_index(self, tmp_path):
+        """Test a new log does not inherit index entries left from an earlier one."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=5)
+        agent = RLAgent(seed=5)
+        with TrajectoryRecorder(path) as recorder:
+            for _ in range(3):
+                run_episode(env, agent, max_steps=10, recorder=recorder)
+        os.remove(path)  # The index is left behind
+
+        with TrajectoryRecorder(path) as recorder:
+            result = run_episode(env, agent, max_steps=10, recorder=recorder)
+
+        log = TrajectoryLog(path)
+        assert len(log) == 1
+        assert log.episode_info(0)["length"] == result["length"]
+
+    def test_layout_mismatch_rejected(self, tmp_path):
+        """Test environments and logs with different entity counts are rejected."""
+        path = str(tmp_path / "run.log")
+        TrajectoryRecorder(path).close()
+
+        with pytest.raises(ValueError):
+            TrajectoryRecorder(path, num_coins=MAX_COINS + 1)
+        with TrajectoryRecorder(path) as recorder:
+            with pytest.raises(ValueError):
+                recorder.begin_episode(SpaceAdventureEnv(max_coins=MAX_COINS + 1))
+
+
+class TestTrajectoryPlayer:
+    """Test cases for replaying trajectory logs."""
+
+    def test_seek_and_advance(self, tmp_path):
+        """Test seeking clamps to the log and playback crosses episodes."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=2)
+        agent = RLAgent(seed=2)
+        with TrajectoryRecorder(path) as recorder:
+            for _ in range(2):
+                run_episode(env, agent, max_steps=5, recorder=recorder)
+        renderer = FakeRenderer()
+        player = TrajectoryPlayer(TrajectoryLog(path), renderer)
+
+        player.seek(0, 99)
+        assert player.step == player.log.episode_info(0)["length"]
+        player.advance()
+        assert (player.episode, player.step) == (1, 0)
+        player.seek(7)
+        assert player.episode == 1
+        player.render()
+        assert renderer.frames[-1][:3] == player.log.frame(1, 0)[:3]
+
+    def test_export_frames(self, tmp_path):
+        """Test exporting renders every step of the chosen episodes offscreen."""
+        path = str(tmp_path / "run.log")
+        env = SpaceAdventureEnv(seed=3)
+        agent = RLAgent(seed=3)
+        with TrajectoryRecorder(path) as recorder:
+            for _ in range(2):
+                run_episode(env, agent, max_steps=4, recorder=recorder)
+        log = TrajectoryLog(path)
+
+        frames = export(path, str(tmp_path / "frames"), episodes=[1], format="npz", hud=False)
+
+        archive = np.load(tmp_path / "frames" / "episode_000001_00000000.npz")["frames"]
+        assert frames == len(archive) == log.episode_info(1)["length"] + 1
+        assert archive.shape[1:] == (HEIGHT, WIDTH, 3)
@@ -0,0 +1,137 @@
+"""
+Unit tests for the rendering module, run headless with SDL's dummy driver.
+"""
+
+import json
+import os
+import pytest
+import pygame
+from src.rl_space_adventure import rendering
+from src.rl_space_adventure.rendering import (
+    Renderer, RetainedRenderer, OffscreenRenderer, load_font
+)
+from src.rl_space_adventure.config import *
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.fixture
+def screen():
+    """Headless display surface."""
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.quit()
+
+
+class TestRetainedRenderer:
+    """Test cases for the RetainedRenderer class."""
+
+    def test_matches_immediate_renderer(self, screen):
+        """Test retained rendering draws the same sprites as the immediate renderer."""
+        font = pygame.font.Font(None, 24)
+        frame = ((10, 10), [(3, 4), (15, 2)], [(18, 18)], 3, False, 80.0, 2)
+
+        Renderer(screen, font).render_frame(*frame)
+        expected = pygame.surfarray.array3d(screen)
+        RetainedRenderer(screen, font).render_frame(*frame)
+        actual = pygame.surfarray.array3d(screen)
+
+        assert (expected != actual).any(axis=2).mean() < 0.001
+
+    def test_dirty_rects_restore_background(self, screen):
+        """Test sprites from the previous frame are erased."""
+        renderer = RetainedRenderer(screen, pygame.font.Font(None, 24))
+        renderer.render_frame((10, 10), [(15, 15)], [], 0, False, 100.0, 0)
+        renderer.render_frame((10, 10), [(15, 16)], [], 0, False, 100.0, 0)
+
+        center = (15 * GRID_SIZE + GRID_SIZE // 2, 15 * GRID_SIZE + GRID_SIZE // 2)
+        assert screen.get_at(center) == renderer.background.get_at(center)
+        assert not renderer.full_redraw
+
+    def test_text_cache(self, screen):
+        """Test HUD text surfaces are reused for unchanged values."""
+        renderer = RetainedRenderer(screen, pygame.font.Font(None, 24))
+
+        assert renderer.render_text("Score: 1") is renderer.render_text("Score: 1")
+        assert renderer.render_text("Score: 1") is not renderer.render_text("Score: 2")
+
+
+class TestOffscreenRenderer:
+    """Test cases for the OffscreenRenderer class."""
+
+    def test_matches_screen_rendering(self, screen):
+        """Test offscreen frames match frames drawn to the display."""
+        font = pygame.font.Font(None, 24)
+        frame = ((10, 10), [(3, 4), (15, 2)], [(18, 18)], 3, False, 80.0, 2)
+        RetainedRenderer(screen, font).render_frame(*frame)
+        renderer = OffscreenRenderer(font)
+        renderer.render_frame(*frame)
+
+        expected = pygame.surfarray.array3d(screen).transpose(1, 0, 2)
+        assert (renderer.pixels() != expected).any(axis=2).mean() < 0.001
+
+    def test_pixels_is_view(self):
+        """Test pixels() shares memory with the surface and needs no display."""
+        pygame.display.init()
+        renderer = OffscreenRenderer(hud=False)
+        renderer.render_frame((2, 3), [], [], 0, False, 100.0, 0)
+        pixels = renderer.pixels()
+        pixels[0, 0] = (1, 2, 3)
+        del pixels
+
+        assert tuple(renderer.screen.get_at((0, 0)))[:3] == (1, 2, 3)
+        assert pygame.display.get_surface() is None
+
+    def test_hud_needs_font(self):
+        """Test drawing the HUD without a font is rejected."""
+        with pytest.raises(ValueError):
+            OffscreenRenderer()
+
+
+class TestLoadFont:
+    """Test cases for the cached font lookup."""
+
+    def test_lookup_is_cached(self, screen, tmp_path, monkeypatch):
+        """Test resolved paths are memoized and persisted for later runs."""
+        cache_file = tmp_path / "fonts.json"
+        font_path = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+        monkeypatch.setattr(rendering, "FONT_CACHE_FILE", str(cache_file))
+        monkeypatch.setattr(pygame.font, "match_font", lambda name: font_path)
+        rendering._font_path.cache_clear()
+        try:
+            load_font("some-font", 24)
+            monkeypatch.setattr(pygame.font, "match_font", lambda name: None)
+
+            assert load_font("some-font", 24).get_height() > 0
+            assert json.loads(cache_file.read_text()) == {"some-font": font_path}
+        finally:
+            rendering._font_path.cache_clear()
+
+    def test_missing_font_is_not_cached(self, screen, tmp_path, monkeypatch):
+        """Test a font that is not installed is looked up again on the next run."""
+        cache_file = tmp_path / "fonts.json"
+        cache_file.write_text(json.dumps({"late-font": ""}))  # Miss cached by an older version
+        monkeypatch.setattr(rendering, "FONT_CACHE_FILE", str(cache_file))
+        rendering._font_path.cache_clear()
+        try:
+            load_font("no-such-font-name", 24)
+            assert json.loads(cache_file.read_text()) == {"late-font": ""}
+
+            font_path = os.path.join(os.path.dirname(pygame.__file__),
+                                     pygame.font.get_default_font())
+            monkeypatch.setattr(pygame.font, "match_font", lambda name: font_path)
+            load_font("late-font", 24)
+            assert json.loads(cache_file.read_text()) == {"late-font": font_path}
+        finally:
+            rendering._font_path.cache_clear()
+
+    def test_survives_pygame_quit(self, screen):
+        """Test fonts loaded after pygame.quit() are not freed ones."""
+        load_font(FONT_NAME, FONT_SIZE)
+        pygame.quit()
+        pygame.display.init()
+        pygame.font.init()
+
+        font = load_font(FONT_NAME, FONT_SIZE)
+        assert font.render("Score: 0", True, WHITE).get_width() > 0
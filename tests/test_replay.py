@@ -0,0 +1,151 @@
+"""
+Unit tests for the replay module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.replay import ReplayBuffer, SumTree
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+class TestSumTree:
+    """Test cases for the SumTree class."""
+
+    def test_find_matches_cumulative_sum(self):
+        """Test tree search picks the same leaves as a cumulative-sum search."""
+        rng = np.random.default_rng(0)
+        tree = SumTree(100)
+        tree.values[:100] = rng.uniform(0, 5, size=100)
+        tree.values[[10, 11, 50]] = 0.0
+        tree.rebuild()
+        values = rng.random(500) * tree.total
+
+        expected = np.searchsorted(np.cumsum(tree.values[:100]), values, side="right")
+
+        assert tree.total == pytest.approx(tree.values.sum())
+        np.testing.assert_array_equal(tree.find(values), expected)
+
+    def test_update_after_writes(self):
+        """Test partial updates give the same sums as a full rebuild."""
+        tree = SumTree(10)
+        tree.values[:10] = 1.0
+        tree.rebuild()
+        tree.values[[2, 7]] = [5.0, 0.0]
+        tree.update([2, 7, 7])
+
+        assert tree.total == pytest.approx(13.0)
+        assert tree.find([1.5, 6.5, 7.5, 11.5]).tolist() == [1, 2, 3, 8]
+
+
+class TestReplayBuffer:
+    """Test cases for the ReplayBuffer class."""
+
+    def test_ring_buffer_overwrites_oldest(self):
+        """Test the buffer keeps only the most recent capacity transitions."""
+        buffer = ReplayBuffer(capacity=4, seed=0)
+        for i in range(6):
+            buffer.add(i, i % len(ACTIONS), float(i), i + 1, False)
+
+        assert len(buffer) == 4
+        assert sorted(buffer.states.tolist()) == [2, 3, 4, 5]
+
+    def test_add_batch_wraps(self):
+        """Test batched adds wrap around the end of the arrays."""
+        buffer = ReplayBuffer(capacity=5, seed=0)
+        buffer.add_batch(np.arange(3), np.zeros(3), np.zeros(3), np.arange(3) + 1, np.zeros(3, bool))
+        buffer.add_batch(np.arange(3, 7), np.zeros(4), np.zeros(4), np.arange(4) + 4,
+                         np.ones(4, bool))
+
+        assert len(buffer) == 5
+        assert buffer.position == 2
+        assert sorted(buffer.states.tolist()) == [2, 3, 4, 5, 6]
+
+    def test_prioritized_sampling(self):
+        """Test high-priority transitions are drawn more often and down-weighted."""
+        buffer = ReplayBuffer(capacity=10, seed=0)
+        for i in range(10):
+            buffer.add(i, 0, 0.0, i, False)
+        buffer.update_priorities(np.arange(10), np.where(np.arange(10) == 3, 100.0, 0.0))
+
+        indices, states, _, _, _, _, weights = buffer.sample(1000, prioritized=True)
+
+        assert np.mean(states == 3) > 0.5
+        assert weights[states == 3].max() < weights[states != 3].min()
+        assert weights.max() == pytest.approx(1.0)
+
+    def test_tree_and_linear_sampling_agree(self):
+        """Test sampling through the sum tree matches the cumulative-sum search."""
+        linear = ReplayBuffer(capacity=100, seed=0)
+        tree = ReplayBuffer(capacity=100, seed=0)
+        tree.LINEAR_SAMPLE_LIMIT = 0
+        for buffer in (linear, tree):
+            for i in range(150):
+                buffer.add(i, 0, 0.0, i, False)
+            buffer.update_priorities(np.arange(0, 100, 3), np.arange(34, dtype=np.float64))
+
+        for _ in range(3):
+            expected = linear.sample(64, prioritized=True)
+            actual = tree.sample(64, prioritized=True)
+            np.testing.assert_array_equal(actual[0], expected[0])
+            np.testing.assert_allclose(actual[6], expected[6])
+            linear.update_priorities(expected[0], np.ones(64))
+            tree.update_priorities(actual[0], np.ones(64))
+
+    def test_clear_resets_priorities(self):
+        """Test cleared transitions are never sampled again."""
+        buffer = ReplayBuffer(capacity=8, seed=0)
+        for i in range(8):
+            buffer.add(i, 0, 0.0, i, False)
+        buffer.update_priorities(np.arange(8), np.full(8, 100.0))
+        buffer.sample(4, prioritized=True)
+        buffer.clear()
+        buffer.add(42, 0, 0.0, 42, False)
+
+        _, states, _, _, _, _, _ = buffer.sample(100, prioritized=True)
+
+        assert np.all(states == 42)
+
+    def test_empty_buffer(self):
+        """Test sampling an empty buffer fails and replaying it is a no-op."""
+        buffer = ReplayBuffer(capacity=4)
+        with pytest.raises(ValueError):
+            buffer.sample(1)
+        assert RLAgent().replay(buffer) is None
+
+
+class TestAgentReplay:
+    """Test cases for learning from replayed transitions."""
+
+    def test_done_transitions_do_not_bootstrap(self):
+        """Test a terminal transition's target is just its reward."""
+        agent = RLAgent()
+        agent.q_values[9] = 100.0
+        buffer = ReplayBuffer(capacity=1, seed=0)
+        buffer.add(5, 2, -50.0, 9, True)
+
+        td_errors = agent.replay(buffer, batch_size=1, prioritized=False)
+
+        assert td_errors[0] == pytest.approx(-50.0)
+        assert agent.q_values[5, 2] == pytest.approx(ALPHA * -50.0)
+
+    def test_prioritized_replay_updates_priorities(self):
+        """Test replayed transitions get priorities from their TD errors."""
+        agent = RLAgent()
+        buffer = ReplayBuffer(capacity=8, seed=0)
+        buffer.add(5, 2, COIN_COLLECTION_REWARD, 6, False)
+
+        agent.replay(buffer, batch_size=4, prioritized=True)
+
+        assert agent.q_values[5, 2] > 0
+        assert buffer.priorities[0] != 1.0
+
+    def test_run_episode_fills_buffer(self):
+        """Test every learning step of an episode is recorded."""
+        buffer = ReplayBuffer(capacity=MAX_EPISODE_STEPS, seed=0)
+        result = run_episode(SpaceAdventureEnv(seed=0), RLAgent(), replay=buffer)
+
+        assert len(buffer) == result["length"]
+        assert buffer.dones[:len(buffer)].sum() == (result["termination"] is not None)
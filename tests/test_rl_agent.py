@@ -5,6 +5,7 @@ Unit tests for the RL Agent module.
 import pytest
 import numpy as np
 from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.env import SpaceAdventureEnv
 from src.rl_space_adventure.config import *
 
 
@@ -29,6 +30,30 @@ class TestRLAgent:
         assert agent.discretize(99, 100, 4) == 3
         assert agent.discretize(100, 100, 4) == 3  # Should cap at max
 
+    def test_state_round_trip(self):
+        """Test states with negative deltas encode and decode without aliasing."""
+        config = GameConfig(grid_width=10, grid_height=10)
+        agent = RLAgent(state_bins=8, config=config)
+
+        # Coin deltas from the binned player position are negative here
+        components = agent.decode_state(agent.get_state((9, 9), 99, [(0, 0)], [(9, 9)]))
+        assert components[2] == agent.discretize(99, 100, agent.fuel_bins)
+        assert components[3] == components[4] == 3  # int((0 - 7) / 10 * 8) = -5 wraps
+
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            player, coin, enemy = (tuple(int(v) for v in rng.integers(0, 10, size=2))
+                                   for _ in range(3))
+            fuel = float(rng.uniform(0, 100))
+            state = agent.get_state(player, fuel, [coin], [enemy])
+            components = agent.decode_state(state)
+            assert 0 <= state < agent.num_states
+            assert all(0 <= c < dim for c, dim in zip(components, agent.state_dims))
+            assert components[2] == agent.discretize(fuel, 100, agent.fuel_bins)
+            assert agent.encode_state(components) == state
+        assert agent.encode_state((7, 7, 3, -2, -2, 4, 4)) == agent.encode_state(
+            (7, 7, 3, 6, 6, 4, 4))
+
     def test_get_state(self):
         """Test state representation generation."""
         agent = RLAgent()
@@ -40,9 +65,13 @@ class TestRLAgent:
 
         state = agent.get_state(player_pos, fuel, coins, enemies)
 
-        # Should return 7-tuple
-        assert len(state) == 7
-        assert all(isinstance(x, int) for x in state)
+        # Should return a flat index that decodes to a 7-tuple
+        assert isinstance(state, int)
+        assert 0 <= state < agent.num_states
+        components = agent.decode_state(state)
+        assert len(components) == 7
+        assert all(isinstance(x, int) for x in components)
+        assert agent.encode_state(components) == state
 
     def test_choose_action_exploration(self):
         """Test action selection includes exploration."""
@@ -80,3 +109,98 @@ class TestRLAgent:
 
         assert decayed_epsilon < initial_epsilon
         assert decayed_epsilon >= EPSILON_END
+
+    def test_get_states_matches_get_state(self):
+        """Test batched state discretization matches the scalar version."""
+        agent = RLAgent()
+        rng = np.random.default_rng(0)
+        player_pos = rng.integers(0, GRID_WIDTH, size=(50, 2))
+        fuel = rng.uniform(0, 100, size=50)
+        coins = rng.integers(0, GRID_WIDTH, size=(50, MAX_COINS, 2))
+        enemies = rng.integers(0, GRID_WIDTH, size=(50, MAX_ENEMIES, 2))
+
+        states = agent.get_states(player_pos, fuel, coins, enemies)
+
+        for i in range(50):
+            expected = agent.get_state(tuple(player_pos[i]), fuel[i],
+                                       [tuple(c) for c in coins[i]],
+                                       [tuple(e) for e in enemies[i]])
+            assert states[i] == expected
+
+    def test_choose_actions_batch(self):
+        """Test batched action selection explores and exploits."""
+        agent = RLAgent()
+        states = np.zeros(1000, dtype=np.int64)
+        agent.q_values[0, 2] = 1.0
+
+        actions = agent.choose_actions(states)
+        assert len(set(actions.tolist())) > 1
+
+        agent.epsilon = 0.0
+        assert np.all(agent.choose_actions(states) == 2)
+
+    def test_update_q_values_duplicates(self):
+        """Test duplicate transitions in a batch each contribute an update."""
+        agent = RLAgent()
+        states = np.zeros(3, dtype=np.int64)
+        next_states = np.ones(3, dtype=np.int64)
+        actions = np.array([1, 1, 2])
+        rewards = np.array([10.0, 10.0, -5.0])
+
+        agent.update_q_values(states, actions, rewards, next_states)
+
+        assert agent.q_values[0, 1] == pytest.approx(2 * ALPHA * 10.0)
+        assert agent.q_values[0, 2] == pytest.approx(ALPHA * -5.0)
+
+    def test_flat_q_table_layout(self):
+        """Test the Q-table is a contiguous 2-D array shared with the tuple view."""
+        agent = RLAgent()
+
+        assert agent.q_values.shape == (agent.num_states, len(ACTIONS))
+        assert agent.q_values.flags.c_contiguous
+        assert agent.q_values.dtype == np.dtype(Q_TABLE_DTYPE)
+
+        state = (1, 2, 3, 0, 1, 2, 3)
+        agent.q_values[agent.encode_state(state), 4] = 7.0
+        assert agent.q_table[state][4] == 7.0
+
+    def test_q_table_dtype(self):
+        """Test the Q-table dtype is configurable."""
+        assert RLAgent(dtype=np.float64).q_values.dtype == np.float64
+        assert RLAgent(dtype=np.float32).q_values.nbytes * 2 == RLAgent(dtype=np.float64).q_values.nbytes
+
+    def test_get_state_with_nearest_index(self):
+        """Test states built from nearest-neighbour indexes match position lists."""
+        env = SpaceAdventureEnv(seed=1)
+        agent = RLAgent()
+        for step in range(100):
+            _, _, done, _ = env.step(step % len(ACTIONS))
+            if done:
+                env.reset()
+            assert (agent.get_state(*env.get_indexed_observation())
+                    == agent.get_state(*env.get_observation()))
+
+    def test_policy_cache_tracks_updates(self):
+        """Test the cached greedy actions follow single and batched updates."""
+        agent = RLAgent()
+        agent.cache_policy()
+        agent.update_q_value(3, 2, 10.0, 4)
+        agent.update_q_values(np.array([5, 5]), np.array([4, 1]), np.array([1.0, 3.0]),
+                              np.array([6, 6]))
+
+        assert agent.policy.dtype == np.int8
+        assert np.array_equal(agent.policy, agent.q_values.argmax(axis=1))
+
+        agent.epsilon = 0.0
+        assert agent.choose_action(3) == 2
+        assert agent.choose_actions(np.array([3, 5])).tolist() == [2, 1]
+
+    def test_frozen_policy_cache(self):
+        """Test a frozen cache ignores later updates."""
+        agent = RLAgent(backend="sparse")
+        agent.update_q_value(3, 2, 10.0, 4)
+        agent.cache_policy(frozen=True)
+        agent.update_q_value(3, 1, 100.0, 4)
+
+        assert agent.policy[3] == 2
+        assert agent.greedy_actions()[3] == 1
@@ -0,0 +1,60 @@
+"""
+Unit tests for the game loop scheduler module.
+"""
+
+import time
+import pytest
+from src.rl_space_adventure.scheduler import GameLoopScheduler
+
+
+class TestGameLoopScheduler:
+    """Test cases for the GameLoopScheduler class."""
+
+    def test_normal_mode(self):
+        """Test normal mode runs one step and renders every frame at FPS."""
+        scheduler = GameLoopScheduler(fps=10)
+
+        for _ in range(5):
+            assert scheduler.plan_frame() == (1, True)
+            scheduler.record(1, 0.001, 0.001)
+        assert scheduler.target_fps == 10
+
+    def test_turbo_adapts_steps_to_budget(self):
+        """Test turbo mode fits the steps into the frame budget."""
+        scheduler = GameLoopScheduler(turbo_fps=50, render_interval=1, smoothing=1.0)
+        scheduler.toggle_turbo()
+
+        scheduler.plan_frame()
+        scheduler.record(10, 10 * 1e-4, 0.01)
+
+        # (1/50 - 0.01) seconds left per frame at 0.1 ms per step
+        assert scheduler.steps_per_frame == pytest.approx(100, abs=1)
+        assert scheduler.target_fps == 0
+
+    def test_turbo_render_interval(self):
+        """Test turbo mode renders every Nth frame and on demand."""
+        scheduler = GameLoopScheduler(render_interval=3)
+        scheduler.toggle_turbo()
+
+        renders = [scheduler.plan_frame()[1] for _ in range(6)]
+        assert renders == [True, False, True, False, False, True]
+
+        scheduler.request_render()
+        assert scheduler.plan_frame()[1]
+
+    def test_render_on_demand_only(self):
+        """Test a render interval of 0 renders only when requested."""
+        scheduler = GameLoopScheduler(render_interval=0)
+        scheduler.toggle_turbo()
+        scheduler.plan_frame()
+
+        assert not any(scheduler.plan_frame()[1] for _ in range(10))
+
+    def test_frame_delay(self):
+        """Test pacing waits out the rest of the frame only in normal mode."""
+        scheduler = GameLoopScheduler(fps=10)
+        frame_start = time.perf_counter()
+
+        assert 0 < scheduler.frame_delay(frame_start) <= 0.1
+        scheduler.toggle_turbo()
+        assert scheduler.frame_delay(frame_start) == 0.0
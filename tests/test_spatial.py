@@ -0,0 +1,86 @@
+"""
+Unit tests for the spatial index module.
+"""
+
+import random
+from src.rl_space_adventure.spatial import OccupancyGrid, NearestIndex
+
+
+class TestOccupancyGrid:
+    """Test cases for the OccupancyGrid class."""
+
+    def test_coin_and_enemy_lookup(self):
+        """Test entities can be looked up by cell."""
+        grid = OccupancyGrid(5, 4)
+        grid.add_coin(2, (1, 3))
+        grid.add_enemy((4, 0))
+        grid.add_enemy((4, 0))
+
+        assert grid.coin_at((1, 3)) == 2
+        assert grid.coin_at((0, 0)) == -1
+        assert grid.enemies_at((4, 0)) == 2
+
+        grid.move_enemy((4, 0), (3, 0))
+        assert grid.enemies_at((4, 0)) == 1
+        assert grid.enemies_at((3, 0)) == 1
+
+    def test_free_cells(self):
+        """Test the free-cell list excludes coins and the player."""
+        grid = OccupancyGrid(3, 3)
+        grid.place_player((1, 1))
+        for slot, pos in enumerate([(0, 0), (0, 1), (2, 2)]):
+            grid.add_coin(slot, pos)
+
+        free = {grid.position(cell) for cell in grid.free_cells}
+        assert grid.num_free == 5
+        assert free == {(0, 2), (1, 0), (1, 2), (2, 0), (2, 1)}
+
+        grid.remove_coin((0, 0))
+        grid.move_player((1, 1), (1, 2))
+        free = {grid.position(cell) for cell in grid.free_cells}
+        assert free == {(0, 0), (0, 2), (1, 0), (1, 1), (2, 0), (2, 1)}
+
+    def test_sample_free(self):
+        """Test sampling only returns free cells."""
+        grid = OccupancyGrid(4, 4)
+        grid.place_player((0, 0))
+        rng = random.Random(0)
+        for slot in range(15):
+            pos = grid.sample_free(rng)
+            assert grid.coin_at(pos) == -1 and pos != (0, 0)
+            grid.add_coin(slot, pos)
+
+        assert grid.num_free == 0
+
+
+class TestNearestIndex:
+    """Test cases for the NearestIndex class."""
+
+    def test_empty(self):
+        """Test queries on an empty index return None."""
+        assert NearestIndex(20, 20).nearest(3, 4) is None
+
+    def test_matches_linear_scan(self):
+        """Test queries agree with min() over the positions in slot order."""
+        rng = random.Random(0)
+        index = NearestIndex(20, 20, bucket_size=3)
+        positions = [(rng.randrange(20), rng.randrange(20)) for _ in range(30)]
+        for slot, pos in enumerate(positions):
+            index.add(slot, pos)
+
+        for _ in range(200):
+            slot = rng.randrange(30)
+            positions[slot] = (rng.randrange(20), rng.randrange(20))
+            index.move(slot, positions[slot])
+            x, y = rng.randrange(20), rng.randrange(20)
+            expected = min(positions, key=lambda p: abs(p[0] - x) + abs(p[1] - y))
+            assert index.nearest(x, y) == expected
+
+    def test_remove(self):
+        """Test removed entities are no longer found."""
+        index = NearestIndex(20, 20)
+        index.add(0, (1, 1))
+        index.add(1, (15, 15))
+        index.remove(0)
+
+        assert index.nearest(0, 0) == (15, 15)
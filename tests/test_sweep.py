@@ -0,0 +1,80 @@
+"""
+Unit tests for the sweep module.
+"""
+
+import pytest
+from src.rl_space_adventure.sweep import (
+    SweepScheduler, grid_search, parse_space, random_search
+)
+from src.rl_space_adventure.config import *
+
+
+class TestSearchSpaces:
+    """Test cases for building trial lists."""
+
+    def test_grid_search(self):
+        """Test the grid covers every combination."""
+        trials = grid_search({"alpha": [0.1, 0.2], "gamma": [0.9, 0.95, 0.99]})
+
+        assert len(trials) == 6
+        assert {"alpha": 0.2, "gamma": 0.99} in trials
+
+    def test_random_search(self):
+        """Test random samples respect ranges, choices and types."""
+        trials = random_search({"alpha": (0.01, 0.5), "state_bins": (2, 5),
+                                "gamma": [0.9, 0.99]}, trials=50, seed=1)
+
+        assert all(0.01 <= trial["alpha"] <= 0.5 for trial in trials)
+        assert {trial["state_bins"] for trial in trials} == {2, 3, 4, 5}
+        assert {trial["gamma"] for trial in trials} == {0.9, 0.99}
+        assert trials == random_search({"alpha": (0.01, 0.5), "state_bins": (2, 5),
+                                        "gamma": [0.9, 0.99]}, trials=50, seed=1)
+
+    def test_parse_space(self):
+        """Test command line specifications are cast to the config field types."""
+        space = parse_space(["alpha=0.1,0.2", "state_bins=2:6"])
+
+        assert space == {"alpha": [0.1, 0.2], "state_bins": (2, 6)}
+        with pytest.raises(ValueError):
+            parse_space(["learning_rate=0.1"])
+
+
+class TestSweepScheduler:
+    """Test cases for the SweepScheduler class."""
+
+    def test_median_stopping_rule(self):
+        """Test trials below their peers' median are stopped after the grace period."""
+        scheduler = SweepScheduler([{}] * 4, episodes=100, workers=0,
+                                   grace_episodes=20, min_peers=2)
+        for trial_id, score in enumerate([1.0, 2.0, 3.0]):
+            assert not scheduler.should_stop(trial_id, 10, score)
+            scheduler.should_stop(trial_id, 20, score)
+
+        assert not scheduler.should_stop(3, 10, 0.0)  # Within the grace period
+        assert scheduler.should_stop(3, 20, 1.5)
+        assert not scheduler.should_stop(3, 20, 2.5)
+
+    def test_rejects_unknown_parameters(self):
+        """Test trials naming non-config parameters are rejected."""
+        with pytest.raises(ValueError):
+            SweepScheduler([{"learning_rate": 0.1}], episodes=10)
+
+    def test_in_process_sweep_stops_poor_trials(self):
+        """Test a sweep ranks trials and stops those worse than their peers."""
+        # A huge fuel cost ends every episode at once, so its return is worst
+        trials = [{}, {}, {}, {"fuel_consumption_reward": -100.0}]
+        scheduler = SweepScheduler(trials, episodes=40, workers=0, report_interval=10,
+                                   grace_episodes=10, min_peers=3, metric="return")
+        results = scheduler.run()
+
+        assert [result["stopped"] for result in results] == [False, False, False, True]
+        assert results[-1]["trial"] == 3 and results[-1]["episodes"] == 10
+
+    def test_pooled_sweep(self):
+        """Test pooled trials match in-process trials."""
+        trials = grid_search({"alpha": [0.1, 0.3]})
+        pooled = SweepScheduler(trials, episodes=20, workers=2, grace_episodes=1000).run()
+        serial = SweepScheduler(trials, episodes=20, workers=0, grace_episodes=1000).run()
+
+        strip = lambda results: sorted((r["trial"], r["score"], r["episodes"]) for r in results)
+        assert strip(pooled) == strip(serial)
@@ -0,0 +1,81 @@
+"""
+Unit tests for the telemetry module.
+"""
+
+import csv
+import json
+import os
+import pytest
+from src.rl_space_adventure.telemetry import TELEMETRY_FIELDS, TelemetryWriter
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.training import run_episode
+from src.rl_space_adventure.config import *
+
+
+def read_jsonl(path):
+    """Rows of a JSON lines file."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestTelemetryWriter:
+    """Test cases for the TelemetryWriter class."""
+
+    def test_episode_metrics(self, tmp_path):
+        """Test run_episode streams one complete row per episode."""
+        path = str(tmp_path / "telemetry.jsonl")
+        env = SpaceAdventureEnv(seed=0)
+        agent = RLAgent(seed=0)
+        with TelemetryWriter(path, coverage_interval=1) as telemetry:
+            results = [run_episode(env, agent, max_steps=50, telemetry=telemetry)
+                       for _ in range(5)]
+
+        rows = read_jsonl(path)
+        assert [row["episode"] for row in rows] == [1, 2, 3, 4, 5]
+        assert [row["length"] for row in rows] == [result["length"] for result in results]
+        assert [row["termination"] for row in rows] == [result["termination"] for result in results]
+        assert rows[0]["epsilon"] == EPSILON_START
+        assert 0 < rows[-1]["coverage"] <= 1
+        assert all(row["steps_per_sec"] > 0 for row in rows)
+
+    def test_csv_format(self, tmp_path):
+        """Test .csv paths get a header and empty cells for missing values."""
+        path = str(tmp_path / "telemetry.csv")
+        with TelemetryWriter(path) as telemetry:
+            telemetry.record({"episode": 1, "return": -5.0, "termination": None})
+
+        with open(path, encoding="utf-8", newline="") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == list(TELEMETRY_FIELDS)
+        assert rows[1][0] == "1" and rows[1][TELEMETRY_FIELDS.index("termination")] == ""
+
+    def test_rotation(self, tmp_path):
+        """Test full files are rotated and only the configured backups are kept."""
+        path = str(tmp_path / "telemetry.jsonl")
+        telemetry = TelemetryWriter(path, max_bytes=200, backups=2).start()
+        for episode in range(30):
+            telemetry.record({"episode": episode})
+            telemetry._drain()  # One batch per row instead of waiting for the thread
+        telemetry.stop()
+
+        assert sorted(os.listdir(tmp_path)) == ["telemetry.jsonl", "telemetry.jsonl.1",
+                                                "telemetry.jsonl.2"]
+        newest = read_jsonl(path)
+        older = read_jsonl(path + ".1")
+        assert older[-1]["episode"] + 1 == (newest[0]["episode"] if newest else 30)
+        assert telemetry.written == 30
+
+    def test_bounded_buffer(self, tmp_path):
+        """Test a full buffer drops the oldest rows instead of growing."""
+        telemetry = TelemetryWriter(str(tmp_path / "telemetry.jsonl"), buffer_size=3)
+        for episode in range(5):
+            telemetry.record({"episode": episode})
+
+        assert [row["episode"] for row in telemetry.buffer] == [2, 3, 4]
+        assert telemetry.dropped == 2
+
+    def test_rejects_unknown_format(self, tmp_path):
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError):
+            TelemetryWriter(str(tmp_path / "telemetry.txt"), format="xml")
@@ -0,0 +1,71 @@
+"""
+Unit tests for the training module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.env import SpaceAdventureEnv
+from src.rl_space_adventure.rl_agent import RLAgent
+from src.rl_space_adventure.training import ParallelTrainer, run_episode, worker_epsilon
+from src.rl_space_adventure.config import *
+
+
+class TestRunEpisode:
+    """Test cases for the run_episode function."""
+
+    def test_learning_episode(self):
+        """Test a learning episode updates the table and decays epsilon."""
+        agent = RLAgent()
+        result = run_episode(SpaceAdventureEnv(seed=0), agent)
+
+        assert 0 < result["length"] <= MAX_EPISODE_STEPS
+        assert result["termination"] in ("enemy", "fuel", None)
+        assert agent.table.stats()["visited_states"] > 0
+        assert agent.epsilon < EPSILON_START
+
+    def test_evaluation_episode(self):
+        """Test an evaluation episode leaves the agent untouched."""
+        agent = RLAgent()
+        run_episode(SpaceAdventureEnv(seed=0), agent, learn=False, max_steps=20)
+
+        assert agent.table.stats()["visited_states"] == 0
+        assert agent.epsilon == EPSILON_START
+
+
+class TestParallelTrainer:
+    """Test cases for the ParallelTrainer class."""
+
+    def test_worker_epsilon_schedule(self):
+        """Test worker exploration rates span the configured range."""
+        rates = [worker_epsilon(i, 4) for i in range(4)]
+
+        assert rates[0] == pytest.approx(EPSILON_START)
+        assert rates[-1] == pytest.approx(EPSILON_START ** 2)
+        assert rates == sorted(rates, reverse=True)
+
+    @pytest.mark.parametrize("mode", ParallelTrainer.MODES)
+    def test_train(self, mode):
+        """Test workers learn into the shared table."""
+        agent, stats = ParallelTrainer(2, mode=mode, sync_interval=2, seed=0).train(5)
+
+        assert stats["episodes"] == 10
+        assert len(stats["workers"]) == 2
+        assert np.any(agent.q_values != 0)
+        assert 0 < agent.table.visits.sum() <= stats["steps"]
+
+    @pytest.mark.parametrize("state_bins", [2, 8])
+    def test_train_with_agent_config(self, state_bins):
+        """Test workers encode states with the caller's discretization."""
+        agent, stats = ParallelTrainer(2, seed=0).train(3, RLAgent(state_bins=state_bins))
+        visited = np.flatnonzero(agent.table.visits)
+
+        assert len(visited) > 0
+        assert agent.table.visits.sum() <= stats["steps"]
+        if state_bins == 8:
+            # 4-bin indices all fall below this, so 8-bin ones must reach past it
+            assert visited.max() >= RLAgent(state_bins=4).num_states
+
+    def test_unknown_mode(self):
+        """Test unknown training modes are rejected."""
+        with pytest.raises(ValueError):
+            ParallelTrainer(mode="nope")
@@ -0,0 +1,81 @@
+"""
+Unit tests for the vectorized environment module.
+"""
+
+import pytest
+import numpy as np
+from src.rl_space_adventure.vector_env import VectorSpaceAdventureEnv
+from src.rl_space_adventure.config import *
+
+
+class TestVectorSpaceAdventureEnv:
+    """Test cases for the VectorSpaceAdventureEnv class."""
+
+    def test_buffer_shapes(self):
+        """Test state buffers have struct-of-arrays shapes."""
+        env = VectorSpaceAdventureEnv(8, seed=0)
+
+        assert env.player_pos.shape == (8, 2)
+        assert env.fuel.shape == (8,)
+        assert env.coins.shape == (8, MAX_COINS, 2)
+        assert env.enemies.shape == (8, MAX_ENEMIES, 2)
+
+    def test_player_movement_is_clamped(self):
+        """Test players stay on the grid and only moving costs fuel."""
+        env = VectorSpaceAdventureEnv(2, seed=0)
+        env.enemies[:] = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        env.coins[:] = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        env.player_pos[:] = (0, 0)
+
+        env.step(np.array([ACTIONS.index((-1, 0)), 0]))
+
+        assert env.player_pos.tolist() == [[0, 0], [0, 0]]
+        assert env.fuel.tolist() == pytest.approx([99.9, 100.0])
+
+    def test_enemies_chase_player(self):
+        """Test enemies only ever move one step toward the player."""
+        env = VectorSpaceAdventureEnv(64, seed=0)
+        env.player_pos[:] = (10, 10)
+        env.enemies[:] = (0, 19)
+
+        env.update_enemies()
+
+        moved = np.all(env.enemies == (1, 18), axis=2)
+        stayed = np.all(env.enemies == (0, 19), axis=2)
+        assert np.all(moved | stayed)
+        assert moved.any() and stayed.any()
+
+    def test_coin_collection_and_respawn(self):
+        """Test collecting a coin rewards, refuels and respawns without overlap."""
+        env = VectorSpaceAdventureEnv(1, seed=0)
+        env.enemies[:] = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        env.fuel[:] = 50.0
+        env.player_pos[:] = (5, 5)
+        env.coins[0] = [(6, 5), (0, 0), (1, 1)][:MAX_COINS]
+
+        _, rewards, dones, info = env.step(np.array([ACTIONS.index((1, 0))]))
+
+        assert rewards[0] == COIN_COLLECTION_REWARD
+        assert not dones[0]
+        assert env.score[0] == 1
+        assert env.fuel[0] == pytest.approx(50.0 - 0.1 + FUEL_RESTORE_PER_COIN)
+        coins = [tuple(c) for c in env.coins[0]]
+        assert (6, 5) not in coins
+        assert len(set(coins)) == MAX_COINS
+
+    def test_finished_games_auto_reset(self):
+        """Test enemy collisions and fuel depletion end and reset a game."""
+        env = VectorSpaceAdventureEnv(3, seed=0)
+        env.coins[:] = (0, 0)
+        env.enemies[:] = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
+        env.enemies[0, 0] = env.player_pos[0]
+        env.fuel[1] = 0.05
+
+        _, rewards, dones, _ = env.step(np.array([0, 1, 0]))
+
+        assert rewards.tolist() == [ENEMY_COLLISION_REWARD, FUEL_DEPLETION_REWARD,
+                                    FUEL_CONSUMPTION_REWARD]
+        assert dones.tolist() == [True, True, False]
+        assert env.episode_count.tolist() == [1, 1, 0]
+        assert env.fuel[:2].tolist() == [100.0, 100.0]
+        assert env.player_pos[:2].tolist() == [[GRID_WIDTH // 2, GRID_HEIGHT // 2]] * 2